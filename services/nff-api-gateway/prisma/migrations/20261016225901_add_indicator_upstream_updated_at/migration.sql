@@ -0,0 +1,7 @@
+-- Track when the upstream source last changed each indicator's series
+-- ETL pre-flight checks compare this with the source metadata to skip unchanged indicators
+
+ALTER TABLE "IndicatorMetadata"
+ADD COLUMN "upstreamUpdatedAt" TIMESTAMP(3);
+
+COMMENT ON COLUMN "IndicatorMetadata"."upstreamUpdatedAt" IS 'Latest upstream last_updated (UTC) across the indicator''s series at its last successful load';
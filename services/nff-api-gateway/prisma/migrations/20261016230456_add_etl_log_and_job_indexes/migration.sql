@@ -0,0 +1,6 @@
+-- Composite indexes for the ETL bookkeeping tables
+-- Per-indicator log history and status-filtered job listings, both ordered by createdAt
+
+CREATE INDEX IF NOT EXISTS "IndicatorETLLog_indicatorId_createdAt_idx" ON "IndicatorETLLog"("indicatorId", "createdAt");
+
+CREATE INDEX IF NOT EXISTS "ETLJob_status_createdAt_idx" ON "ETLJob"("status", "createdAt");
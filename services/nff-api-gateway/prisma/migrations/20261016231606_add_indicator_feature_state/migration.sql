@@ -0,0 +1,18 @@
+-- Running statistics behind the derived feature columns of "IndicatorTimeSeries"
+-- Lets the ingestion service update features for appended observations without rereading history
+
+CREATE TABLE "IndicatorFeatureState" (
+    "indicatorId" INTEGER NOT NULL,
+    "lastDate" DATE NOT NULL,
+    "count" INTEGER NOT NULL,
+    "mean" DOUBLE PRECISION NOT NULL,
+    "m2" DOUBLE PRECISION NOT NULL,
+    "minValue" DOUBLE PRECISION NOT NULL,
+    "maxValue" DOUBLE PRECISION NOT NULL,
+    "recentValues" DOUBLE PRECISION[],
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "IndicatorFeatureState_pkey" PRIMARY KEY ("indicatorId")
+);
+
+ALTER TABLE "IndicatorFeatureState" ADD CONSTRAINT "IndicatorFeatureState_indicatorId_fkey" FOREIGN KEY ("indicatorId") REFERENCES "IndicatorMetadata"("id") ON DELETE CASCADE ON UPDATE CASCADE;
@@ -0,0 +1,93 @@
+"""
+Benchmark: IndicatorTimeSeries upsert paths
+Compares execute_values with the COPY-staged merge on synthetic daily series
+
+Usage:
+    DATABASE_URL=postgresql://... python benchmarks/bench_time_series_upsert.py --rows 1000 10000 50000
+
+Each size is written twice per path: once into an empty range (inserts) and
+once more with identical values (a refresh where every row is unchanged).
+Rows are written for a throwaway IndicatorMetadata record that is deleted
+(with its time series, via cascade) when the run finishes.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import psycopg2
+from config import settings
+from core.time_series_writer import copy_time_series_values, upsert_time_series_values
+
+def build_values(indicator_id: int, rows: int):
+    now = datetime.now()
+    start = date(1950, 1, 1)
+    values = []
+    for i in range(rows):
+        value = 100.0 + (i % 250) * 0.37
+        values.append((
+            indicator_id, start + timedelta(days=i), value,
+            None, None, False,
+            0.5, 0.25,
+            1.1, 2.2, 3.3,
+            value, value, value,
+            0.9, 1.8,
+            'up', False,
+            now, now
+        ))
+    return values
+
+def create_indicator(conn) -> int:
+    with conn.cursor() as cur:
+        cur.execute('SELECT id FROM "ChartCategory" ORDER BY id LIMIT 1')
+        category = cur.fetchone()
+        if not category:
+            raise SystemExit("Benchmark needs at least one ChartCategory row")
+        cur.execute("""
+            INSERT INTO "IndicatorMetadata" ("moduleEN", "indicatorEN", "categoryId", source, "updatedAt")
+            VALUES ('benchmark', %s, %s, 'benchmark', NOW())
+            RETURNING id
+        """, (f"upsert-benchmark-{os.getpid()}", category[0]))
+        indicator_id = cur.fetchone()[0]
+    conn.commit()
+    return indicator_id
+
+def timed(conn, writer, values) -> float:
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        writer(cur, values)
+    conn.commit()
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(settings.DATABASE_URL)
+    indicator_id = create_indicator(conn)
+
+    try:
+        print(f"{'rows':>8} {'path':>15} {'insert s':>10} {'rerun s':>10} {'rows/s':>12}")
+        for rows in args.rows:
+            values = build_values(indicator_id, rows)
+            for name, writer in (('execute_values', upsert_time_series_values), ('copy', copy_time_series_values)):
+                with conn.cursor() as cur:
+                    cur.execute('DELETE FROM "IndicatorTimeSeries" WHERE "indicatorMetadataId" = %s', (indicator_id,))
+                conn.commit()
+
+                insert_seconds = timed(conn, writer, values)
+                rerun_seconds = timed(conn, writer, values)
+                print(f"{rows:>8} {name:>15} {insert_seconds:>10.3f} {rerun_seconds:>10.3f} {rows / insert_seconds:>12,.0f}")
+    finally:
+        with conn.cursor() as cur:
+            cur.execute('DELETE FROM "IndicatorMetadata" WHERE id = %s', (indicator_id,))
+        conn.commit()
+        conn.close()
+
+if __name__ == "__main__":
+    main()
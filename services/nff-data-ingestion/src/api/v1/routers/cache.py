@@ -2,19 +2,106 @@
 Cache Management Router
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
-from utils.cache import cache_set, cache_get
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, Any, List
+from pydantic import BaseModel, Field
+from utils.cache import cache_set, cache_get, cache_delete, cache_mget, cache_mset, cache_invalidate_pattern
 
 router = APIRouter()
 
+class BulkGetRequest(BaseModel):
+    keys: List[str] = Field(..., min_length=1)
+
+class BulkSetRequest(BaseModel):
+    items: Dict[str, str] = Field(..., min_length=1)
+    ttl: int = 3600
+
+class BulkDeleteRequest(BaseModel):
+    keys: List[str] = Field(..., min_length=1)
+
+@router.post("/cache/bulk/get")
+async def bulk_get_cache(request: BulkGetRequest) -> Dict[str, Any]:
+    """
+    Get many cache values in one MGET
+    """
+    try:
+        values = await cache_mget(request.keys)
+        return {
+            "status": "success",
+            "found": sum(1 for value in values.values() if value is not None),
+            "values": values
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get {len(request.keys)} keys: {str(e)}"
+        )
+
+@router.post("/cache/bulk/set")
+async def bulk_set_cache(request: BulkSetRequest) -> Dict[str, Any]:
+    """
+    Set many cache values with one TTL in a single pipeline
+    """
+    try:
+        await cache_mset(request.items, ttl=request.ttl)
+        return {
+            "status": "success",
+            "message": f"{len(request.items)} keys cached successfully",
+            "ttl": request.ttl
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to cache {len(request.items)} keys: {str(e)}"
+        )
+
+@router.post("/cache/bulk/delete")
+async def bulk_delete_cache(request: BulkDeleteRequest) -> Dict[str, Any]:
+    """
+    Delete many cache values with one UNLINK
+    """
+    try:
+        deleted = await cache_delete(*request.keys)
+        return {
+            "status": "success",
+            "deleted": deleted
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to delete {len(request.keys)} keys: {str(e)}"
+        )
+
+@router.delete("/cache/bulk/pattern")
+async def invalidate_cache_pattern(
+    pattern: str = Query(..., min_length=1, description="Glob pattern, e.g. nff:q:v1:indicator:*")
+) -> Dict[str, Any]:
+    """
+    Delete every key matching a glob pattern (SCAN + batched UNLINK)
+    """
+    if pattern.strip("*") == "":
+        raise HTTPException(status_code=400, detail="Pattern must not match every key")
+    
+    try:
+        deleted = await cache_invalidate_pattern(pattern)
+        return {
+            "status": "success",
+            "pattern": pattern,
+            "deleted": deleted
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to invalidate pattern '{pattern}': {str(e)}"
+        )
+
 @router.post("/cache/{key}")
 async def set_cache(key: str, value: str, ttl: int = 3600) -> Dict[str, Any]:
     """
     Set a cache value with TTL
     """
     try:
-        cache_set(key, value, ttl=ttl)
+        await cache_set(key, value, ttl=ttl)
         return {
             "status": "success",
             "message": f"Key '{key}' cached successfully",
@@ -33,7 +120,7 @@ async def get_cache(key: str) -> Dict[str, Any]:
     Get a cache value
     """
     try:
-        value = cache_get(key)
+        value = await cache_get(key)
         if value is None:
             return {
                 "status": "not_found",
@@ -56,8 +143,11 @@ async def delete_cache(key: str) -> Dict[str, str]:
     Delete a cache value
     """
     try:
-        # Note: You'll need to implement cache_delete in utils.cache
-        # For now, just return success
+        if not await cache_delete(key):
+            return {
+                "status": "not_found",
+                "message": f"Key '{key}' not found in cache"
+            }
         return {
             "status": "success",
             "message": f"Key '{key}' deleted"
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, HTTPException, Query, Path, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
+from config import settings
+from core.time_series_reader import batch_time_series_query
 from services.etl_service import ETLService
 
 router = APIRouter()
@@ -19,6 +22,13 @@ class ETLJobResponse(BaseModel):
     total_indicators: int
     message: str
 
+class TimeSeriesBatchRequest(BaseModel):
+    indicator_ids: List[int]
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    fields: List[str] = ["value"]
+    align: bool = False
+
 class ETLResult(BaseModel):
     job_id: str
     status: str
@@ -164,6 +174,12 @@ async def fetch_single_indicator(
             end_date=end_dt,
             force_refresh=force_refresh
         )
+        # Callers read the indicator's status right after this returns
+        if not await service.status_buffer.flush():
+            raise HTTPException(
+                status_code=500,
+                detail=f"Indicator {indicator_id} was fetched but its ETL status could not be recorded"
+            )
         
         return {
             "status": "success",
@@ -255,12 +271,69 @@ async def incremental_fetch_category(
             detail=f"Failed to start incremental fetch: {str(e)}"
         )
 
+@router.post("/etl/indicators/data/batch")
+async def get_indicators_data_batch(request: TimeSeriesBatchRequest):
+    """
+    Time series for several indicators from one query
+    
+    Streams NDJSON grouped by indicator (one line each), or with align=true
+    returns one JSON object with every series on a common date index.
+    """
+    if not request.indicator_ids:
+        raise HTTPException(status_code=400, detail="indicator_ids must not be empty")
+    if len(request.indicator_ids) > settings.TIME_SERIES_BATCH_MAX_INDICATORS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.TIME_SERIES_BATCH_MAX_INDICATORS} indicators per request"
+        )
+    
+    try:
+        service = ETLService()
+        
+        if request.align:
+            aligned = await service.get_aligned_time_series(
+                indicator_ids=request.indicator_ids,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                fields=request.fields
+            )
+            return {
+                "status": "success",
+                "count": len(aligned["dates"]),
+                **aligned
+            }
+        
+        # Validate fields before the response starts streaming
+        batch_time_series_query(request.indicator_ids, fields=request.fields)
+        
+        return StreamingResponse(
+            service.stream_indicators_time_series(
+                indicator_ids=request.indicator_ids,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                fields=request.fields
+            ),
+            media_type="application/x-ndjson"
+        )
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch indicators data: {str(e)}"
+        )
+
 @router.get("/etl/indicators/{indicator_id}/data")
 async def get_indicator_data(
     indicator_id: int = Path(..., description="Indicator ID"),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    limit: int = Query(1000, description="Maximum number of data points")
+    limit: int = Query(1000, ge=1, description="Maximum number of data points per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (YYYY-MM-DD)"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Date order"),
+    format: str = Query("rows", pattern="^(rows|columnar)$", description="rows: one object per point; columnar: parallel arrays"),
+    stream: bool = Query(False, description="Stream the whole range as NDJSON (limit and cursor are ignored)")
 ):
     try:
         service = ETLService()
@@ -272,18 +345,33 @@ async def get_indicator_data(
         if end_date:
             end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
         
-        data = await service.get_indicator_time_series(
+        if stream:
+            return StreamingResponse(
+                service.stream_indicator_time_series(
+                    indicator_id=indicator_id,
+                    start_date=start_dt,
+                    end_date=end_dt,
+                    order=order,
+                    columnar=format == "columnar"
+                ),
+                media_type="application/x-ndjson"
+            )
+        
+        page = await service.get_indicator_time_series(
             indicator_id=indicator_id,
             start_date=start_dt,
             end_date=end_dt,
-            limit=limit
+            limit=limit,
+            cursor=datetime.strptime(cursor, "%Y-%m-%d").date() if cursor else None,
+            order=order,
+            columnar=format == "columnar"
         )
         
         return {
             "status": "success",
             "indicator_id": indicator_id,
-            "data": data,
-            "count": len(data)
+            "format": format,
+            **page
         }
         
     except Exception as e:
@@ -4,8 +4,8 @@ Health Check Router
 
 from fastapi import APIRouter, Depends
 from typing import Dict, Any
-import psycopg2
 from config import settings
+from core.db_pool import async_db
 
 router = APIRouter()
 
@@ -23,8 +23,7 @@ async def health_check() -> Dict[str, Any]:
     
     # Database connectivity check
     try:
-        conn = psycopg2.connect(settings.DATABASE_URL)
-        conn.close()
+        await async_db.ping()
         health_status["checks"]["database"] = {
             "status": "ok",
             "message": "Database connection successful"
@@ -36,6 +35,8 @@ async def health_check() -> Dict[str, Any]:
         }
         health_status["status"] = "error"
     
+    health_status["checks"]["database_pool"] = async_db.stats()
+    
     # API Keys check
     api_keys_status = {}
     import os
@@ -13,6 +13,18 @@ logger = logging.getLogger(__name__)
 class AIFeaturesCalculator:
     """Calculate AI/ML features for time series data"""
     
+    # Numeric output fields, in record order
+    NUMERIC_FEATURES = [
+        'value', 'z_score', 'normalized',
+        'pct_change_1m', 'pct_change_3m', 'pct_change_12m',
+        'ma_30d', 'ma_90d', 'ma_365d',
+        'volatility_30d', 'volatility_90d',
+        'lag_1', 'lag_3', 'lag_6', 'lag_12'
+    ]
+    
+    # Earlier observations the window features of a row depend on (ma_365d)
+    LOOKBACK_ROWS = 364
+    
     def calculate_features(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Calculate all AI features for time series data
@@ -31,58 +43,93 @@ class AIFeaturesCalculator:
             return []
         
         try:
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
-            df = df.sort_values('date')
-            
-            # Ensure value is numeric
-            df['value'] = pd.to_numeric(df['value'], errors='coerce')
-            df = df.dropna(subset=['value'])
-            
-            if len(df) == 0:
-                return []
-            
-            # Calculate features
-            df = self._calculate_normalization(df)
-            df = self._calculate_percentage_changes(df)
-            df = self._calculate_moving_averages(df)
-            df = self._calculate_volatility(df)
-            df = self._calculate_lag_features(df)
-            df = self._classify_trend(df)
-            df = self._detect_outliers(df)
+            columns = self.calculate_feature_columns(data)
             
             # Convert back to list of dicts
-            result = []
-            for _, row in df.iterrows():
-                item = {
-                    'date': row['date'] if isinstance(row['date'], str) else row['date'].date() if hasattr(row['date'], 'date') else row['date'],
-                    'value': self._sanitize_numeric(row['value']),
-                    'z_score': self._sanitize_numeric(row.get('z_score')),
-                    'normalized': self._sanitize_numeric(row.get('normalized')),
-                    'pct_change_1m': self._sanitize_numeric(row.get('pct_change_1m')),
-                    'pct_change_3m': self._sanitize_numeric(row.get('pct_change_3m')),
-                    'pct_change_12m': self._sanitize_numeric(row.get('pct_change_12m')),
-                    'ma_30d': self._sanitize_numeric(row.get('ma_30d')),
-                    'ma_90d': self._sanitize_numeric(row.get('ma_90d')),
-                    'ma_365d': self._sanitize_numeric(row.get('ma_365d')),
-                    'volatility_30d': self._sanitize_numeric(row.get('volatility_30d')),
-                    'volatility_90d': self._sanitize_numeric(row.get('volatility_90d')),
-                    'lag_1': self._sanitize_numeric(row.get('lag_1')),
-                    'lag_3': self._sanitize_numeric(row.get('lag_3')),
-                    'lag_6': self._sanitize_numeric(row.get('lag_6')),
-                    'lag_12': self._sanitize_numeric(row.get('lag_12')),
-                    'trend': row.get('trend'),
-                    'is_outlier': bool(row.get('is_outlier', False))
-                }
-                result.append(item)
-            
-            return result
+            keys = list(columns.keys())
+            return [dict(zip(keys, row)) for row in zip(*columns.values())]
             
         except Exception as e:
             logger.error(f"Error calculating AI features: {e}")
             # Return original data if feature calculation fails
             return data
     
+    def calculate_feature_columns(self, data: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Calculate all AI features and return them as sanitized columns
+        
+        Every array has one entry per observation (sorted by date). Numeric
+        columns hold floats or None, matching calculate_features records.
+        """
+        if not data or len(data) == 0:
+            return {}
+        
+        # Convert to DataFrame
+        df = pd.DataFrame(data)
+        df = df.sort_values('date')
+        
+        # Ensure value is numeric
+        df['value'] = pd.to_numeric(df['value'], errors='coerce')
+        df = df.dropna(subset=['value'])
+        
+        if len(df) == 0:
+            return {}
+        
+        # Calculate features
+        df = self._calculate_normalization(df)
+        df = self._calculate_percentage_changes(df)
+        df = self._calculate_moving_averages(df)
+        df = self._calculate_volatility(df)
+        df = self._calculate_lag_features(df)
+        df = self._classify_trend(df)
+        df = self._detect_outliers(df)
+        
+        columns = {'date': self._output_dates(df['date'])}
+        for field in self.NUMERIC_FEATURES:
+            columns[field] = self._sanitize_array(df[field])
+        
+        columns['trend'] = df['trend'].to_numpy(dtype=object)
+        columns['is_outlier'] = df['is_outlier'].fillna(False).to_numpy(dtype=bool).astype(object)
+        
+        return columns
+    
+    def calculate_window_features(self, values: pd.Series) -> pd.DataFrame:
+        """
+        Features that only look back a bounded number of rows: percentage
+        changes, moving averages, volatility, lags and trend
+        
+        A row's features are exact once `values` holds its LOOKBACK_ROWS
+        previous observations (or the whole history before it), so trailing
+        rows can be recomputed without the full series.
+        """
+        df = pd.DataFrame({'value': pd.to_numeric(values, errors='coerce')})
+        df = self._calculate_percentage_changes(df)
+        df = self._calculate_moving_averages(df)
+        df = self._calculate_volatility(df)
+        df = self._calculate_lag_features(df)
+        return self._classify_trend(df)
+    
+    def _output_dates(self, dates: pd.Series) -> np.ndarray:
+        """Timestamps become datetime.date; strings and date objects pass through"""
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates.dt.date.to_numpy(dtype=object)
+        
+        return np.array(
+            [d if isinstance(d, str) else d.date() if hasattr(d, 'date') else d for d in dates],
+            dtype=object
+        )
+    
+    def _sanitize_array(self, values: pd.Series, max_abs=999999.0) -> np.ndarray:
+        """Vectorized _sanitize_numeric: NaN, inf and |x| > max_abs become None"""
+        arr = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        with np.errstate(invalid='ignore'):
+            invalid = ~np.isfinite(arr) | (np.abs(arr) > max_abs)
+        
+        out = arr.astype(object)
+        out[invalid] = None
+        return out
+    
     def _calculate_normalization(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate z-score and min-max normalization"""
         try:
@@ -0,0 +1,54 @@
+"""
+Async Database Pool
+Application-scoped asyncpg pool shared by the tweet, catalyst and Lobstr pipelines
+"""
+
+import asyncio
+from typing import Optional
+import asyncpg
+from config import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+async def init_async_pool() -> asyncpg.Pool:
+    """Create the shared pool if it does not exist yet"""
+    global _pool
+
+    async with _pool_lock:
+        if _pool is None:
+            # Statements run with arguments are prepared once per connection and
+            # reused from the cache, so the hot INSERT/UPSERTs skip re-parsing
+            _pool = await asyncpg.create_pool(
+                settings.DATABASE_URL,
+                min_size=settings.ASYNC_DB_POOL_MIN_SIZE,
+                max_size=settings.ASYNC_DB_POOL_MAX_SIZE,
+                command_timeout=settings.ASYNC_DB_COMMAND_TIMEOUT,
+                statement_cache_size=settings.ASYNC_DB_STATEMENT_CACHE_SIZE,
+                max_inactive_connection_lifetime=settings.ASYNC_DB_MAX_INACTIVE_CONNECTION_LIFETIME
+            )
+            logger.info(
+                f"Async database pool initialized "
+                f"(min={settings.ASYNC_DB_POOL_MIN_SIZE}, max={settings.ASYNC_DB_POOL_MAX_SIZE})"
+            )
+
+    return _pool
+
+async def get_async_pool() -> asyncpg.Pool:
+    """Return the shared pool, creating it on first use outside the FastAPI lifecycle"""
+    if _pool is None:
+        return await init_async_pool()
+    return _pool
+
+async def close_async_pool() -> None:
+    """Close the shared pool; called at application shutdown"""
+    global _pool
+
+    async with _pool_lock:
+        if _pool is not None:
+            await _pool.close()
+            _pool = None
+            logger.info("Async database pool closed")
@@ -1,22 +1,105 @@
+import numpy as np
 import pandas as pd
-import requests
+import httpx
+import asyncio
+import hashlib
+import io
+import json
 import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
-from datetime import datetime, date
+from typing import Callable, Dict, Any, Optional, List
+from datetime import datetime, date, timezone
+from config import settings
+from core.rate_limiter import TokenBucket, get_rate_limiter, parse_retry_after
+from core.response_cache import ResponseCache, get_response_cache
+from core.series import Series
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 class BaseDataFetcher(ABC):
+    # Fetchers are long-lived (see DataFetcherFactory), so each keeps one
+    # keep-alive HTTP client for the process, built on first use
+    _client: Optional[httpx.AsyncClient] = None
+    # Process-wide budget for the source, shared by every concurrent request
+    rate_limiter: Optional[TokenBucket] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        return self._client
+
+    async def _request(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET through the source's rate budget
+
+        A 429 throttles the shared bucket (for Retry-After when given) and the
+        request is retried up to HTTP_RATE_LIMIT_MAX_RETRIES times; the last
+        429 is returned so the caller can report it.
+        """
+        retries = max(0, settings.HTTP_RATE_LIMIT_MAX_RETRIES)
+        
+        for attempt in range(retries + 1):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            
+            response = await self._get_client().get(url, **kwargs)
+            
+            if response.status_code != 429:
+                if self.rate_limiter:
+                    self.rate_limiter.record_success()
+                return response
+            
+            if attempt == retries:
+                break
+            
+            retry_after = parse_retry_after(response.headers.get('retry-after'))
+            logger.warning(f"Rate limited by {url} (attempt {attempt + 1}/{retries + 1})")
+            if self.rate_limiter:
+                # The bucket now holds back every caller, including this retry
+                self.rate_limiter.throttle(retry_after)
+            elif retry_after is not None:
+                await asyncio.sleep(retry_after)
+            else:
+                await asyncio.sleep(min(2 ** attempt, settings.HTTP_RATE_LIMIT_MAX_BACKOFF_SECONDS))
+        
+        return response
+
+    async def close(self) -> None:
+        """Release the fetcher's HTTP client (called at shutdown)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
     @abstractmethod
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None, force_refresh: bool = False) -> List[Series]:
+        """
+        Fetch every '|'-separated series id; returns one Series per id, in order
+        
+        force_refresh bypasses any cached payload and downloads again.
+        """
         pass
 
+    async def get_last_updated(self, series_ids: List[str]) -> Dict[str, Optional[datetime]]:
+        """Upstream last-modified time (naive UTC) per series id; sources without one return {}"""
+        return {}
+
 class FREDDataFetcher(BaseDataFetcher):
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None):
         self.api_key = self._get_api_key()
         self.base_url = "https://api.stlouisfed.org/fred"
+        self.cache = cache
+        self.rate_limiter = get_rate_limiter('fred')
+        # series_id -> (expires_at, info) for get_series_info
+        self._series_info_memo: Dict[str, tuple] = {}
         
         if not self.api_key:
             logger.error("FRED_API_KEY not found")
@@ -39,91 +122,208 @@ class FREDDataFetcher(BaseDataFetcher):
         logger.warning("FRED API key not found in environment variables")
         return None
 
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
-        all_series_data = []
+    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None, force_refresh: bool = False) -> List[Series]:
         series_list = [s.strip() for s in series_id.split('|')] if '|' in series_id else [series_id.strip()]
 
         logger.info(f"Fetching FRED data for {len(series_list)} series: {series_list}")
 
-        for sid in series_list:
-            try:
-                url = f"{self.base_url}/series/observations"
-                params = {
-                    'series_id': sid,
-                    'api_key': self.api_key,
-                    'file_type': 'json',
-                    'observation_start': start_date.isoformat() if start_date else '1776-07-04',
-                    'observation_end': end_date.isoformat() if end_date else datetime.now().isoformat().split('T')[0],
-                    'limit': 100000,
-                    'sort_order': 'asc'
-                }
-                
-                logger.info(f"Fetching FRED data for series: {sid}")
-                response = requests.get(url, params=params, timeout=30)
-                
-                if response.status_code == 401:
-                    raise ValueError(f"FRED API authentication failed. Check your API key.")
-                elif response.status_code == 403:
-                    raise ValueError(f"FRED API access forbidden. Check your API key permissions.")
-                elif response.status_code == 429:
-                    raise ValueError(f"FRED API rate limit exceeded. Please wait and try again.")
-                elif response.status_code == 400:
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get('error_message', 'Bad Request')
-                        raise ValueError(f"FRED API Bad Request (400): {error_message}")
-                    except:
-                        raise ValueError(f"FRED API Bad Request (400): Invalid request parameters")
-                elif response.status_code == 404:
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get('error_message', 'Not Found')
-                        raise ValueError(f"FRED API Not Found (404): {error_message}")
-                    except:
-                        raise ValueError(f"FRED API Not Found (404): Series does not exist")
-                
-                response.raise_for_status()
-                
-                data = response.json()
-                observations = data.get('observations', [])
-                
-                if not observations:
-                    logger.warning(f"No observations found for FRED series: {sid}")
-                    continue
-                
-                for obs in observations:
-                    try:
-                        obs_date = pd.to_datetime(obs['date']).date()
-                        obs_value = float(obs['value']) if obs['value'] != '.' else None
-                        
-                        if obs_value is not None:
-                            all_series_data.append({
-                                'date': obs_date,
-                                'value': obs_value,
-                                'series_id': sid 
-                            })
-                    except (ValueError, KeyError) as e:
-                        logger.debug(f"Skipping invalid observation: {e}")
-                        continue
-                
-                logger.info(f"Fetched {len([d for d in all_series_data if d.get('series_id') == sid])} records for series {sid}")
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"FRED API request error for {sid}: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"Error processing FRED data for {sid}: {e}")
-                raise
+        results = await asyncio.gather(
+            *(self._fetch_series(sid, start_date, end_date, force_refresh) for sid in series_list)
+        )
+        total_records = sum(len(series) for series in results)
 
-        if not all_series_data:
+        if not total_records:
             logger.warning("No data fetched from any series")
             return []
         
-        logger.info(f"Total FRED data: {len(all_series_data)} records from {len(series_list)} series")
+        logger.info(f"Total FRED data: {total_records} records from {len(series_list)} series")
+        
+        return list(results)
+
+    @staticmethod
+    def parse_observations(observations: List[Dict[str, Any]], sid: str) -> Series:
+        """
+        Convert a FRED observations array in one pass
+
+        Dates and values are parsed column-wise; "." (FRED's missing marker)
+        and any other unparseable value or date are dropped.
+        """
+        if not observations:
+            return Series.empty(sid)
+        
+        raw_dates = [obs.get('date') for obs in observations]
+        raw_values = [obs.get('value') for obs in observations]
         
-        return all_series_data
+        dates = pd.to_datetime(raw_dates, format='%Y-%m-%d', errors='coerce').to_numpy(dtype='datetime64[D]')
+        values = pd.to_numeric(pd.Series(raw_values, dtype=object), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        valid = ~np.isnat(dates) & ~np.isnan(values)
+        skipped = len(observations) - int(valid.sum())
+        if skipped:
+            logger.debug(f"Skipped {skipped} missing or invalid observations for {sid}")
+        
+        return Series(dates[valid], values[valid], sid)
+
+    async def _fetch_series(self, sid: str, start_date: Optional[date], end_date: Optional[date], force_refresh: bool = False) -> Series:
+        try:
+            data = json.loads(await self._get_observations_body(sid, start_date, end_date, force_refresh))
+            observations = data.get('observations', [])
+            
+            if not observations:
+                logger.warning(f"No observations found for FRED series: {sid}")
+                return Series.empty(sid)
+            
+            series_data = self.parse_observations(observations, sid)
+            logger.info(f"Fetched {len(series_data)} records for series {sid}")
+            return series_data
+            
+        except httpx.TimeoutException as e:
+            logger.error(f"FRED API request timeout for {sid}: {e}")
+            raise ValueError(f"FRED API request timeout for series {sid}")
+        except httpx.HTTPError as e:
+            logger.error(f"FRED API request error for {sid}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error processing FRED data for {sid}: {e}")
+            raise
+
+    async def _get_observations_body(
+        self,
+        sid: str,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        force_refresh: bool = False
+    ) -> bytes:
+        """
+        Raw observations payload, served from the response cache when possible
+        
+        A cached entry, fresh or stale, is only reused while the series'
+        last_updated (memoized, so usually no extra request) still equals the
+        one it was stored with; a revision always downloads again, so the
+        payload matches the upstreamUpdatedAt recorded for the run. Entries
+        without a validator are trusted for the cache TTL. force_refresh
+        skips the cache.
+        """
+        if not self.cache:
+            return await self._download_observations(sid, start_date, end_date)
+        
+        # A range ending today or later is open-ended upstream, so the key
+        # leaves the end out and stays the same from one day to the next;
+        # the last_updated validator catches observations added since
+        key_end = end_date if end_date and end_date < date.today() else None
+        key = ResponseCache.make_key('fred', sid, start_date, key_end)
+        cached = None if force_refresh else await asyncio.to_thread(self.cache.get, key)
+        
+        if cached and cached.validator:
+            info = await self.get_series_info(sid)
+            last_updated = info.get('last_updated')
+            if last_updated == cached.validator or (not last_updated and self.cache.is_fresh(cached)):
+                logger.info(f"FRED series {sid} unchanged since {cached.validator}, reusing cached observations")
+                if not self.cache.is_fresh(cached):
+                    await asyncio.to_thread(self.cache.touch, key)
+                return cached.body
+            logger.info(f"FRED series {sid} revised since it was cached, downloading again")
+            body = await self._download_observations(sid, start_date, end_date)
+        elif cached and self.cache.is_fresh(cached):
+            logger.info(f"Using cached FRED observations for {sid}")
+            return cached.body
+        else:
+            body, info = await asyncio.gather(
+                self._download_observations(sid, start_date, end_date),
+                self.get_series_info(sid)
+            )
+        
+        await asyncio.to_thread(self.cache.put, key, body, info.get('last_updated'))
+        return body
+
+    async def _download_observations(self, sid: str, start_date: Optional[date], end_date: Optional[date]) -> bytes:
+        url = f"{self.base_url}/series/observations"
+        params = {
+            'series_id': sid,
+            'api_key': self.api_key,
+            'file_type': 'json',
+            'observation_start': start_date.isoformat() if start_date else '1776-07-04',
+            'observation_end': end_date.isoformat() if end_date else datetime.now().isoformat().split('T')[0],
+            'limit': 100000,
+            'sort_order': 'asc'
+        }
+        
+        logger.info(f"Fetching FRED data for series: {sid}")
+        response = await self._request(url, params=params)
+        
+        if response.status_code == 401:
+            raise ValueError(f"FRED API authentication failed. Check your API key.")
+        elif response.status_code == 403:
+            raise ValueError(f"FRED API access forbidden. Check your API key permissions.")
+        elif response.status_code == 429:
+            raise ValueError(f"FRED API rate limit exceeded after retrying. Please wait and try again.")
+        elif response.status_code == 400:
+            try:
+                error_data = response.json()
+                error_message = error_data.get('error_message', 'Bad Request')
+                raise ValueError(f"FRED API Bad Request (400): {error_message}")
+            except:
+                raise ValueError(f"FRED API Bad Request (400): Invalid request parameters")
+        elif response.status_code == 404:
+            try:
+                error_data = response.json()
+                error_message = error_data.get('error_message', 'Not Found')
+                raise ValueError(f"FRED API Not Found (404): {error_message}")
+            except:
+                raise ValueError(f"FRED API Not Found (404): Series does not exist")
+        
+        response.raise_for_status()
+        
+        return response.content
+
+    @staticmethod
+    def parse_last_updated(value: Optional[str]) -> Optional[datetime]:
+        """Parse FRED's "2024-05-01 07:48:02-05" into a naive UTC datetime"""
+        if not value:
+            return None
+        
+        # Python's %z wants +HHMM; FRED sends the offset as +HH
+        if len(value) > 3 and value[-3] in '+-' and value[-2:].isdigit():
+            value += '00'
+        
+        try:
+            parsed = datetime.strptime(value, '%Y-%m-%d %H:%M:%S%z')
+        except ValueError:
+            logger.warning(f"Unrecognized FRED last_updated value: '{value}'")
+            return None
+        
+        return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+    def _memoized_series_info(self, series_id: str) -> Optional[Dict[str, Any]]:
+        memo = self._series_info_memo.get(series_id)
+        if memo and memo[0] > time.monotonic():
+            return memo[1]
+        return None
+
+    async def get_last_updated(self, series_ids: List[str]) -> Dict[str, Optional[datetime]]:
+        """
+        last_updated for many series, looked up in batches of ETL_PREFLIGHT_BATCH_SIZE
+        
+        FRED has no multi-series metadata endpoint, so each batch is a set of
+        concurrent /series requests drawing from the shared FRED rate budget.
+        Series whose lookup fails map to None.
+        """
+        batch_size = max(1, settings.ETL_PREFLIGHT_BATCH_SIZE)
+        
+        result = {}
+        for offset in range(0, len(series_ids), batch_size):
+            batch = series_ids[offset:offset + batch_size]
+            infos = await asyncio.gather(*(self.get_series_info(sid) for sid in batch))
+            for sid, info in zip(batch, infos):
+                result[sid] = self.parse_last_updated(info.get('last_updated'))
+        
+        return result
 
     async def get_series_info(self, series_id: str) -> Dict[str, Any]:
+        memoized = self._memoized_series_info(series_id)
+        if memoized is not None:
+            return memoized
+        
         try:
             url = f"{self.base_url}/series"
             params = {
@@ -132,13 +332,13 @@ class FREDDataFetcher(BaseDataFetcher):
                 'file_type': 'json'
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = await self._request(url, params=params)
             response.raise_for_status()
             
             data = response.json()
             series_info = data.get('seriess', [{}])[0] if data.get('seriess') else {}
             
-            return {
+            info = {
                 'id': series_info.get('id'),
                 'title': series_info.get('title'),
                 'units': series_info.get('units'),
@@ -149,73 +349,213 @@ class FREDDataFetcher(BaseDataFetcher):
                 'observation_end': series_info.get('observation_end')
             }
             
+            self._series_info_memo[series_id] = (time.monotonic() + settings.FRED_SERIES_INFO_TTL_SECONDS, info)
+            return info
+            
         except Exception as e:
             logger.error(f"Failed to get series info for {series_id}: {e}")
             return {}
 
+class ShillerWorkbook:
+    """Parsed Shiller workbook held column-wise: one date array plus a float64 array per column"""
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.dates = dates
+        self.columns = columns
+
+    @classmethod
+    def parse(cls, source, is_xlsx: bool) -> 'ShillerWorkbook':
+        df = pd.read_excel(source) if is_xlsx else pd.read_csv(source)
+        
+        dates = pd.to_datetime(df['Date'], errors='coerce').dt.normalize().to_numpy(dtype='datetime64[D]')
+        columns = {
+            str(name): pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            for name in df.columns if name != 'Date'
+        }
+        
+        return cls(dates, columns)
+
+    def series(self, column: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Series:
+        """One column as a Series, with missing values/dates dropped and the range applied"""
+        if column not in self.columns:
+            raise ValueError(f"Shiller column '{column}' not found in workbook")
+        
+        values = self.columns[column]
+        mask = ~np.isnat(self.dates) & ~np.isnan(values)
+        if start_date:
+            mask &= self.dates >= np.datetime64(start_date, 'D')
+        if end_date:
+            mask &= self.dates <= np.datetime64(end_date, 'D')
+        
+        return Series(self.dates[mask], values[mask], column)
+
 class ShillerDataFetcher(BaseDataFetcher):
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None):
         self.data_url = os.getenv('SHILLER_DATA_URL')
+        self.cache = cache
+        self.rate_limiter = get_rate_limiter('shiller')
+        # (expires_at, fingerprint, workbook): every Shiller indicator in a job
+        # (and later jobs within the TTL) reuses one parse
+        self._workbook: Optional[tuple] = None
+        self._workbook_lock: Optional[asyncio.Lock] = None
         if not self.data_url:
             logger.warning("SHILLER_DATA_URL not set. Shiller data fetching might fail.")
 
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
-        try:
-            logger.info(f"Fetching Shiller data from: {self.data_url}")
-            
-            if self.data_url.endswith('.xlsx'):
-                df = pd.read_excel(self.data_url)
+    async def _get_workbook_source(self, force_refresh: bool = False):
+        """
+        Path/URL or in-memory bytes for the workbook
+        
+        Remote workbooks go through the response cache; stale entries are
+        revalidated with a conditional GET on the stored ETag/Last-Modified.
+        force_refresh downloads unconditionally.
+        """
+        if not self.data_url:
+            raise ValueError("SHILLER_DATA_URL is required for ShillerDataFetcher.")
+        
+        if not self.cache or not self.data_url.startswith(('http://', 'https://')):
+            return self.data_url
+        
+        key = ResponseCache.make_key('shiller', self.data_url)
+        cached = None if force_refresh else await asyncio.to_thread(self.cache.get, key)
+        
+        if cached and self.cache.is_fresh(cached):
+            logger.info("Using cached Shiller workbook")
+            return io.BytesIO(cached.body)
+        
+        headers = {}
+        if cached and cached.validator:
+            if cached.validator.startswith(('"', 'W/')):
+                headers['If-None-Match'] = cached.validator
             else:
-                df = pd.read_csv(self.data_url)
+                headers['If-Modified-Since'] = cached.validator
+        
+        response = await self._request(self.data_url, headers=headers, follow_redirects=True)
+        
+        if response.status_code == 304 and cached:
+            logger.info("Shiller workbook not modified, reusing cached copy")
+            await asyncio.to_thread(self.cache.touch, key)
+            return io.BytesIO(cached.body)
+        
+        response.raise_for_status()
+        
+        validator = response.headers.get('etag') or response.headers.get('last-modified')
+        await asyncio.to_thread(self.cache.put, key, response.content, validator)
+        return io.BytesIO(response.content)
+
+    @staticmethod
+    def _fingerprint(source) -> Optional[str]:
+        """Content identity of a workbook source, so an unchanged file is not parsed again"""
+        if isinstance(source, io.BytesIO):
+            return hashlib.sha256(source.getbuffer()).hexdigest()
+        if isinstance(source, str) and os.path.exists(source):
+            stat = os.stat(source)
+            return f"{stat.st_mtime_ns}:{stat.st_size}"
+        return None
+
+    async def _get_workbook(self, force_refresh: bool = False) -> ShillerWorkbook:
+        """Parsed workbook from the in-process cache, loading it at most once per TTL (unless forced)"""
+        if self._workbook_lock is None:
+            self._workbook_lock = asyncio.Lock()
+        
+        async with self._workbook_lock:
+            entry = self._workbook
+            if entry and not force_refresh and entry[0] > time.monotonic():
+                return entry[2]
             
-            df['date'] = pd.to_datetime(df['Date'], errors='coerce').dt.date
-            df['value'] = pd.to_numeric(df[series_id], errors='coerce')
+            source = await self._get_workbook_source(force_refresh)
+            fingerprint = await asyncio.to_thread(self._fingerprint, source)
+            expires_at = time.monotonic() + settings.SHILLER_WORKBOOK_TTL_SECONDS
             
-            df = df[['date', 'value']].dropna()
+            if entry and fingerprint and entry[1] == fingerprint:
+                logger.info("Shiller workbook unchanged, keeping parsed copy")
+                workbook = entry[2]
+            else:
+                logger.info(f"Parsing Shiller workbook from: {self.data_url}")
+                workbook = await asyncio.to_thread(ShillerWorkbook.parse, source, self.data_url.endswith('.xlsx'))
+            
+            self._workbook = (expires_at, fingerprint, workbook)
+            return workbook
 
-            if start_date:
-                df = df[df['date'] >= start_date]
-            if end_date:
-                df = df[df['date'] <= end_date]
+    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None, force_refresh: bool = False) -> List[Series]:
+        try:
+            logger.info(f"Fetching Shiller data from: {self.data_url}")
             
-            fetched_data = []
-            for _, row in df.iterrows():
-                fetched_data.append({
-                    'date': row['date'],
-                    'value': float(row['value'])
-                })
+            workbook = await self._get_workbook(force_refresh)
             
-            logger.info(f"Fetched {len(fetched_data)} records for Shiller series {series_id}")
-            return fetched_data
+            results = [
+                workbook.series(column.strip(), start_date, end_date)
+                for column in series_id.split('|')
+            ]
+            
+            logger.info(f"Fetched {sum(len(series) for series in results)} records for Shiller series {series_id}")
+            return results
 
         except Exception as e:
             logger.error(f"Error fetching Shiller data for {series_id}: {e}")
             raise
 
 class DataFetcherFactory:
-    @staticmethod
-    def get_fetcher(source: str) -> Optional[BaseDataFetcher]:
+    """
+    Registry of long-lived fetchers, one per source
+
+    A source is matched by substring of the indicator's source (so "FRED (calc)"
+    resolves to "fred"). Each fetcher is built on first use and then reused for
+    the process lifetime, which makes it the home of that source's HTTP client,
+    caches and rate budget. Add sources with `register`; `close_all` releases
+    everything at shutdown.
+    """
+    _builders: Dict[str, Callable[[], BaseDataFetcher]] = {}
+    _instances: Dict[str, BaseDataFetcher] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, name: str, builder: Callable[[], BaseDataFetcher]) -> None:
+        """Register (or replace) the builder for a source; a replaced instance is dropped"""
+        with cls._lock:
+            cls._builders[name.lower()] = builder
+            cls._instances.pop(name.lower(), None)
+
+    @classmethod
+    def get_fetcher(cls, source: str) -> Optional[BaseDataFetcher]:
         source_lower = source.lower()
         
-        try:
-            if "fred" in source_lower:
-                logger.info("Using real FRED API")
-                return FREDDataFetcher()
-            
-            elif "polygon" in source_lower:
-                logger.error("Polygon API is no longer supported")
-                raise ValueError("POLYGON_NOT_SUPPORTED: Polygon API is no longer available. Please use alternative data source.")
-            
-            elif "shiller" in source_lower:
-                return ShillerDataFetcher()
-            
-            else:
-                logger.warning(f"No data fetcher implemented for source: {source}")
-                return None
+        if "polygon" in source_lower:
+            logger.error("Polygon API is no longer supported")
+            return None
         
-        except Exception as e:
-            logger.error(f"Failed to create data fetcher for source {source}: {e}")
+        name = next((name for name in cls._builders if name in source_lower), None)
+        if name is None:
+            logger.warning(f"No data fetcher implemented for source: {source}")
             return None
+        
+        fetcher = cls._instances.get(name)
+        if fetcher is not None:
+            return fetcher
+        
+        with cls._lock:
+            fetcher = cls._instances.get(name)
+            if fetcher is None:
+                try:
+                    fetcher = cls._builders[name]()
+                except Exception as e:
+                    logger.error(f"Failed to create data fetcher for source {source}: {e}")
+                    return None
+                cls._instances[name] = fetcher
+                logger.info(f"Initialized {type(fetcher).__name__} for source '{name}'")
+        
+        return fetcher
+
+    @classmethod
+    async def close_all(cls) -> None:
+        with cls._lock:
+            fetchers = list(cls._instances.values())
+            cls._instances.clear()
+        
+        for fetcher in fetchers:
+            try:
+                await fetcher.close()
+            except Exception as e:
+                logger.warning(f"Failed to close {type(fetcher).__name__}: {e}")
 
     @staticmethod
     def get_available_sources() -> List[str]:
@@ -234,4 +574,7 @@ class DataFetcherFactory:
         return {
             'fred': 'configured' if os.getenv('FRED_API_KEY') else 'missing',
             'shiller': 'configured' if os.getenv('SHILLER_DATA_URL') else 'missing',
-        }
\ No newline at end of file
+        }
+
+DataFetcherFactory.register('fred', lambda: FREDDataFetcher(cache=get_response_cache()))
+DataFetcherFactory.register('shiller', lambda: ShillerDataFetcher(cache=get_response_cache()))
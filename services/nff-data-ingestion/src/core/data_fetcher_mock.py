@@ -4,7 +4,8 @@ Mock Data Fetchers for Local Development Without API Keys
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, date
-from typing import Optional, List, Dict, Any
+from typing import Optional, List
+from core.series import Series
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,10 +21,10 @@ class MockFREDDataFetcher:
         logger.warning("⚠️  Using MOCK FRED data fetcher (development mode - no API key needed)")
         self.base_url = "https://api.stlouisfed.org/fred"
     
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None, force_refresh: bool = False) -> List[Series]:
         """
         Generate mock data for development
-        Returns list of dicts with 'date' and 'value' keys
+        Returns one Series per requested series id
         """
         all_series_data = []
         series_list = [s.strip() for s in series_id.split('|')] if '|' in series_id else [series_id.strip()]
@@ -32,14 +33,9 @@ class MockFREDDataFetcher:
         
         for sid in series_list:
             df = self._generate_mock_series_data(sid, start_date, end_date)
-            # Convert DataFrame to list of dicts
-            for _, row in df.iterrows():
-                all_series_data.append({
-                    'date': row['date'],
-                    'value': float(row['value'])
-                })
+            all_series_data.append(Series.from_frame(df, sid))
         
-        logger.info(f"✅ [MOCK] Generated {len(all_series_data)} fake data points")
+        logger.info(f"✅ [MOCK] Generated {sum(len(series) for series in all_series_data)} fake data points")
         
         return all_series_data
     
@@ -141,7 +137,7 @@ class MockPolygonDataFetcher:
     def __init__(self):
         logger.warning("⚠️  Using MOCK Polygon data fetcher (development mode)")
     
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None, force_refresh: bool = False) -> List[Series]:
         ticker = series_id.strip()
         logger.info(f"📊 [MOCK] Generating fake stock data for: {ticker}")
         
@@ -158,16 +154,10 @@ class MockPolygonDataFetcher:
         daily_returns = np.random.randn(len(dates)) * 0.02  # 2% daily volatility
         prices = base_price * np.exp(np.cumsum(daily_returns))
         
-        # Convert to list of dicts
-        result = []
-        for i, d in enumerate(dates):
-            result.append({
-                'date': d.date(),
-                'value': float(prices[i])
-            })
+        result = Series(dates.to_numpy(dtype='datetime64[D]'), prices, ticker)
         
         logger.info(f"✅ [MOCK] Generated {len(result)} fake stock prices")
-        return result
+        return [result]
 
 
 class MockShillerDataFetcher:
@@ -176,7 +166,7 @@ class MockShillerDataFetcher:
     def __init__(self):
         logger.warning("⚠️  Using MOCK Shiller data fetcher (development mode)")
     
-    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+    async def fetch(self, series_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None, force_refresh: bool = False) -> List[Series]:
         logger.info(f"📊 [MOCK] Generating fake Shiller data for: {series_id}")
         
         if not start_date:
@@ -191,13 +181,7 @@ class MockShillerDataFetcher:
         base_value = 30.0  # Typical CAPE ratio
         values = base_value + np.random.randn(len(dates)) * 3
         
-        # Convert to list of dicts
-        result = []
-        for i, d in enumerate(dates):
-            result.append({
-                'date': d.date(),
-                'value': float(values[i])
-            })
+        result = Series(dates.to_numpy(dtype='datetime64[D]'), values, series_id)
         
         logger.info(f"✅ [MOCK] Generated {len(result)} fake Shiller data points")
-        return result
+        return [result]
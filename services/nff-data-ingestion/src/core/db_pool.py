@@ -1,9 +1,15 @@
 import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 from config import settings
+import asyncio
 import logging
 import atexit
+import threading
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -11,26 +17,27 @@ class DatabasePool:
     """Singleton connection pool manager"""
     
     _instance = None
+    # Created on first use by get_connection, so importing this module needs no database
     _pool = None
+    _init_lock = threading.Lock()
+    # Pool connections handed out by get_connection and not yet returned
+    _checked_out = 0
+    _stats_lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            atexit.register(cls._instance.close_pool)
         return cls._instance
     
-    def __init__(self):
-        if self._pool is None:
-            self._initialize_pool()
-            atexit.register(self.close_pool)
-    
     def _initialize_pool(self):
         """Initialize connection pool"""
         try:
             db_url = settings.DATABASE_URL
             
             self._pool = psycopg2.pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=10,
+                minconn=settings.DB_POOL_MIN_SIZE,
+                maxconn=settings.DB_POOL_MAX_SIZE,
                 dsn=db_url,
                 connect_timeout=10,
                 keepalives=1,
@@ -48,10 +55,14 @@ class DatabasePool:
         """Get a connection from the pool"""
         try:
             if self._pool is None:
-                self._initialize_pool()
+                with self._init_lock:
+                    if self._pool is None:
+                        self._initialize_pool()
             
             conn = self._pool.getconn()
             if conn:
+                with self._stats_lock:
+                    self._checked_out += 1
                 conn.cursor().execute("SELECT 1")
                 return conn
             else:
@@ -70,6 +81,8 @@ class DatabasePool:
         try:
             if self._pool and conn:
                 self._pool.putconn(conn)
+                with self._stats_lock:
+                    self._checked_out -= 1
         except Exception as e:
             logger.error(f"Error returning connection to pool: {e}")
             try:
@@ -89,6 +102,17 @@ class DatabasePool:
     def get_cursor(self, cursor_factory=None):
         """Get a connection and cursor from pool (context manager)"""
         return DatabaseConnection(self, cursor_factory)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Configured pool bounds and the pool connections currently checked out"""
+        with self._stats_lock:
+            in_use = self._checked_out
+        return {
+            "min_size": settings.DB_POOL_MIN_SIZE,
+            "max_size": settings.DB_POOL_MAX_SIZE,
+            "in_use": in_use,
+            "available": max(0, settings.DB_POOL_MAX_SIZE - in_use)
+        }
 
 class DatabaseConnection:
     def __init__(self, pool_manager, cursor_factory=None):
@@ -103,26 +127,188 @@ class DatabaseConnection:
         return self.cursor
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.cursor:
-            try:
-                if exc_type:
-                    self.conn.rollback()
-                else:
-                    self.conn.commit()
-            except Exception as e:
-                logger.error(f"Error in transaction: {e}")
-                if self.conn:
+        try:
+            if self.cursor:
+                try:
+                    if exc_type:
+                        self.conn.rollback()
+                    else:
+                        self.conn.commit()
+                except Exception as e:
+                    logger.error(f"Error in transaction: {e}")
                     try:
                         self.conn.rollback()
                     except:
                         pass
+                    # A failed commit must reach the caller; a failed rollback
+                    # leaves the original exception to propagate
+                    if not exc_type:
+                        raise
+                finally:
+                    self.cursor.close()
+        finally:
+            if self.conn:
+                self.pool_manager.return_connection(self.conn)
+        
+        return False
+
+class AsyncDatabase:
+    """
+    Async access to the shared DatabasePool
+    
+    psycopg2 is blocking, so every call runs on a worker thread. The worker
+    count equals the pool size, so callers queue here instead of exhausting
+    the pool, and the queue depth is reported as saturation metrics.
+    """
+    
+    def __init__(self, pool_manager: DatabasePool, max_workers: Optional[int] = None):
+        self.pool_manager = pool_manager
+        self.max_workers = max_workers or settings.DB_POOL_MAX_SIZE
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db-pool")
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_use = 0
+        self._acquired_total = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+    
+    async def run(self, fn: Callable[..., Any], *args, cursor_factory=None) -> Any:
+        """Run fn(cursor, *args) in one pooled transaction; commits on success, rolls back on error"""
+        with self._lock:
+            self._waiting += 1
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._run_sync, fn, args, cursor_factory, time.monotonic()
+        )
+    
+    def _run_sync(self, fn: Callable[..., Any], args: tuple, cursor_factory, submitted_at: float) -> Any:
+        waited = time.monotonic() - submitted_at
+        with self._lock:
+            self._waiting -= 1
+            self._in_use += 1
+            self._acquired_total += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        
+        try:
+            with self.pool_manager.get_cursor(cursor_factory=cursor_factory) as cur:
+                return fn(cur, *args)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+    
+    async def ping(self, timeout: int = 5) -> None:
+        """
+        Round trip to the database on a dedicated connection
+        
+        Runs on the loop's default executor, so a health check neither waits
+        behind queued queries nor takes a pool slot from them.
+        """
+        def _ping():
+            conn = psycopg2.connect(settings.DATABASE_URL, connect_timeout=timeout)
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SET statement_timeout = %s", (timeout * 1000,))
+                    cur.execute("SELECT 1")
             finally:
-                self.cursor.close()
+                conn.close()
         
-        if self.conn:
-            self.pool_manager.return_connection(self.conn)
+        await asyncio.get_running_loop().run_in_executor(None, _ping)
+    
+    async def fetch_one(self, query: str, params=None) -> Optional[Dict[str, Any]]:
+        def _fetch(cur):
+            cur.execute(query, params)
+            row = cur.fetchone()
+            return dict(row) if row else None
         
-        return False
+        return await self.run(_fetch)
+    
+    async def fetch_all(self, query: str, params=None) -> List[Dict[str, Any]]:
+        def _fetch(cur):
+            cur.execute(query, params)
+            return [dict(row) for row in cur.fetchall()]
+        
+        return await self.run(_fetch)
+    
+    async def execute(self, query: str, params=None) -> int:
+        """Execute a statement and return the affected row count"""
+        def _execute(cur):
+            cur.execute(query, params)
+            return cur.rowcount
+        
+        return await self.run(_execute)
+    
+    async def stream(self, query: str, params=None, batch_size: int = 1000) -> AsyncIterator[List[tuple]]:
+        """
+        Yield result batches (lists of tuples) from a server-side cursor
+        
+        One pooled connection and worker are held until the result is
+        exhausted or the consumer stops. At most two batches are buffered, so
+        memory stays constant however large the result is.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        stop = threading.Event()
+        
+        def _put(batch: List[tuple]) -> bool:
+            future = asyncio.run_coroutine_threadsafe(queue.put(batch), loop)
+            while True:
+                try:
+                    future.result(timeout=0.5)
+                    return True
+                except FutureTimeoutError:
+                    if stop.is_set():
+                        future.cancel()
+                        return False
+        
+        def _produce(cur):
+            with cur.connection.cursor(name=f"stream_{uuid.uuid4().hex[:12]}") as named:
+                named.itersize = batch_size
+                named.execute(query, params)
+                while not stop.is_set():
+                    batch = named.fetchmany(batch_size)
+                    if not batch or not _put(batch):
+                        return
+        
+        producer = asyncio.ensure_future(self.run(_produce))
+        
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                
+                if getter in done:
+                    yield getter.result()
+                    continue
+                
+                getter.cancel()
+                while not queue.empty():
+                    yield queue.get_nowait()
+                producer.result()
+                return
+        finally:
+            stop.set()
+            # An abandoned producer may still fail; retrieve it so it is not reported as unhandled
+            producer.add_done_callback(lambda task: task.cancelled() or task.exception())
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool saturation metrics"""
+        with self._lock:
+            acquired = self._acquired_total
+            metrics = {
+                "workers": self.max_workers,
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "saturation": round(self._in_use / self.max_workers, 3),
+                "acquired_total": acquired,
+                "avg_wait_ms": round(self._wait_seconds_total / acquired * 1000, 3) if acquired else 0.0,
+                "max_wait_ms": round(self._wait_seconds_max * 1000, 3)
+            }
+        
+        metrics["connections"] = self.pool_manager.stats()
+        return metrics
 
 db_pool = DatabasePool()
+async_db = AsyncDatabase(db_pool)
 
@@ -0,0 +1,360 @@
+"""
+ETL Status Buffer
+Write-behind buffer that coalesces per-indicator ETL bookkeeping into batched statements
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import psycopg2
+import psycopg2.extras
+from psycopg2.extras import execute_values
+from config import settings
+from core.db_pool import AsyncDatabase, async_db
+from core.query_cache import query_cache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bound of the backoff between retries of failed writes (seconds)
+_MAX_RETRY_DELAY = 60.0
+
+# (column, SQL type) written for an "IndicatorETLLog" row, in VALUES order
+_LOG_COLUMNS = [
+    ("indicatorId", "int"),
+    ("jobId", "varchar"),
+    ("status", '"ETLStatus"'),
+    ("errorCode", "varchar"),
+    ("errorMessage", "text"),
+    ("errorCategory", "varchar"),
+    ("recordsProcessed", "int"),
+    ("recordsInserted", "int"),
+    ("recordsUpdated", "int"),
+    ("startedAt", "timestamp"),
+    ("completedAt", "timestamp"),
+    ("metadata", "jsonb"),
+]
+
+# Columns of "IndicatorMetadata" the ETL status updates may set
+_STATUS_COLUMNS = [
+    ("etlStatus", '"ETLStatus"'),
+    ("lastEtlRunAt", "timestamp"),
+    ("recordsCount", "int"),
+    ("lastSuccessfulAt", "timestamp"),
+    ("etlStatusCode", "varchar"),
+    ("etlNotes", "text"),
+    ("upstreamUpdatedAt", "timestamp"),
+]
+
+_LOG_INSERT = 'INSERT INTO "IndicatorETLLog" ({columns}) VALUES %s RETURNING id, "jobId"'.format(
+    columns=", ".join(f'"{column}"' for column, _ in _LOG_COLUMNS)
+)
+
+_LOG_UPDATE = """
+    UPDATE "IndicatorETLLog" AS l
+    SET {assignments},
+        metadata = COALESCE(l.metadata, '{{}}'::jsonb) || v.metadata
+    FROM (VALUES %s) AS v(id, {columns})
+    WHERE l.id = v.id
+""".format(
+    assignments=",\n        ".join(
+        f'"{column}" = v."{column}"' for column, _ in _LOG_COLUMNS
+        if column not in ("indicatorId", "jobId", "startedAt", "metadata")
+    ),
+    columns=", ".join(f'"{column}"' for column, _ in _LOG_COLUMNS)
+)
+
+# NULL means "leave as is", matching the optional arguments of the status update
+_STATUS_UPDATE = """
+    UPDATE "IndicatorMetadata" AS im
+    SET {assignments}
+    FROM (VALUES %s) AS v(id, {columns})
+    WHERE im.id = v.id
+""".format(
+    assignments=",\n        ".join(f'"{column}" = COALESCE(v."{column}", im."{column}")' for column, _ in _STATUS_COLUMNS),
+    columns=", ".join(f'"{column}"' for column, _ in _STATUS_COLUMNS)
+)
+
+def _template(columns: List[Tuple[str, str]], with_id: bool = False) -> str:
+    casts = [f"%s::{sql_type}" for _, sql_type in columns]
+    if with_id:
+        casts.insert(0, "%s::int")
+    return "(" + ", ".join(casts) + ")"
+
+class ETLStatusBuffer:
+    """
+    Write-behind buffer for "IndicatorETLLog" rows and "IndicatorMetadata" ETL status
+
+    Writes are queued in memory and flushed together, in one transaction of
+    multi-row statements, once `flush_size` writes are pending or
+    `flush_interval` seconds after the first one. A log that is started and
+    completed between flushes becomes a single INSERT; successive status
+    updates of an indicator collapse into one UPDATE.
+
+    A batch rejected by the database is retried row by row, so one bad row
+    cannot hold back the others. Rows that violate a constraint, or still
+    fail after `max_attempts` flushes, are dropped and logged as errors;
+    connection failures are retried with exponential backoff.
+
+    Crash safety: time series data is still written synchronously and the
+    bookkeeping writes are idempotent. flush() returns False when any write
+    failed; jobs flush before they are marked COMPLETED (FAILED if the flush
+    fails) and the app flushes on shutdown, so only a hard crash can lose at
+    most one flush window; indicators left in PROCESSING are reset on their
+    next run.
+    """
+
+    def __init__(self, db: AsyncDatabase, flush_size: int = 50, flush_interval: float = 0.5, max_attempts: int = 8):
+        self.db = db
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.max_attempts = max(1, max_attempts)
+        # log key ("jobId" of the row) -> {'row': values, 'id': DB id once inserted, 'dirty': bool, 'attempts': int}
+        self._logs: Dict[str, Dict[str, Any]] = {}
+        # indicator id -> columns to set
+        self._statuses: Dict[int, Dict[str, Any]] = {}
+        # indicator id -> failed writes of its queued status
+        self._status_attempts: Dict[int, int] = {}
+        # Consecutive flushes with failures, for the retry backoff
+        self._failures = 0
+        self._pending = 0
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+
+    def start_log(self, indicator_id: int) -> str:
+        """Queue a PROCESSING log row; returns its key for complete_log"""
+        key = f"LOG_{uuid.uuid4().hex[:12]}"
+        self._logs[key] = {
+            'row': {
+                'indicatorId': indicator_id,
+                'jobId': key,
+                'status': 'PROCESSING',
+                'recordsProcessed': 0,
+                'recordsInserted': 0,
+                'recordsUpdated': 0,
+                'startedAt': datetime.now(),
+                'metadata': {}
+            },
+            'id': None,
+            'dirty': True,
+            'attempts': 0
+        }
+        self._mark()
+        return key
+
+    def complete_log(self, key: str, metadata: Optional[Dict[str, Any]] = None, **fields: Any) -> None:
+        entry = self._logs.get(key)
+        if entry is None:
+            logger.warning(f"Unknown ETL log {key}, completion dropped")
+            return
+
+        entry['row'].update(fields)
+        entry['row']['metadata'] = {**entry['row']['metadata'], **(metadata or {})}
+        entry['dirty'] = True
+        self._mark()
+
+    def update_status(self, indicator_id: int, columns: Dict[str, Any]) -> None:
+        """Queue "IndicatorMetadata" ETL columns for an indicator; later values win"""
+        unknown = set(columns) - {column for column, _ in _STATUS_COLUMNS}
+        if unknown:
+            raise ValueError(f"Unsupported ETL status columns: {sorted(unknown)}")
+
+        self._statuses.setdefault(indicator_id, {}).update(columns)
+        self._mark()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _mark(self) -> None:
+        self._pending += 1
+        if self._pending >= self.flush_size:
+            self._pending = 0
+            self._spawn(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = self._spawn(self._flush_later())
+
+    async def _flush_later(self, delay: Optional[float] = None) -> None:
+        await asyncio.sleep(self.flush_interval if delay is None else delay)
+        await self.flush()
+
+    async def flush(self) -> bool:
+        """Write everything queued so far; False if any write failed (kept for a retry or dropped)"""
+        async with self._lock:
+            self._pending = 0
+            logs = [(key, entry) for key, entry in self._logs.items() if entry['dirty']]
+            statuses, self._statuses = self._statuses, {}
+
+            if not logs and not statuses:
+                return True
+
+            for _, entry in logs:
+                entry['dirty'] = False
+
+            try:
+                ids = await self.db.run(self._write, *self._batch(logs, statuses))
+                failed_logs, failed_statuses = [], {}
+            except Exception as e:
+                if isinstance(e, psycopg2.Error) and not isinstance(e, psycopg2.OperationalError):
+                    # A bad row aborts the whole batch: write rows one by one to isolate it
+                    logger.warning(f"ETL status batch failed, retrying {len(logs)} logs and {len(statuses)} statuses row by row: {e}")
+                    ids, failed_logs, failed_statuses = await self._write_rows(logs, statuses)
+                else:
+                    logger.error(f"ETL status flush failed, keeping {len(logs)} log and {len(statuses)} status writes: {e}")
+                    ids = {}
+                    failed_logs = [(key, entry, e) for key, entry in logs]
+                    failed_statuses = {indicator_id: (columns, e) for indicator_id, columns in statuses.items()}
+
+            for key, log_id in ids.items():
+                if key in self._logs:
+                    self._logs[key]['id'] = log_id
+
+            written = [indicator_id for indicator_id in statuses if indicator_id not in failed_statuses]
+            for indicator_id in written:
+                self._status_attempts.pop(indicator_id, None)
+            if written:
+                await query_cache.invalidate("indicators", *(f"indicator:{indicator_id}" for indicator_id in written))
+
+            failed_keys = {key for key, _, _ in failed_logs}
+            for key, entry in logs:
+                if key not in failed_keys:
+                    entry['attempts'] = 0
+            self._requeue(failed_logs, failed_statuses)
+
+            # Finished logs will not change again; running ones stay for their completion
+            for key, entry in logs:
+                if key in self._logs and not entry['dirty'] and entry['row']['status'] != 'PROCESSING':
+                    del self._logs[key]
+
+            if failed_logs or failed_statuses:
+                self._failures += 1
+                if self._timer is None or self._timer.done():
+                    delay = min(self.flush_interval * 2 ** self._failures, _MAX_RETRY_DELAY)
+                    self._timer = self._spawn(self._flush_later(delay))
+            else:
+                self._failures = 0
+
+            logger.debug(
+                f"Flushed {len(logs) - len(failed_logs)} logs and {len(written)} indicator statuses, "
+                f"{len(failed_logs)} logs and {len(failed_statuses)} statuses failed"
+            )
+            return not failed_logs and not failed_statuses
+
+    @staticmethod
+    def _batch(
+        logs: List[Tuple[str, Dict[str, Any]]],
+        statuses: Dict[int, Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, Dict[str, Any]]], Dict[int, Dict[str, Any]]]:
+        inserts = [dict(entry['row']) for _, entry in logs if entry['id'] is None]
+        updates = [(entry['id'], dict(entry['row'])) for _, entry in logs if entry['id'] is not None]
+        return inserts, updates, statuses
+
+    async def _write_rows(
+        self,
+        logs: List[Tuple[str, Dict[str, Any]]],
+        statuses: Dict[int, Dict[str, Any]]
+    ) -> Tuple[Dict[str, int], List[Tuple[str, Dict[str, Any], Exception]], Dict[int, Tuple[Dict[str, Any], Exception]]]:
+        """Write each log and status in its own transaction; returns the new log ids and the failures"""
+        ids: Dict[str, int] = {}
+        failed_logs = []
+        failed_statuses = {}
+
+        for key, entry in logs:
+            try:
+                ids.update(await self.db.run(self._write, *self._batch([(key, entry)], {})))
+            except Exception as e:
+                failed_logs.append((key, entry, e))
+
+        for indicator_id, columns in statuses.items():
+            try:
+                await self.db.run(self._write, [], [], {indicator_id: columns})
+            except Exception as e:
+                failed_statuses[indicator_id] = (columns, e)
+
+        return ids, failed_logs, failed_statuses
+
+    def _requeue(
+        self,
+        failed_logs: List[Tuple[str, Dict[str, Any], Exception]],
+        failed_statuses: Dict[int, Tuple[Dict[str, Any], Exception]]
+    ) -> None:
+        """Keep failed writes for the next flush, or drop them once they cannot succeed"""
+        for key, entry, error in failed_logs:
+            entry['attempts'] += 1
+            if self._is_permanent(error) or entry['attempts'] >= self.max_attempts:
+                # Dead letter: the row goes to the error log instead of blocking every later flush
+                logger.error(f"Dropping ETL log {key} after {entry['attempts']} attempts: {error}; row: {entry['row']}")
+                self._logs.pop(key, None)
+            else:
+                entry['dirty'] = True
+
+        for indicator_id, (columns, error) in failed_statuses.items():
+            attempts = self._status_attempts.get(indicator_id, 0) + 1
+            if self._is_permanent(error) or attempts >= self.max_attempts:
+                logger.error(f"Dropping ETL status of indicator {indicator_id} after {attempts} attempts: {error}; columns: {columns}")
+                self._status_attempts.pop(indicator_id, None)
+            else:
+                self._status_attempts[indicator_id] = attempts
+                self._statuses[indicator_id] = {**columns, **self._statuses.get(indicator_id, {})}
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        """Constraint and data errors fail the same way on every retry"""
+        return isinstance(error, (psycopg2.IntegrityError, psycopg2.DataError))
+
+    @staticmethod
+    def _write(
+        cur,
+        inserts: List[Dict[str, Any]],
+        updates: List[Tuple[int, Dict[str, Any]]],
+        statuses: Dict[int, Dict[str, Any]]
+    ) -> Dict[str, int]:
+        def _log_values(row: Dict[str, Any]) -> tuple:
+            return tuple(
+                psycopg2.extras.Json(row.get(column) or {}) if column == 'metadata' else row.get(column)
+                for column, _ in _LOG_COLUMNS
+            )
+
+        ids = {}
+        if inserts:
+            rows = execute_values(
+                cur, _LOG_INSERT, [_log_values(row) for row in inserts],
+                template=_template(_LOG_COLUMNS), fetch=True
+            )
+            ids = {row['jobId']: row['id'] for row in rows}
+
+        if updates:
+            execute_values(
+                cur, _LOG_UPDATE, [(log_id,) + _log_values(row) for log_id, row in updates],
+                template=_template(_LOG_COLUMNS, with_id=True)
+            )
+
+        if statuses:
+            # Ordered by id so concurrent flushes lock rows in the same order
+            execute_values(
+                cur, _STATUS_UPDATE,
+                [
+                    (indicator_id,) + tuple(statuses[indicator_id].get(column) for column, _ in _STATUS_COLUMNS)
+                    for indicator_id in sorted(statuses)
+                ],
+                template=_template(_STATUS_COLUMNS, with_id=True)
+            )
+
+        return ids
+
+    async def close(self) -> bool:
+        """Stop the timer and flush what is left (app shutdown)"""
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+        return await self.flush()
+
+etl_status_buffer = ETLStatusBuffer(
+    async_db,
+    flush_size=settings.ETL_STATUS_FLUSH_SIZE,
+    flush_interval=settings.ETL_STATUS_FLUSH_INTERVAL_MS / 1000,
+    max_attempts=settings.ETL_STATUS_MAX_ATTEMPTS
+)
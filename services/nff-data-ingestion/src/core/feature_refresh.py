@@ -0,0 +1,298 @@
+"""
+Feature Refresh
+Incremental maintenance of the derived feature columns of "IndicatorTimeSeries"
+"""
+
+from collections import deque
+from datetime import date
+from typing import Any, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+from core.ai_features import AIFeaturesCalculator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (column, SQL type) in VALUES order; the types match the Prisma schema so
+# recomputed values compare equal to stored ones when nothing changed
+_FEATURE_COLUMNS = [
+    ("zScore", "numeric(8, 4)"),
+    ("normalized", "numeric(8, 6)"),
+    ("pctChange1m", "numeric(10, 4)"),
+    ("pctChange3m", "numeric(10, 4)"),
+    ("pctChange12m", "numeric(10, 4)"),
+    ("ma30d", "numeric(15, 6)"),
+    ("ma90d", "numeric(15, 6)"),
+    ("ma365d", "numeric(15, 6)"),
+    ("volatility30d", "numeric(15, 6)"),
+    ("volatility90d", "numeric(15, 6)"),
+    ("lag1", "numeric(15, 6)"),
+    ("lag3", "numeric(15, 6)"),
+    ("lag6", "numeric(15, 6)"),
+    ("lag12", "numeric(15, 6)"),
+    ("trend", "varchar(10)"),
+    ("isOutlier", "boolean"),
+]
+
+# calculate_window_features column for each window feature
+_WINDOW_FEATURES = {
+    "pctChange1m": "pct_change_1m",
+    "pctChange3m": "pct_change_3m",
+    "pctChange12m": "pct_change_12m",
+    "ma30d": "ma_30d",
+    "ma90d": "ma_90d",
+    "ma365d": "ma_365d",
+    "volatility30d": "volatility_30d",
+    "volatility90d": "volatility_90d",
+    "lag1": "lag_1",
+    "lag3": "lag_3",
+    "lag6": "lag_6",
+    "lag12": "lag_12",
+}
+
+# Whole-series statistics; rewritten on every row from the FeatureState totals
+_STATISTIC_COLUMNS = ("zScore", "normalized", "isOutlier")
+
+# Window features, recomputed only for the refreshed rows
+_WINDOW_COLUMNS = [(column, sql_type) for column, sql_type in _FEATURE_COLUMNS if column not in _STATISTIC_COLUMNS]
+
+# Only rows whose features actually change are rewritten
+_FEATURE_UPDATE = """
+    UPDATE "IndicatorTimeSeries" AS t
+    SET {assignments}
+    FROM (VALUES %s) AS v(id, date, {columns})
+    WHERE t."indicatorMetadataId" = v.id
+    AND t.date = v.date
+    AND ({current}) IS DISTINCT FROM ({incoming})
+    RETURNING t.date
+""".format(
+    assignments=",\n        ".join(f'"{column}" = v."{column}"' for column, _ in _WINDOW_COLUMNS),
+    columns=", ".join(f'"{column}"' for column, _ in _WINDOW_COLUMNS),
+    current=", ".join(f't."{column}"' for column, _ in _WINDOW_COLUMNS),
+    incoming=", ".join(f'v."{column}"' for column, _ in _WINDOW_COLUMNS)
+)
+
+_FEATURE_TEMPLATE = "(%s::int, %s::date, " + ", ".join(f"%s::{sql_type}" for _, sql_type in _WINDOW_COLUMNS) + ")"
+
+# zScore/normalized/isOutlier of every row against the whole series, as in
+# AIFeaturesCalculator._calculate_normalization and _detect_outliers,
+# computed in place from the totals so the history never leaves Postgres
+_STATISTICS_UPDATE = """
+    WITH scaled AS (
+        SELECT id,
+            CASE WHEN %(std)s > 0 THEN (value::float8 - %(mean)s) / %(std)s ELSE 0 END AS z,
+            CASE WHEN %(span)s > 0 THEN (value::float8 - %(min)s) / %(span)s ELSE 0.5 END AS n
+        FROM "IndicatorTimeSeries"
+        WHERE "indicatorMetadataId" = %(indicator_id)s AND value IS NOT NULL
+    ), features AS (
+        SELECT id,
+            (CASE WHEN abs(z) <= 9999 THEN z END)::numeric(8, 4) AS "zScore",
+            n::numeric(8, 6) AS normalized,
+            abs(z) > 3 AS "isOutlier"
+        FROM scaled
+    )
+    UPDATE "IndicatorTimeSeries" AS t
+    SET "zScore" = f."zScore",
+        normalized = f.normalized,
+        "isOutlier" = f."isOutlier"
+    FROM features AS f
+    WHERE t.id = f.id
+    AND (t."zScore", t.normalized, t."isOutlier") IS DISTINCT FROM (f."zScore", f.normalized, f."isOutlier")
+    RETURNING t.date
+"""
+
+# Running statistics of every observation before the refreshed range:
+# count, mean, sum of squared deviations (M2), min, max
+_PRIOR_STATS = """
+    SELECT
+        count(value),
+        avg(value)::float8,
+        (coalesce(var_samp(value), 0) * greatest(count(value) - 1, 0))::float8,
+        min(value)::float8,
+        max(value)::float8
+    FROM "IndicatorTimeSeries"
+    WHERE "indicatorMetadataId" = %s AND date < %s AND value IS NOT NULL
+"""
+
+_STATE_COLUMNS = ["lastDate", "count", "mean", "m2", "minValue", "maxValue", "recentValues"]
+
+_STATE_SELECT = 'SELECT {columns} FROM "IndicatorFeatureState" WHERE "indicatorId" = %s FOR UPDATE'.format(
+    columns=", ".join(f'"{column}"' for column in _STATE_COLUMNS)
+)
+
+_STATE_UPSERT = """
+    INSERT INTO "IndicatorFeatureState" ("indicatorId", {columns}, "updatedAt")
+    VALUES (%s, {placeholders}, NOW())
+    ON CONFLICT ("indicatorId") DO UPDATE SET
+        {updates},
+        "updatedAt" = NOW()
+""".format(
+    columns=", ".join(f'"{column}"' for column in _STATE_COLUMNS),
+    placeholders=", ".join(["%s"] * len(_STATE_COLUMNS)),
+    updates=",\n        ".join(f'"{column}" = EXCLUDED."{column}"' for column in _STATE_COLUMNS)
+)
+
+class FeatureState:
+    """
+    Running statistics of an indicator's observations up to `last_date`
+
+    count/mean/m2 are Welford accumulators, merged a batch at a time with
+    Chan's parallel update; min/max are running extrema and `recent` is a
+    ring buffer of the last LOOKBACK_ROWS values for the window features.
+    Persisted in "IndicatorFeatureState" so appended observations need
+    neither the history nor an aggregate over it.
+    """
+
+    def __init__(
+        self,
+        last_date: Optional[date] = None,
+        count: int = 0,
+        mean: float = 0.0,
+        m2: float = 0.0,
+        min_value: Optional[float] = None,
+        max_value: Optional[float] = None,
+        recent: Iterable[float] = ()
+    ):
+        self.last_date = last_date
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min_value = min_value
+        self.max_value = max_value
+        self.recent = deque(recent, maxlen=AIFeaturesCalculator.LOOKBACK_ROWS)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (0 below two observations, where the batch z-score is 0)"""
+        if self.count < 2:
+            return 0.0
+        return float(np.sqrt(max(self.m2, 0.0) / (self.count - 1)))
+
+    def push(self, last_date: date, values: np.ndarray) -> None:
+        """Fold in observations that follow everything already counted"""
+        if len(values) == 0:
+            return
+
+        batch_count = len(values)
+        batch_mean = float(values.mean())
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean += delta * batch_count / total
+        self.m2 += batch_m2 + delta * delta * self.count * batch_count / total
+        self.count = total
+
+        batch_min, batch_max = float(values.min()), float(values.max())
+        self.min_value = batch_min if self.min_value is None else min(self.min_value, batch_min)
+        self.max_value = batch_max if self.max_value is None else max(self.max_value, batch_max)
+
+        self.recent.extend(values.tolist())
+        self.last_date = last_date
+
+    @classmethod
+    def load(cls, cur, indicator_id: int) -> Optional["FeatureState"]:
+        """Stored state, row-locked until the transaction ends"""
+        cur.execute(_STATE_SELECT, (indicator_id,))
+        row = cur.fetchone()
+        if row is None:
+            return None
+        last_date, count, mean, m2, min_value, max_value, recent = row
+        return cls(last_date, count, mean, m2, min_value, max_value, recent or ())
+
+    def save(self, cur, indicator_id: int) -> None:
+        cur.execute(_STATE_UPSERT, (
+            indicator_id, self.last_date, self.count, self.mean, self.m2,
+            self.min_value, self.max_value, list(self.recent)
+        ))
+
+def _sanitize(values: np.ndarray, max_abs: float = 999999.0) -> List[Optional[float]]:
+    """NaN, inf and |x| > max_abs become None, as in AIFeaturesCalculator"""
+    with np.errstate(invalid='ignore'):
+        invalid = ~np.isfinite(values) | (np.abs(values) > max_abs)
+    out = values.astype(object)
+    out[invalid] = None
+    return out.tolist()
+
+def refresh_features(cur, indicator_id: int, since: Optional[date] = None) -> int:
+    """
+    Recompute the window features of an indicator's rows dated `since` or
+    later (all rows when None) and the statistics features of every row;
+    returns how many rows changed
+
+    When every refreshed row follows the persisted FeatureState (plain
+    appends) only the new rows are read and the state supplies the lookback
+    values and running totals: O(new rows + window) rows read. Otherwise (first
+    run, revisions of older dates, force refresh) the rows from `since`, the
+    AIFeaturesCalculator.LOOKBACK_ROWS observations before them and one
+    aggregate of the older history are read, and the state is rebuilt.
+
+    zScore/normalized/isOutlier are whole-series statistics, as in the
+    batch calculator, so they move on every row whenever the totals do;
+    they are rewritten in one UPDATE from the persisted totals, without
+    reading the history. Rows without a value keep empty features. `cur`
+    must return tuple rows.
+    """
+    calculator = AIFeaturesCalculator()
+    state = FeatureState.load(cur, indicator_id)
+
+    query = 'SELECT date, value::float8 FROM "IndicatorTimeSeries" WHERE "indicatorMetadataId" = %s AND value IS NOT NULL'
+    params: List[Any] = [indicator_id]
+
+    if state is not None and since is not None and since > state.last_date:
+        query += " AND date > %s"
+        params.append(state.last_date)
+    else:
+        state = FeatureState()
+        if since is not None:
+            cur.execute("""
+                SELECT value::float8 FROM "IndicatorTimeSeries"
+                WHERE "indicatorMetadataId" = %s AND date < %s AND value IS NOT NULL
+                ORDER BY date DESC
+                LIMIT %s
+            """, (indicator_id, since, calculator.LOOKBACK_ROWS))
+            recent = [value for value, in reversed(cur.fetchall())]
+
+            cur.execute(_PRIOR_STATS, (indicator_id, since))
+            count0, mean0, m2_0, min0, max0 = cur.fetchone()
+            if count0:
+                state = FeatureState(None, count0, mean0, m2_0, min0, max0, recent)
+
+            query += " AND date >= %s"
+            params.append(since)
+
+    cur.execute(query + " ORDER BY date", params)
+    rows = cur.fetchall()
+
+    if not rows:
+        return 0
+
+    new_values = np.array([value for _, value in rows], dtype=np.float64)
+    values = np.concatenate([np.array(state.recent, dtype=np.float64), new_values])
+    offset = len(state.recent)
+    window = calculator.calculate_window_features(pd.Series(values)).iloc[offset:]
+
+    state.push(rows[-1][0], new_values)
+    state.save(cur, indicator_id)
+
+    features = {column: _sanitize(window[source].to_numpy(dtype=np.float64)) for column, source in _WINDOW_FEATURES.items()}
+    features["trend"] = window["trend"].tolist()
+
+    updates = [
+        (indicator_id, row[0]) + tuple(features[column][i] for column, _ in _WINDOW_COLUMNS)
+        for i, row in enumerate(rows)
+    ]
+    changed = {row[0] for row in execute_values(cur, _FEATURE_UPDATE, updates, template=_FEATURE_TEMPLATE, page_size=1000, fetch=True)}
+
+    cur.execute(_STATISTICS_UPDATE, {
+        "indicator_id": indicator_id,
+        "mean": state.mean,
+        "std": state.std,
+        "min": state.min_value,
+        "span": state.max_value - state.min_value
+    })
+    changed.update(row[0] for row in cur.fetchall())
+
+    logger.debug(f"Refreshed features of indicator {indicator_id} from {since or 'start'}: {len(changed)} rows changed ({len(rows)} windows recomputed)")
+    return len(changed)
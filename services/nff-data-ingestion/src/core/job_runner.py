@@ -0,0 +1,90 @@
+"""
+ETL Job Runner
+Runs indicator fetches concurrently under a global limit
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class ETLJobRunner:
+    """Bounded-concurrency executor for the indicators of one ETL job"""
+
+    def __init__(self, max_concurrency: int = 8, progress_interval: float = 2.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.progress_interval = progress_interval
+
+    async def run(
+        self,
+        items: List[Dict[str, Any]],
+        worker: Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]],
+        on_progress: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """
+        Run `worker` for every item and tally the result statuses
+
+        Each item must carry an `id`. A worker returning None counts as skipped.
+        Source rate budgets are enforced per request by the fetchers.
+        """
+        counts = {'successful': 0, 'failed': 0, 'blocked': 0, 'skipped': 0, 'processed': 0}
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        async def _process(item: Dict[str, Any]) -> None:
+            try:
+                result = await worker(item)
+                status = result.get('status') if result else None
+            except Exception as e:
+                logger.error(f"Error processing indicator {item.get('id')}: {e}")
+                status = 'ERROR'
+
+            if status is None:
+                counts['skipped'] += 1
+            elif status == 'OK':
+                counts['successful'] += 1
+            elif status == 'BLOCKED':
+                counts['blocked'] += 1
+            else:
+                counts['failed'] += 1
+            counts['processed'] += 1
+
+        async def _worker_loop() -> None:
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await _process(item)
+
+        async def _send_progress() -> None:
+            try:
+                await on_progress(dict(counts))
+            except Exception as e:
+                logger.warning(f"Failed to report job progress: {e}")
+
+        async def _report_progress() -> None:
+            last_reported = -1
+            while True:
+                await asyncio.sleep(self.progress_interval)
+                if counts['processed'] != last_reported:
+                    last_reported = counts['processed']
+                    await _send_progress()
+
+        reporter = asyncio.create_task(_report_progress()) if on_progress else None
+        workers = min(self.max_concurrency, len(items))
+
+        try:
+            await asyncio.gather(*(_worker_loop() for _ in range(workers)))
+        finally:
+            if reporter:
+                reporter.cancel()
+                try:
+                    await reporter
+                except asyncio.CancelledError:
+                    pass
+                await _send_progress()
+
+        return counts
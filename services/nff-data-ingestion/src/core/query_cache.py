@@ -0,0 +1,344 @@
+"""
+Query Cache
+Two-tier read-through cache (in-process LRU + Redis) for hot read queries with tag-based invalidation
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import redis.asyncio as redis
+from config import settings
+from utils.cache import redis_binary_client, redis_client
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump to orphan every entry written by an older serialization or key scheme
+_KEY_VERSION = "v1"
+
+# Invalidated tags are published here so every worker drops its local copies
+_INVALIDATION_CHANNEL = "nff:cache:invalidate"
+
+class LocalCache:
+    """
+    Bounded in-process LRU of encoded payloads with a per-entry TTL
+
+    Payloads stay encoded so callers never share (and mutate) cached objects.
+    Every invalidation bumps a per-tag generation (and `clear` an epoch); a
+    put made with the `generation` read before loading is dropped if any of
+    its tags was invalidated meanwhile. Not thread-safe; used from the event
+    loop only.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expires at, payload, tags)
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return (self._epoch,) + tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def put(self, key: str, payload: bytes, tags: Iterable[str], generation: Optional[Tuple[int, ...]] = None) -> None:
+        tags = tuple(tags)
+        if generation is not None and generation != self.generation(tags):
+            return
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, payload, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self._generations.clear()
+        self._epoch += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class QueryCache:
+    """
+    Read-through cache for query results in Redis
+
+    Entries are keyed by `nff:q:<version>:<namespace>:<digest of params>` and
+    stored as zlib-compressed compact JSON. Each entry is added to the Redis
+    sets of its tags (e.g. `indicator:12`), and writers call `invalidate` with
+    the tags they touched, which drops exactly the entries that depend on
+    them. Tag sets live for `tag_ttl` (at least the longest entry TTL) from
+    their last write, so they never expire before an entry they reference.
+
+    Invalidation also increments a generation counter per tag. A miss reads
+    the generations of its tags together with the entry, and the result is
+    only stored (WATCH/MULTI) if none of them moved while the loader ran, so
+    a load that read the database before a writer committed cannot put stale
+    data back after the writer's invalidation.
+
+    Lookups made with `local=True` are also kept in a small in-process LRU
+    (`local`) so repeats skip the network. Invalidated tags are published on
+    Redis pub/sub and every worker's `listen` task drops its local copies;
+    the local tier is only used while that subscription is live, so a worker
+    that may have missed invalidations never serves from it.
+
+    Redis is an optimization only: on any Redis error the loader result is
+    returned as is, and Redis is skipped for `retry_after` seconds. An
+    invalidation missed that way is bounded by the entries' TTL.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        local: LocalCache,
+        pubsub_client: Optional[redis.Redis] = None,
+        enabled: bool = True,
+        tag_ttl: int = 3600,
+        retry_after: float = 30.0
+    ):
+        self.client = client
+        self.local = local
+        self.pubsub_client = pubsub_client or client
+        self.enabled = enabled
+        self.tag_ttl = tag_ttl
+        self.retry_after = retry_after
+        self._unavailable_until = 0.0
+        self._subscribed = False
+        self._listener: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def make_key(namespace: str, params: Any) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"nff:q:{_KEY_VERSION}:{namespace}:{digest}"
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"nff:tag:{tag}"
+
+    @staticmethod
+    def _generation_key(tag: str) -> str:
+        return f"nff:gen:{tag}"
+
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        return zlib.compress(json.dumps(value, separators=(",", ":"), default=str).encode(), 1)
+
+    @staticmethod
+    def decode(payload: bytes) -> Any:
+        return json.loads(zlib.decompress(payload))
+
+    def _available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._unavailable_until
+
+    def _failed(self, action: str, error: Exception) -> None:
+        self._unavailable_until = time.monotonic() + self.retry_after
+        logger.warning(f"Query cache {action} failed, bypassing Redis for {self.retry_after:.0f}s: {error}")
+
+    def _local_enabled(self) -> bool:
+        return self.enabled and self._subscribed
+
+    async def _read(self, key: str, tags: List[str]) -> Tuple[Optional[bytes], List[Optional[bytes]]]:
+        """The entry and the current generations of its tags, in one round trip"""
+        if not tags:
+            return await self.client.get(key), []
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.mget([self._generation_key(tag) for tag in tags])
+            payload, generations = await pipe.execute()
+        return payload, generations
+
+    async def _set(self, key: str, payload: bytes, ttl: int, tags: List[str], generations: List[Optional[bytes]]) -> bool:
+        """Store an entry unless one of its tags was invalidated since `generations` was read"""
+        generation_keys = [self._generation_key(tag) for tag in tags]
+        async with self.client.pipeline(transaction=True) as pipe:
+            try:
+                if generation_keys:
+                    await pipe.watch(*generation_keys)
+                    if await pipe.mget(generation_keys) != generations:
+                        return False
+                pipe.multi()
+                pipe.set(key, payload, ex=ttl)
+                for tag in tags:
+                    tag_key = self._tag_key(tag)
+                    pipe.sadd(tag_key, key)
+                    pipe.expire(tag_key, max(ttl, self.tag_ttl))
+                await pipe.execute()
+            except redis.WatchError:
+                return False
+        return True
+
+    async def _invalidate(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                generation_key = self._generation_key(tag)
+                pipe.incr(generation_key)
+                pipe.expire(generation_key, self.tag_ttl)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            results = await pipe.execute()
+        keys = set().union(*results[2 * len(tags):]) if tag_keys else set()
+        await self.client.unlink(*keys, *tag_keys)
+        return len(keys)
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        params: Any,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        tags: Iterable[str] = (),
+        local: bool = False
+    ) -> Any:
+        """
+        Cached result for (namespace, params), running `loader` on a miss
+
+        local=True also checks and fills the in-process tier first. A None
+        result (row not found) is never cached: rows are created by other
+        services too, and no invalidation would announce them.
+        """
+        tags = list(tags)
+        key = self.make_key(namespace, params)
+        local = local and self._local_enabled()
+
+        if local:
+            payload = self.local.get(key)
+            if payload is not None:
+                return self.decode(payload)
+            local_generation = self.local.generation(tags)
+
+        if not self._available():
+            return await loader()
+
+        try:
+            payload, generations = await self._read(key, tags)
+        except Exception as e:
+            self._failed("read", e)
+            return await loader()
+
+        if payload is not None:
+            if local:
+                self.local.put(key, payload, tags, local_generation)
+            return self.decode(payload)
+
+        value = await loader()
+        if value is None:
+            return value
+        payload = self.encode(value)
+
+        try:
+            stored = await self._set(key, payload, ttl, tags, generations)
+        except Exception as e:
+            self._failed("write", e)
+            return value
+
+        if not stored:
+            logger.debug(f"Query cache skipped storing {namespace}: {tags} invalidated while loading")
+        elif local:
+            self.local.put(key, payload, tags, local_generation)
+
+        return value
+
+    async def invalidate(self, *tags: str) -> None:
+        """Drop every entry tagged with any of `tags`, here and on every other worker"""
+        if not tags:
+            return
+
+        self.local.invalidate(tags)
+
+        if not self._available():
+            return
+
+        try:
+            dropped = await self._invalidate(tags)
+            # After the Redis entries are gone, so workers refill from the database
+            await self.client.publish(_INVALIDATION_CHANNEL, json.dumps(list(tags)))
+            logger.debug(f"Query cache dropped {dropped} entries for {list(tags)}")
+        except Exception as e:
+            self._failed("invalidation", e)
+
+    async def listen(self) -> None:
+        """Apply invalidations published by any worker to the local tier (runs until cancelled)"""
+        while True:
+            pubsub = self.pubsub_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(_INVALIDATION_CHANNEL)
+                # Anything cached before (re)subscribing may have missed messages
+                self.local.clear()
+                self._subscribed = True
+                logger.info("Query cache subscribed to invalidations")
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.local.invalidate(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Query cache invalidation subscription lost, retrying in {self.retry_after:.0f}s: {e}")
+            finally:
+                self._subscribed = False
+                self.local.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(self.retry_after)
+
+    def start(self) -> None:
+        """Start the invalidation listener (application startup)"""
+        if self.enabled and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.get_running_loop().create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+query_cache = QueryCache(
+    redis_binary_client,
+    LocalCache(settings.QUERY_CACHE_LOCAL_MAX_ENTRIES, settings.QUERY_CACHE_LOCAL_TTL_SECONDS),
+    # Blocking subscription reads need a client without the short socket timeout
+    pubsub_client=redis_client,
+    enabled=settings.QUERY_CACHE_ENABLED,
+    tag_ttl=max(settings.QUERY_CACHE_METADATA_TTL_SECONDS, settings.QUERY_CACHE_TIME_SERIES_TTL_SECONDS)
+)
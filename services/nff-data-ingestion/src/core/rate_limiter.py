@@ -0,0 +1,133 @@
+"""
+Rate Limiter
+Adaptive token buckets shared by every concurrent caller of a data source
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from config import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TokenBucket:
+    """
+    Async token bucket: refills at `rate` tokens/second up to `capacity`
+
+    The rate adapts (AIMD): a rate-limit response halves it and pauses the
+    bucket, each successful request adds back a twentieth of the configured
+    rate until it is reached again.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available and consume them"""
+        async with self._lock:
+            while True:
+                blocked_for = self._blocked_until - time.monotonic()
+                if blocked_for > 0:
+                    await asyncio.sleep(blocked_for)
+                    continue
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def throttle(self, retry_after: Optional[float] = None) -> float:
+        """
+        Record a rate-limit response from the source
+
+        Halves the rate, drains the bucket and pauses every caller for
+        `retry_after` seconds as sent by the server, or else for one token
+        interval at the new rate (capped at HTTP_RATE_LIMIT_MAX_BACKOFF_SECONDS).
+        Returns the pause.
+        """
+        self._refill()
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0.0
+
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = min(1.0 / self.rate, settings.HTTP_RATE_LIMIT_MAX_BACKOFF_SECONDS)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+        logger.warning(f"Rate limited: backing off {delay:.1f}s, rate now {self.rate:.2f}/s")
+        return delay
+
+    def record_success(self) -> None:
+        """Additive recovery toward the configured rate"""
+        if self.rate < self.max_rate:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parse "fred:2,shiller:1" into {"fred": 2.0, "shiller": 1.0}"""
+    limits = {}
+
+    for part in (spec or '').split(','):
+        if ':' not in part:
+            continue
+        name, rate = part.split(':', 1)
+        try:
+            rate_value = float(rate)
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit entry: '{part}'")
+            continue
+        if name.strip() and rate_value > 0:
+            limits[name.strip().lower()] = rate_value
+
+    return limits
+
+_source_rates = parse_rate_limits(settings.ETL_SOURCE_RATE_LIMITS)
+_buckets: Dict[str, TokenBucket] = {}
+
+def get_rate_limiter(source: Optional[str]) -> Optional[TokenBucket]:
+    """Return the process-wide bucket for a data source, or None if it is unthrottled"""
+    if not source:
+        return None
+
+    source_lower = source.lower()
+    for name, rate in _source_rates.items():
+        if name in source_lower:
+            if name not in _buckets:
+                _buckets[name] = TokenBucket(rate)
+            return _buckets[name]
+
+    return None
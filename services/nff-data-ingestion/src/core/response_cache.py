@@ -0,0 +1,235 @@
+"""
+Response Cache
+Content-addressed on-disk cache for raw data source payloads (TTL + LRU size eviction)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+from config import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class CachedResponse:
+    """A cached payload plus the metadata needed to decide whether it is still usable"""
+
+    def __init__(self, body: bytes, fetched_at: float, validator: Optional[str] = None):
+        self.body = body
+        self.fetched_at = fetched_at
+        self.validator = validator
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+class ResponseCache:
+    """
+    Raw response bodies on local disk
+
+    Entries are keyed by (source, series, date range) and point at blobs named
+    by the SHA-256 of their content, so identical payloads are stored once.
+    Entries older than `ttl_seconds` are returned as stale so callers can
+    revalidate them (e.g. against FRED's last_updated).
+
+    Entry file mtimes track last access. The directory is swept at most every
+    `sweep_interval` seconds, or as soon as a put takes the running blob size
+    over `max_bytes`: entries not read for `max_age_seconds` are purged, then
+    the least recently used ones until the blobs are below 90% of
+    `max_bytes` (so a full cache is not swept again on the next put), then
+    orphan blobs.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: float,
+        max_bytes: int,
+        max_age_seconds: float = 7 * 24 * 3600,
+        sweep_interval: float = 600.0
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max(max_age_seconds, ttl_seconds)
+        self.sweep_interval = sweep_interval
+        self._entries_dir = os.path.join(directory, "entries")
+        self._blobs_dir = os.path.join(directory, "blobs")
+        self._lock = threading.Lock()
+        # Blob bytes as of the last sweep plus blobs written since (None until the first sweep)
+        self._bytes: Optional[int] = None
+        self._next_sweep = 0.0
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._blobs_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(source: str, series_id: str, start: Any = None, end: Any = None) -> str:
+        return f"{source.lower()}|{series_id}|{start or ''}|{end or ''}"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._entries_dir, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._blobs_dir, digest)
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return entry.age < self.ttl_seconds
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the cached entry (fresh or stale), or None on a miss"""
+        entry_path = self._entry_path(key)
+
+        try:
+            with open(entry_path, "r") as f:
+                meta = json.load(f)
+            with open(self._blob_path(meta["blob"]), "rb") as f:
+                body = f.read()
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        return CachedResponse(body, meta["fetched_at"], meta.get("validator"))
+
+    def put(self, key: str, body: bytes, validator: Optional[str] = None) -> None:
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+
+        with self._lock:
+            if not os.path.exists(blob_path):
+                self._write_atomic(blob_path, body)
+                if self._bytes is not None:
+                    self._bytes += len(body)
+
+            meta = {"key": key, "blob": digest, "size": len(body), "fetched_at": time.time(), "validator": validator}
+            self._write_atomic(self._entry_path(key), json.dumps(meta).encode())
+
+            if self._bytes is None or self._bytes > self.max_bytes or time.monotonic() >= self._next_sweep:
+                self._sweep()
+
+    def touch(self, key: str, validator: Optional[str] = None) -> None:
+        """Mark an entry as just revalidated so it is fresh for another TTL"""
+        entry_path = self._entry_path(key)
+
+        with self._lock:
+            try:
+                with open(entry_path, "r") as f:
+                    meta = json.load(f)
+            except (FileNotFoundError, ValueError):
+                return
+
+            meta["fetched_at"] = time.time()
+            if validator is not None:
+                meta["validator"] = validator
+            self._write_atomic(entry_path, json.dumps(meta).encode())
+
+    def _sweep(self) -> None:
+        """Purge expired entries, then least recently used ones down to the low-water mark, then orphan blobs"""
+        purge_before = time.time() - self.max_age_seconds
+        purged = 0
+        entries = []
+        for name in os.listdir(self._entries_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self._entries_dir, name)
+            try:
+                accessed_at = os.path.getmtime(path)
+                if accessed_at < purge_before:
+                    os.remove(path)
+                    purged += 1
+                    continue
+                with open(path, "r") as f:
+                    meta = json.load(f)
+                entries.append((accessed_at, path, meta["blob"]))
+            except (OSError, KeyError, ValueError):
+                continue
+
+        blob_sizes = {}
+        for digest in os.listdir(self._blobs_dir):
+            if digest.endswith(".tmp"):
+                continue
+            try:
+                blob_sizes[digest] = os.path.getsize(self._blob_path(digest))
+            except OSError:
+                continue
+
+        referenced = {}
+        for _, _, digest in entries:
+            referenced[digest] = referenced.get(digest, 0) + 1
+
+        total = sum(size for digest, size in blob_sizes.items() if digest in referenced)
+
+        evicted = 0
+        target = self.max_bytes if total <= self.max_bytes else int(self.max_bytes * 0.9)
+        for _, path, digest in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            evicted += 1
+            referenced[digest] -= 1
+            if referenced[digest] == 0:
+                total -= blob_sizes.get(digest, 0)
+
+        for digest in blob_sizes:
+            if referenced.get(digest, 0) == 0:
+                try:
+                    os.remove(self._blob_path(digest))
+                except OSError:
+                    pass
+
+        self._bytes = total
+        self._next_sweep = time.monotonic() + self.sweep_interval
+
+        if purged or evicted:
+            logger.info(f"Response cache purged {purged} expired and evicted {evicted} entries ({total} bytes retained)")
+
+    def stats(self) -> Dict[str, Any]:
+        entries = len([n for n in os.listdir(self._entries_dir) if n.endswith(".json")])
+        size = 0
+        for digest in os.listdir(self._blobs_dir):
+            try:
+                size += os.path.getsize(self._blob_path(digest))
+            except OSError:
+                continue
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes, "ttl_seconds": self.ttl_seconds}
+
+_response_cache: Optional[ResponseCache] = None
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache, or None when FETCH_CACHE_ENABLED is off or the directory is unusable"""
+    global _response_cache
+
+    if not settings.FETCH_CACHE_ENABLED:
+        return None
+
+    if _response_cache is None:
+        directory = settings.FETCH_CACHE_DIR or os.path.join(tempfile.gettempdir(), "nff-fetch-cache")
+        try:
+            _response_cache = ResponseCache(
+                directory,
+                settings.FETCH_CACHE_TTL_SECONDS,
+                settings.FETCH_CACHE_MAX_BYTES,
+                max_age_seconds=settings.FETCH_CACHE_MAX_AGE_SECONDS,
+                sweep_interval=settings.FETCH_CACHE_SWEEP_INTERVAL_SECONDS
+            )
+        except OSError as e:
+            logger.warning(f"Response cache disabled, cannot use {directory}: {e}")
+            return None
+
+    return _response_cache
@@ -0,0 +1,92 @@
+"""
+Schema Bootstrap
+One-time startup check that the ETL bookkeeping tables and their indexes exist
+"""
+
+from core.db_pool import async_db
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Serializes bootstrap across service instances starting at the same time
+_BOOTSTRAP_LOCK_KEY = 0x4E4646_0001
+
+# The tables are owned by the Prisma schema (nff-api-gateway); these
+# statements only fill in what a fresh or partially migrated database lacks.
+_ETL_SCHEMA = [
+    # Same labels as enum ETLStatus in the Prisma schema; the status buffer
+    # casts IndicatorETLLog.status and IndicatorMetadata.etlStatus to it
+    """
+    DO $$
+    BEGIN
+        CREATE TYPE "ETLStatus" AS ENUM ('UNKNOWN', 'PENDING', 'PROCESSING', 'OK', 'ERROR', 'BLOCKED', 'STALE');
+    EXCEPTION
+        WHEN duplicate_object THEN NULL;
+    END
+    $$
+    """,
+    # Same labels as enum ETLJobStatus in the Prisma schema
+    """
+    DO $$
+    BEGIN
+        CREATE TYPE "ETLJobStatus" AS ENUM ('PROCESSING', 'COMPLETED', 'FAILED');
+    EXCEPTION
+        WHEN duplicate_object THEN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "ETLJob" (
+        "jobId" VARCHAR(50) PRIMARY KEY,
+        status "ETLJobStatus" NOT NULL,
+        "totalIndicators" INTEGER NOT NULL,
+        successful INTEGER DEFAULT 0,
+        failed INTEGER DEFAULT 0,
+        blocked INTEGER DEFAULT 0,
+        "startedAt" TIMESTAMP NOT NULL,
+        "completedAt" TIMESTAMP,
+        metadata JSONB,
+        "createdAt" TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "IndicatorETLLog" (
+        id SERIAL PRIMARY KEY,
+        "indicatorId" INTEGER NOT NULL,
+        "jobId" VARCHAR(50) NOT NULL,
+        status "ETLStatus" NOT NULL,
+        "errorCode" VARCHAR(50),
+        "errorMessage" TEXT,
+        "errorCategory" VARCHAR(50),
+        "recordsProcessed" INTEGER DEFAULT 0,
+        "recordsInserted" INTEGER DEFAULT 0,
+        "recordsUpdated" INTEGER DEFAULT 0,
+        "startedAt" TIMESTAMP,
+        "completedAt" TIMESTAMP,
+        "createdAt" TIMESTAMP DEFAULT NOW(),
+        metadata JSONB
+    )
+    """,
+    # Per-indicator log history, newest first
+    'CREATE INDEX IF NOT EXISTS "IndicatorETLLog_indicatorId_createdAt_idx" ON "IndicatorETLLog" ("indicatorId", "createdAt")',
+    # Job listings filtered by status, newest first
+    'CREATE INDEX IF NOT EXISTS "ETLJob_status_createdAt_idx" ON "ETLJob" (status, "createdAt")',
+]
+
+_bootstrapped = False
+
+async def ensure_etl_schema() -> None:
+    """Create missing ETL tables/indexes once per process (called at startup)"""
+    global _bootstrapped
+
+    if _bootstrapped:
+        return
+
+    def _bootstrap(cur):
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_BOOTSTRAP_LOCK_KEY,))
+        for statement in _ETL_SCHEMA:
+            cur.execute(statement)
+
+    await async_db.run(_bootstrap)
+    _bootstrapped = True
+    logger.info("ETL schema bootstrap complete")
@@ -0,0 +1,99 @@
+"""
+Columnar Series
+Compact time series passed between fetchers, calculations and the DB loader
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+@dataclass
+class Series:
+    """
+    One time series as parallel NumPy arrays
+
+    dates are datetime64[D], values are float64 (NaN marks a missing value).
+    The arrays are shared, not copied, wherever the dtypes already match.
+    """
+    dates: np.ndarray
+    values: np.ndarray
+    series_id: Optional[str] = None
+
+    def __post_init__(self):
+        self.dates = np.asarray(self.dates, dtype='datetime64[D]')
+        self.values = np.asarray(self.values, dtype=np.float64)
+
+        if self.dates.shape != self.values.shape:
+            raise ValueError(f"Series {self.series_id}: {len(self.dates)} dates but {len(self.values)} values")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def empty(cls, series_id: Optional[str] = None) -> 'Series':
+        return cls(np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=np.float64), series_id)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, series_id: Optional[str] = None) -> 'Series':
+        """Adapter from a DataFrame with 'date' and 'value' columns"""
+        if df is None or len(df) == 0:
+            return cls.empty(series_id)
+
+        dates = df['date']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, errors='coerce')
+
+        dates = dates.to_numpy(dtype='datetime64[D]')
+        values = pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+        valid = ~np.isnat(dates)
+        if not valid.all():
+            dates, values = dates[valid], values[valid]
+
+        return cls(dates, values, series_id)
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], series_id: Optional[str] = None) -> 'Series':
+        """Adapter from the legacy list of {'date', 'value'} dicts"""
+        if not records:
+            return cls.empty(series_id)
+        return cls.from_frame(pd.DataFrame.from_records(records, columns=['date', 'value']), series_id)
+
+    @classmethod
+    def concat(cls, series: List['Series'], series_id: Optional[str] = None) -> 'Series':
+        if not series:
+            return cls.empty(series_id)
+        return cls(
+            np.concatenate([s.dates for s in series]),
+            np.concatenate([s.values for s in series]),
+            series_id
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame with 'date' (datetime64) and 'value' columns, for the calculation engine"""
+        return pd.DataFrame({'date': self.dates, 'value': self.values}, copy=False)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Legacy list of {'date': datetime.date, 'value': float, 'series_id'} dicts"""
+        return [
+            {'date': d, 'value': v, 'series_id': self.series_id}
+            for d, v in zip(self.dates.tolist(), self.values.tolist())
+        ]
+
+    def deduplicated(self) -> 'Series':
+        """Sorted by date with one observation per date; the last occurrence wins"""
+        if len(self) == 0:
+            return self
+
+        reversed_dates = self.dates[::-1]
+        unique_dates, first_in_reversed = np.unique(reversed_dates, return_index=True)
+        return Series(unique_dates, self.values[::-1][first_in_reversed], self.series_id)
+
+    def lookup(self, dates: np.ndarray) -> np.ndarray:
+        """Values at `dates` (NaN where absent); the series must be deduplicated"""
+        if len(self) == 0:
+            return np.full(len(dates), np.nan)
+
+        positions = np.clip(np.searchsorted(self.dates, dates), 0, len(self) - 1)
+        return np.where(self.dates[positions] == dates, self.values[positions], np.nan)
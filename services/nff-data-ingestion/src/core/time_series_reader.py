@@ -0,0 +1,135 @@
+"""
+Time Series Reader
+Keyset-paginated and multi-indicator reads of "IndicatorTimeSeries" as row objects or parallel arrays
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Columns returned by the read API, in row order
+READ_COLUMNS = [
+    "date", "value", "zScore", "normalized",
+    "pctChange1m", "pctChange3m", "pctChange12m",
+    "ma30d", "ma90d", "ma365d",
+    "volatility30d", "volatility90d",
+    "trend", "isOutlier"
+]
+
+def _select_expression(column: str) -> str:
+    # Formatting and Decimal -> float conversion happen in Postgres, so rows
+    # arrive JSON-ready without per-value Python work
+    if column == "date":
+        return "to_char(date, 'YYYY-MM-DD') AS date"
+    if column in ("trend", "isOutlier"):
+        return f'"{column}"'
+    return f'"{column}"::float8 AS "{column}"'
+
+_SELECT_LIST = ", ".join(_select_expression(column) for column in READ_COLUMNS)
+
+def time_series_query(
+    indicator_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    after: Optional[date] = None,
+    order: str = "desc",
+    limit: Optional[int] = None
+) -> Tuple[str, List[Any]]:
+    """
+    SELECT for one indicator's observations, ordered by date
+
+    `after` is the keyset cursor: the date of the last row already returned.
+    The next page starts strictly past it in the requested order, which is
+    exact because dates are unique per indicator.
+    """
+    if order not in ("asc", "desc"):
+        raise ValueError(f"Invalid order: '{order}'")
+
+    query = f'SELECT {_SELECT_LIST} FROM "IndicatorTimeSeries" WHERE "indicatorMetadataId" = %s'
+    params: List[Any] = [indicator_id]
+
+    if start_date:
+        query += " AND date >= %s"
+        params.append(start_date)
+
+    if end_date:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    if after:
+        query += " AND date > %s" if order == "asc" else " AND date < %s"
+        params.append(after)
+
+    query += f" ORDER BY date {order.upper()}"
+
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    return query, params
+
+def rows_to_records(rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+    return [dict(zip(READ_COLUMNS, row)) for row in rows]
+
+def rows_to_columns(rows: Sequence[tuple]) -> Dict[str, List[Any]]:
+    """Parallel arrays keyed by column name"""
+    if not rows:
+        return {column: [] for column in READ_COLUMNS}
+    return {column: list(values) for column, values in zip(READ_COLUMNS, zip(*rows))}
+
+def batch_time_series_query(
+    indicator_ids: List[int],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    fields: Sequence[str] = ("value",)
+) -> Tuple[str, List[Any]]:
+    """
+    One SELECT for several indicators: rows are
+    (indicatorMetadataId, date, *fields), ordered by indicator then date
+    """
+    invalid = [field for field in fields if field not in READ_COLUMNS or field == "date"]
+    if invalid:
+        raise ValueError(f"Invalid fields: {invalid}")
+
+    select_list = ", ".join(['"indicatorMetadataId"', _select_expression("date")] + [_select_expression(f) for f in fields])
+    query = f'SELECT {select_list} FROM "IndicatorTimeSeries" WHERE "indicatorMetadataId" = ANY(%s)'
+    params: List[Any] = [list(indicator_ids)]
+
+    if start_date:
+        query += " AND date >= %s"
+        params.append(start_date)
+
+    if end_date:
+        query += " AND date <= %s"
+        params.append(end_date)
+
+    query += ' ORDER BY "indicatorMetadataId", date'
+    return query, params
+
+def group_columns(rows: Iterable[tuple], fields: Sequence[str]) -> Dict[str, List[Any]]:
+    """Parallel arrays ("date" plus fields) from batch rows of a single indicator"""
+    columns = ["date"] + list(fields)
+    rows = list(rows)
+    if not rows:
+        return {column: [] for column in columns}
+    return {column: list(values) for column, values in zip(columns, list(zip(*rows))[1:])}
+
+def align_series(rows: Sequence[tuple], indicator_ids: List[int], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Put batch rows on the union of their dates
+
+    Returns {"dates": [...], "series": {indicator_id: {field: [...]}}} with
+    None wherever an indicator has no observation on a date.
+    """
+    dates = sorted({row[1] for row in rows})
+    position = {d: i for i, d in enumerate(dates)}
+    series = {indicator_id: {field: [None] * len(dates) for field in fields} for indicator_id in indicator_ids}
+
+    for row in rows:
+        target = series.get(row[0])
+        if target is None:
+            continue
+        i = position[row[1]]
+        for field, value in zip(fields, row[2:]):
+            target[field][i] = value
+
+    return {"dates": dates, "series": series}
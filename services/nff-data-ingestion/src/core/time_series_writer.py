@@ -0,0 +1,157 @@
+"""
+Time Series Writer
+Upserts rows into "IndicatorTimeSeries" with execute_values or a COPY-staged merge
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from psycopg2.extras import execute_values
+from core.series import Series
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Column order of the value tuples built by series_rows
+TIME_SERIES_COLUMNS = [
+    "indicatorMetadataId", "date", "value",
+    "originalValue", "calculatedValue", "hasCalculation",
+    "zScore", "normalized",
+    "pctChange1m", "pctChange3m", "pctChange12m",
+    "ma30d", "ma90d", "ma365d",
+    "volatility30d", "volatility90d",
+    "trend", "isOutlier",
+    "createdAt", "updatedAt"
+]
+
+_COLUMN_LIST = ", ".join(f'"{column}"' for column in TIME_SERIES_COLUMNS)
+
+# Maintained by core.feature_refresh, so re-ingesting a row must not reset them
+FEATURE_COLUMNS = [
+    "zScore", "normalized",
+    "pctChange1m", "pctChange3m", "pctChange12m",
+    "ma30d", "ma90d", "ma365d",
+    "volatility30d", "volatility90d",
+    "trend", "isOutlier"
+]
+
+_UPDATE_COLUMNS = [
+    column for column in TIME_SERIES_COLUMNS
+    if column not in ("indicatorMetadataId", "date", "createdAt") and column not in FEATURE_COLUMNS
+]
+
+# Columns compared to decide whether an existing observation actually changed
+_COMPARE_COLUMNS = [column for column in _UPDATE_COLUMNS if column != "updatedAt"]
+
+# Unchanged rows are left alone (no new tuple, no WAL, no updatedAt bump).
+# RETURNING only reports written rows; xmax = 0 marks a fresh insert.
+# The written dates tell feature refresh where recomputation must start.
+_ON_CONFLICT = """
+    ON CONFLICT ("indicatorMetadataId", date)
+    DO UPDATE SET
+        {updates}
+    WHERE ({current}) IS DISTINCT FROM ({incoming})
+    RETURNING (xmax = 0) AS inserted, date
+""".format(
+    updates=",\n        ".join(f'"{column}" = EXCLUDED."{column}"' for column in _UPDATE_COLUMNS),
+    current=", ".join(f'"IndicatorTimeSeries"."{column}"' for column in _COMPARE_COLUMNS),
+    incoming=", ".join(f'EXCLUDED."{column}"' for column in _COMPARE_COLUMNS)
+)
+
+_STAGING_TABLE = "_indicator_time_series_stage"
+
+def _nullable(values: np.ndarray) -> List[Optional[float]]:
+    """Python floats with NaN/inf mapped to None (NULL)"""
+    out = values.astype(object)
+    out[~np.isfinite(values)] = None
+    return out.tolist()
+
+def series_rows(
+    indicator_id: int,
+    data: Series,
+    original_values: Optional[np.ndarray] = None,
+    has_calculation: bool = False
+) -> List[tuple]:
+    """
+    Rows in TIME_SERIES_COLUMNS order for a deduplicated Series
+
+    With a calculation, value/calculatedValue hold the calculated series and
+    originalValue the raw value aligned on date. Derived feature columns are
+    left empty (filled in by core.feature_refresh).
+    """
+    n = len(data)
+    dates = data.dates.tolist()
+    values = _nullable(data.values)
+    now = datetime.now()
+    
+    if has_calculation:
+        originals = _nullable(original_values) if original_values is not None else [None] * n
+        calculated = values
+    else:
+        originals = calculated = [None] * n
+    
+    empty = (None,) * 10
+    return [
+        (indicator_id, d, v, o, c, has_calculation) + empty + (None, False, now, now)
+        for d, v, o, c in zip(dates, values, originals, calculated)
+    ]
+
+def _count_writes(written: List[Any], total: int) -> Dict[str, Any]:
+    """
+    Split RETURNING rows (tuples or dict rows) into inserted/updated/unchanged
+    counts, plus the earliest written date ("first_changed", None if nothing was)
+    """
+    rows = [(row['inserted'], row['date']) if isinstance(row, dict) else (row[0], row[1]) for row in written]
+    inserted = sum(1 for is_insert, _ in rows if is_insert)
+    return {
+        "inserted": inserted,
+        "updated": len(rows) - inserted,
+        "unchanged": total - len(rows),
+        "first_changed": min((d for _, d in rows), default=None)
+    }
+
+def upsert_time_series_values(cur, values: List[Sequence[Any]]) -> Dict[str, Any]:
+    """Multi-row INSERT ... ON CONFLICT via execute_values (best for small batches)"""
+    written = execute_values(
+        cur,
+        f'INSERT INTO "IndicatorTimeSeries" ({_COLUMN_LIST}) VALUES %s {_ON_CONFLICT}',
+        values,
+        page_size=1000,
+        fetch=True
+    )
+    return _count_writes(written, len(values))
+
+def copy_time_series_values(cur, values: List[Sequence[Any]]) -> Dict[str, Any]:
+    """
+    Stream rows into a transaction-scoped staging table with COPY, then merge
+    them into "IndicatorTimeSeries" with a single INSERT ... SELECT upsert
+
+    Rows must already be unique on (indicatorMetadataId, date).
+    """
+    cur.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} ON COMMIT DROP AS
+        SELECT {_COLUMN_LIST} FROM "IndicatorTimeSeries" WITH NO DATA
+    """)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in values:
+        writer.writerow(['' if v is None else v for v in row])
+    buffer.seek(0)
+
+    cur.copy_expert(
+        f"COPY {_STAGING_TABLE} ({_COLUMN_LIST}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+    cur.execute(f"""
+        INSERT INTO "IndicatorTimeSeries" ({_COLUMN_LIST})
+        SELECT {_COLUMN_LIST} FROM {_STAGING_TABLE}
+        {_ON_CONFLICT}
+    """)
+    written = cur.fetchall()
+    cur.execute(f"TRUNCATE {_STAGING_TABLE}")
+
+    return _count_writes(written, len(values))
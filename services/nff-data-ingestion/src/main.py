@@ -44,6 +44,28 @@ app.include_router(tweet_enrichment_router, prefix="/api/v1", tags=["Tweet Enric
 if settings.SENTRY_DSN:
     init_sentry(settings.SENTRY_DSN)
 
+@app.on_event("startup")
+async def startup():
+    from core.async_db_pool import init_async_pool
+    from core.schema_bootstrap import ensure_etl_schema
+    from core.query_cache import query_cache
+    await init_async_pool()
+    await ensure_etl_schema()
+    query_cache.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    from core.data_fetcher import DataFetcherFactory
+    from core.async_db_pool import close_async_pool
+    from core.etl_status_buffer import etl_status_buffer
+    from core.query_cache import query_cache
+    from utils.cache import close_cache
+    await DataFetcherFactory.close_all()
+    await etl_status_buffer.close()
+    await close_async_pool()
+    await query_cache.stop()
+    await close_cache()
+
 @app.get("/")
 def root():
     return {
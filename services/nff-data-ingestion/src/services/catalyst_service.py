@@ -7,9 +7,9 @@ import asyncio
 import json
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
-import asyncpg
 from utils.logger import get_logger
 from config import settings
+from core.async_db_pool import get_async_pool
 
 logger = get_logger(__name__)
 
@@ -17,22 +17,9 @@ class CatalystService:
     
     def __init__(self):
         self.db_url = settings.DATABASE_URL
-        self._pool = None
 
     async def _get_connection_pool(self):
-        if self._pool is None:
-            self._pool = await asyncpg.create_pool(
-                self.db_url,
-                min_size=2,
-                max_size=10,
-                command_timeout=60
-            )
-        return self._pool
-
-    async def _close_connection_pool(self):
-        if self._pool:
-            await self._pool.close()
-            self._pool = None
+        return await get_async_pool()
 
     async def group_tweets_to_catalysts(self, time_window_hours: int = 6) -> Dict[str, Any]:
         start_time = datetime.utcnow()
@@ -95,8 +82,6 @@ class CatalystService:
         except Exception as e:
             logger.error(f"Catalyst grouping failed: {str(e)}")
             raise
-        finally:
-            await self._close_connection_pool()
 
     async def _fetch_enriched_tweets(self, pool, time_window_hours: int) -> List[Dict[str, Any]]:
         cutoff_time = datetime.utcnow() - timedelta(hours=time_window_hours)
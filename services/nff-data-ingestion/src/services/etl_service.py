@@ -3,9 +3,10 @@ ETL Service
 Handles data fetching, processing, and loading operations
 """
 
-import psycopg2
-from psycopg2.extras import RealDictCursor, execute_values
-from typing import List, Optional, Dict, Any
+import json
+import psycopg2.extensions
+import psycopg2.extras
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
 from config import settings
 import logging
@@ -13,6 +14,14 @@ import uuid
 import asyncio
 from core.data_fetcher import DataFetcherFactory
 from core.ai_features import AIFeaturesCalculator
+from core.job_runner import ETLJobRunner
+from core.db_pool import async_db
+from core.etl_status_buffer import etl_status_buffer
+from core.feature_refresh import refresh_features
+from core.query_cache import query_cache
+from core.time_series_reader import align_series, batch_time_series_query, group_columns, rows_to_columns, rows_to_records, time_series_query
+from core.time_series_writer import copy_time_series_values, series_rows, upsert_time_series_values
+from core.series import Series
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +30,14 @@ class ETLService:
     
     def __init__(self):
         self.db_url = settings.DATABASE_URL
+        self.db = async_db
+        self.status_buffer = etl_status_buffer
         self.data_fetcher_factory = DataFetcherFactory()
         self.ai_calculator = AIFeaturesCalculator()
+        self.job_runner = ETLJobRunner(
+            max_concurrency=settings.ETL_MAX_CONCURRENCY,
+            progress_interval=settings.ETL_PROGRESS_INTERVAL_SECONDS
+        )
     
     async def create_job(
         self,
@@ -46,44 +61,20 @@ class ETLService:
         
         # Create job record
         try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS "ETLJob" (
-                        "jobId" VARCHAR(50) PRIMARY KEY,
-                        status VARCHAR(20) NOT NULL,
-                        "totalIndicators" INTEGER NOT NULL,
-                        successful INTEGER DEFAULT 0,
-                        failed INTEGER DEFAULT 0,
-                        blocked INTEGER DEFAULT 0,
-                        "startedAt" TIMESTAMP NOT NULL,
-                        "completedAt" TIMESTAMP,
-                        metadata JSONB,
-                        "createdAt" TIMESTAMP DEFAULT NOW()
-                    )
-                """)
-                
-                cur.execute("""
-                    INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, 'PROCESSING', len(indicators), started_at, psycopg2.extras.Json({
-                    'category': category,
-                    'source': source,
-                    'force_refresh': force_refresh,
-                    'indicator_ids': indicator_ids
-                })))
-                
-                conn.commit()
-                
+            await self.db.execute("""
+                INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (job_id, 'PROCESSING', len(indicators), started_at, psycopg2.extras.Json({
+                'category': category,
+                'source': source,
+                'force_refresh': force_refresh,
+                'indicator_ids': indicator_ids,
+                # Selection (including the upstream pre-flight) is done once, here
+                'selected_ids': [ind['id'] for ind in indicators]
+            })))
         except Exception as e:
             logger.error(f"Error creating ETL job: {e}")
-            if 'conn' in locals():
-                conn.rollback()
             raise
-        finally:
-            if 'conn' in locals():
-                conn.close()
         
         return {
             "job_id": job_id,
@@ -104,45 +95,27 @@ class ETLService:
                 return
             
             metadata = job['metadata']
+            selected_ids = metadata.get('selected_ids')
             
-            indicators = await self._get_indicators_for_job(
-                indicator_ids=metadata.get('indicator_ids'),
-                category=metadata.get('category'),
-                source=metadata.get('source'),
-                force_refresh=metadata.get('force_refresh', False)
-            )
-            
-            successful = 0
-            failed = 0
-            blocked = 0
+            if selected_ids is not None:
+                snapshot = await self._get_indicator_snapshot(selected_ids)
+                indicators = [snapshot[indicator_id] for indicator_id in selected_ids if indicator_id in snapshot]
+            else:
+                indicators = await self._get_indicators_for_job(
+                    indicator_ids=metadata.get('indicator_ids'),
+                    category=metadata.get('category'),
+                    source=metadata.get('source'),
+                    force_refresh=metadata.get('force_refresh', False)
+                )
             
-            for indicator in indicators:
-                try:
-                    result = await self.fetch_indicator_data(
-                        indicator_id=indicator['id'],
-                        force_refresh=metadata.get('force_refresh', False)
-                    )
-                    
-                    if result['status'] == 'OK':
-                        successful += 1
-                    elif result['status'] == 'BLOCKED':
-                        blocked += 1
-                    else:
-                        failed += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing indicator {indicator['id']}: {e}")
-                    failed += 1
-                
-                await asyncio.sleep(0.2)
+            async def _fetch(indicator: Dict[str, Any]) -> Dict[str, Any]:
+                return await self.fetch_indicator_data(
+                    indicator_id=indicator['id'],
+                    force_refresh=metadata.get('force_refresh', False),
+                    indicator=indicator
+                )
             
-            await self._update_job_status(
-                job_id=job_id,
-                status='COMPLETED',
-                successful=successful,
-                failed=failed,
-                blocked=blocked
-            )
+            await self._run_job_indicators(job_id, indicators, _fetch)
             
         except Exception as e:
             logger.error(f"Error processing job {job_id}: {e}")
@@ -153,19 +126,37 @@ class ETLService:
         indicator_id: int,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        indicator: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Fetch data for a single indicator
-        """
-        etl_log_id = await self._create_etl_log(indicator_id)
         
+        Without an explicit start_date this runs incrementally: only observations
+        from the last stored date (minus the revision look-back) are requested.
+        force_refresh and calculated indicators re-fetch the full history.
+        Jobs pass their preloaded IndicatorMetadata row as `indicator`; otherwise
+        it is read here.
+        """
         try:
-            indicator = await self._get_indicator_metadata(indicator_id)
+            if indicator is None:
+                indicator = await self._get_indicator_metadata(indicator_id)
             
             if not indicator:
                 raise ValueError(f"Indicator {indicator_id} not found")
-            
+        except Exception as e:
+            # The log row references the indicator, so nothing is queued for an id that is not there
+            logger.error(f"Error fetching indicator {indicator_id}: {e}")
+            return {
+                "status": "ERROR",
+                "indicator_id": indicator_id,
+                "error_code": self._classify_error(e),
+                "error_message": str(e)
+            }
+        
+        etl_log_id = await self._create_etl_log(indicator_id)
+        
+        try:
             validation_error = self._validate_indicator_api_config(indicator)
             if validation_error:
                 raise ValueError(validation_error)
@@ -182,27 +173,39 @@ class ETLService:
                 raise ValueError(f"No data fetcher available for source: {indicator['source']}")
             
             # Determine date range
+            incremental = False
+            if not start_date:
+                start_date = await self._get_incremental_start_date(indicator, force_refresh)
+                incremental = start_date is not None
             if not start_date:
                 start_date = date(2000, 1, 1)
             if not end_date:
                 end_date = date.today()
             
+            # Read before the fetch so an update landing mid-run is picked up next time
+            upstream_updated_at = await self._get_upstream_updated_at(fetcher, indicator['seriesIDs'])
+            
             # Fetch data with timeout protection
-            import asyncio
             try:
-                raw_data = await asyncio.wait_for(
+                raw_series = await asyncio.wait_for(
                     fetcher.fetch(
                         series_id=indicator['seriesIDs'],
                         start_date=start_date,
-                        end_date=end_date
+                        end_date=end_date,
+                        force_refresh=force_refresh
                     ),
                     timeout=300  # 5 minutes timeout
                 )
             except asyncio.TimeoutError:
                 raise ValueError(f"Data fetch timeout for indicator {indicator_id} after 5 minutes")
             
-            if not raw_data or len(raw_data) == 0:
-                raise ValueError("No data returned from API")
+            if not raw_series or sum(len(series) for series in raw_series) == 0:
+                if not incremental:
+                    raise ValueError("No data returned from API")
+                # Nothing new since the last stored observation
+                raw_series = []
+            
+            raw_data = Series.concat(raw_series)
             
             # Apply calculation if needed and keep both original + calculated
             has_calculation = bool(indicator.get('calculation'))
@@ -213,7 +216,7 @@ class ETLService:
                 try:
                     # Apply calculation using calculation engine
                     calculated_data = await self._apply_calculation(
-                        raw_data, 
+                        raw_series, 
                         indicator['calculation'], 
                         indicator['seriesIDs']
                     )
@@ -231,7 +234,7 @@ class ETLService:
                 logger.info(f"Using raw data for indicator {indicator_id} (no calculation specified)")
             
             enriched_data = processed_data
-            records_inserted = await self._save_time_series_data(
+            write_counts = await self._save_time_series_data(
                 indicator_id=indicator_id,
                 data=enriched_data,
                 original_data=raw_data if has_calculation else None,
@@ -239,29 +242,41 @@ class ETLService:
                 force_refresh=force_refresh
             )
             
-            etl_notes = "Raw data only (calculation engine & AI features disabled)"
+            if settings.ETL_FEATURES_ENABLED:
+                etl_notes = "Raw data with incrementally refreshed derived features"
+            else:
+                etl_notes = "Raw data only (derived features disabled)"
             
             await self._complete_etl_log(
                 etl_log_id=etl_log_id,
                 status='OK',
                 records_processed=len(enriched_data),
-                records_inserted=records_inserted
+                records_inserted=write_counts['inserted'],
+                records_updated=write_counts['updated'],
+                metadata={
+                    'records_unchanged': write_counts['unchanged'],
+                    'features_refreshed': write_counts.get('features_refreshed', 0)
+                }
             )
             
             await self._update_indicator_etl_status(
                 indicator_id=indicator_id,
                 status='OK',
-                records_count=records_inserted,
+                records_count=await self._count_time_series(indicator_id),
                 last_successful_at=datetime.now(),
-                etl_notes=etl_notes
+                etl_notes=etl_notes,
+                upstream_updated_at=upstream_updated_at
             )
             
             return {
                 "status": "OK",
                 "indicator_id": indicator_id,
+                "mode": "incremental" if incremental else "full",
                 "records_fetched": len(raw_data),
                 "records_processed": len(enriched_data),
-                "records_inserted": records_inserted,
+                "records_inserted": write_counts['inserted'],
+                "records_updated": write_counts['updated'],
+                "records_unchanged": write_counts['unchanged'],
                 "date_range": {
                     "start": start_date.isoformat(),
                     "end": end_date.isoformat()
@@ -306,64 +321,29 @@ class ETLService:
         """
         Create job for fetching all indicators in a category
         """
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT im.id FROM "IndicatorMetadata" im
-                    INNER JOIN "ChartCategory" cc ON cc.id = im."categoryId"
-                    WHERE cc.name = %s 
-                    AND im."isActive" = true
-                    AND im.importance >= %s
-                """, (category_name, importance_min))
-                
-                indicators = cur.fetchall()
-                indicator_ids = [ind['id'] for ind in indicators]
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        indicators = await self.db.fetch_all("""
+            SELECT im.id FROM "IndicatorMetadata" im
+            INNER JOIN "ChartCategory" cc ON cc.id = im."categoryId"
+            WHERE cc.name = %s 
+            AND im."isActive" = true
+            AND im.importance >= %s
+        """, (category_name, importance_min))
+        indicator_ids = [ind['id'] for ind in indicators]
         
         job_id = f"CATEGORY_{uuid.uuid4().hex[:12]}"
         started_at = datetime.now()
         
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS "ETLJob" (
-                        "jobId" VARCHAR(50) PRIMARY KEY,
-                        status VARCHAR(20) NOT NULL,
-                        "totalIndicators" INTEGER NOT NULL,
-                        successful INTEGER DEFAULT 0,
-                        failed INTEGER DEFAULT 0,
-                        blocked INTEGER DEFAULT 0,
-                        "startedAt" TIMESTAMP NOT NULL,
-                        "completedAt" TIMESTAMP,
-                        metadata JSONB,
-                        "createdAt" TIMESTAMP DEFAULT NOW()
-                    )
-                """)
-                
-                cur.execute("""
-                    INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, 'PROCESSING', len(indicator_ids), started_at, psycopg2.extras.Json({
-                    'type': 'category_full',
-                    'category': category_name,
-                    'start_date': start_date.isoformat() if start_date else None,
-                    'end_date': end_date.isoformat() if end_date else None,
-                    'importance_min': importance_min,
-                    'indicator_ids': indicator_ids
-                })))
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        await self.db.execute("""
+            INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (job_id, 'PROCESSING', len(indicator_ids), started_at, psycopg2.extras.Json({
+            'type': 'category_full',
+            'category': category_name,
+            'start_date': start_date.isoformat() if start_date else None,
+            'end_date': end_date.isoformat() if end_date else None,
+            'importance_min': importance_min,
+            'indicator_ids': indicator_ids
+        })))
         
         return {
             "job_id": job_id,
@@ -392,39 +372,21 @@ class ETLService:
             if metadata.get('end_date'):
                 end_date = datetime.fromisoformat(metadata['end_date']).date()
             
-            successful = 0
-            failed = 0
-            blocked = 0
+            snapshot = await self._get_indicator_snapshot(indicator_ids)
+            indicators = [snapshot.get(indicator_id, {'id': indicator_id}) for indicator_id in indicator_ids]
             
-            for indicator_id in indicator_ids:
-                try:
-                    result = await self.fetch_indicator_data(
-                        indicator_id=indicator_id,
-                        start_date=start_date,
-                        end_date=end_date,
-                        force_refresh=False
-                    )
-                    
-                    if result['status'] == 'OK':
-                        successful += 1
-                    elif result['status'] == 'BLOCKED':
-                        blocked += 1
-                    else:
-                        failed += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing indicator {indicator_id}: {e}")
-                    failed += 1
-                
-                await asyncio.sleep(0.2)
+            # A full job re-fetches every indicator's whole history (or the
+            # requested range): no upstream pre-flight, no incremental start
+            async def _fetch(indicator: Dict[str, Any]) -> Dict[str, Any]:
+                return await self.fetch_indicator_data(
+                    indicator_id=indicator['id'],
+                    start_date=start_date,
+                    end_date=end_date,
+                    force_refresh=True,
+                    indicator=snapshot.get(indicator['id'])
+                )
             
-            await self._update_job_status(
-                job_id=job_id,
-                status='COMPLETED',
-                successful=successful,
-                failed=failed,
-                blocked=blocked
-            )
+            await self._run_job_indicators(job_id, indicators, _fetch)
             
         except Exception as e:
             logger.error(f"Error processing category job {job_id}: {e}")
@@ -441,42 +403,22 @@ class ETLService:
         job_id = f"INCR_{uuid.uuid4().hex[:12]}"
         started_at = datetime.now()
         
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT im.id, im."lastSuccessfulAt"
-                    FROM "IndicatorMetadata" im
-                    INNER JOIN "ChartCategory" cc ON cc.id = im."categoryId"
-                    WHERE cc.name = %s AND im."isActive" = true
-                """, (category_name,))
-                
-                indicators = cur.fetchall()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        indicators = await self.db.fetch_all("""
+            SELECT im.id, im."lastSuccessfulAt"
+            FROM "IndicatorMetadata" im
+            INNER JOIN "ChartCategory" cc ON cc.id = im."categoryId"
+            WHERE cc.name = %s AND im."isActive" = true
+        """, (category_name,))
         
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (job_id, 'PROCESSING', len(indicators), started_at, psycopg2.extras.Json({
-                    'type': 'incremental',
-                    'category': category_name,
-                    'days_back': days_back,
-                    'indicators': [{'id': ind['id'], 'last_success': ind['lastSuccessfulAt'].isoformat() if ind['lastSuccessfulAt'] else None} for ind in indicators]
-                })))
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        await self.db.execute("""
+            INSERT INTO "ETLJob" ("jobId", status, "totalIndicators", "startedAt", metadata)
+            VALUES (%s, %s, %s, %s, %s)
+        """, (job_id, 'PROCESSING', len(indicators), started_at, psycopg2.extras.Json({
+            'type': 'incremental',
+            'category': category_name,
+            'days_back': days_back,
+            'indicators': [{'id': ind['id'], 'last_success': ind['lastSuccessfulAt'].isoformat() if ind['lastSuccessfulAt'] else None} for ind in indicators]
+        })))
         
         return {
             "job_id": job_id,
@@ -499,49 +441,32 @@ class ETLService:
             indicators = metadata.get('indicators', [])
             days_back = metadata.get('days_back', 30)
             
-            successful = 0
-            failed = 0
-            blocked = 0
+            snapshot = await self._get_indicator_snapshot([ind_info['id'] for ind_info in indicators])
+            unchanged_ids = await self._get_upstream_unchanged_ids(list(snapshot.values()))
             
-            for ind_info in indicators:
-                try:
-                    if ind_info['last_success']:
-                        start_date = datetime.fromisoformat(ind_info['last_success']).date() + timedelta(days=1)
-                    else:
-                        start_date = date.today() - timedelta(days=days_back)
-                    
-                    end_date = date.today()
-                    
-                    if start_date >= end_date:
-                        continue
-                    
-                    result = await self.fetch_indicator_data(
-                        indicator_id=ind_info['id'],
-                        start_date=start_date,
-                        end_date=end_date,
-                        force_refresh=False
-                    )
-                    
-                    if result['status'] == 'OK':
-                        successful += 1
-                    elif result['status'] == 'BLOCKED':
-                        blocked += 1
-                    else:
-                        failed += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing indicator {ind_info['id']}: {e}")
-                    failed += 1
+            async def _fetch(ind_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                end_date = date.today()
+                
+                if ind_info['id'] in unchanged_ids:
+                    return None
                 
-                await asyncio.sleep(0.2)
+                if ind_info['last_success']:
+                    if datetime.fromisoformat(ind_info['last_success']).date() + timedelta(days=1) >= end_date:
+                        return None
+                    # Start date is derived from the last stored observation
+                    start_date = None
+                else:
+                    start_date = end_date - timedelta(days=days_back)
+                
+                return await self.fetch_indicator_data(
+                    indicator_id=ind_info['id'],
+                    start_date=start_date,
+                    end_date=end_date,
+                    force_refresh=False,
+                    indicator=snapshot.get(ind_info['id'])
+                )
             
-            await self._update_job_status(
-                job_id=job_id,
-                status='COMPLETED',
-                successful=successful,
-                failed=failed,
-                blocked=blocked
-            )
+            await self._run_job_indicators(job_id, indicators, _fetch)
             
         except Exception as e:
             logger.error(f"Error processing incremental job {job_id}: {e}")
@@ -552,53 +477,274 @@ class ETLService:
         indicator_id: int,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-        limit: int = 1000
-    ) -> List[Dict[str, Any]]:
+        limit: int = 1000,
+        cursor: Optional[date] = None,
+        order: str = 'desc',
+        columnar: bool = False
+    ) -> Dict[str, Any]:
         """
-        Get time-series data for indicator
+        Get one page of time-series data for indicator
+        
+        Pages are keyset-paginated on date: pass the returned next_cursor as
+        `cursor` to continue. columnar returns parallel arrays per column
+        instead of row objects. Pages are served through the query cache
+        until the indicator's series is written again.
         """
+        query, params = time_series_query(indicator_id, start_date, end_date, after=cursor, order=order, limit=limit)
+        
+        def _fetch(cur):
+            cur.execute(query, params)
+            return cur.fetchall()
+        
+        async def _load() -> Dict[str, Any]:
+            rows = await self.db.run(_fetch, cursor_factory=psycopg2.extensions.cursor)
+            
+            page = {
+                "count": len(rows),
+                "next_cursor": rows[-1][0] if rows and len(rows) == limit else None
+            }
+            if columnar:
+                page["columns"] = rows_to_columns(rows)
+            else:
+                page["data"] = rows_to_records(rows)
+            
+            return page
+        
+        return await query_cache.get_or_load(
+            "time_series",
+            [indicator_id, start_date, end_date, limit, cursor, order, columnar],
+            _load,
+            ttl=settings.QUERY_CACHE_TIME_SERIES_TTL_SECONDS,
+            tags=[f"timeseries:{indicator_id}"]
+        )
+    
+    async def stream_indicator_time_series(
+        self,
+        indicator_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        order: str = 'asc',
+        columnar: bool = False
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a whole series as NDJSON from a server-side cursor
+        
+        Each line is one row object, or with columnar one chunk of parallel
+        arrays (TIME_SERIES_STREAM_BATCH_SIZE rows per chunk).
+        """
+        query, params = time_series_query(indicator_id, start_date, end_date, order=order)
+        
+        async for batch in self.db.stream(query, params, batch_size=settings.TIME_SERIES_STREAM_BATCH_SIZE):
+            if columnar:
+                yield (json.dumps(rows_to_columns(batch)) + "\n").encode()
+            else:
+                yield "".join(json.dumps(record) + "\n" for record in rows_to_records(batch)).encode()
+    
+    async def stream_indicators_time_series(
+        self,
+        indicator_ids: List[int],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        fields: List[str] = ['value']
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream several indicators from one query as NDJSON
+        
+        One line per requested indicator, in id order:
+        {"indicator_id", "count", "columns": {"date": [...], <field>: [...]}}.
+        Only one indicator's rows are held at a time.
+        """
+        query, params = batch_time_series_query(indicator_ids, start_date, end_date, fields)
+        pending = sorted(set(indicator_ids))
+        
+        def _line(indicator_id: int, rows: List[tuple]) -> bytes:
+            return (json.dumps({
+                "indicator_id": indicator_id,
+                "count": len(rows),
+                "columns": group_columns(rows, fields)
+            }) + "\n").encode()
+        
+        current_id, current_rows = None, []
+        async for batch in self.db.stream(query, params, batch_size=settings.TIME_SERIES_STREAM_BATCH_SIZE):
+            for row in batch:
+                if row[0] != current_id:
+                    if current_id is not None:
+                        yield _line(current_id, current_rows)
+                    # Indicators without rows still get their (empty) line
+                    while pending and pending[0] < row[0]:
+                        yield _line(pending.pop(0), [])
+                    if pending and pending[0] == row[0]:
+                        pending.pop(0)
+                    current_id, current_rows = row[0], []
+                current_rows.append(row)
+        
+        if current_id is not None:
+            yield _line(current_id, current_rows)
+        for indicator_id in pending:
+            yield _line(indicator_id, [])
+    
+    async def get_aligned_time_series(
+        self,
+        indicator_ids: List[int],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        fields: List[str] = ['value']
+    ) -> Dict[str, Any]:
+        """Several indicators from one query, aligned on the union of their dates"""
+        query, params = batch_time_series_query(indicator_ids, start_date, end_date, fields)
+        
+        def _fetch(cur):
+            cur.execute(query, params)
+            return cur.fetchall()
+        
+        rows = await self.db.run(_fetch, cursor_factory=psycopg2.extensions.cursor)
+        return align_series(rows, indicator_ids, fields)
+    
+    async def _run_job_indicators(
+        self,
+        job_id: str,
+        indicators: List[Dict[str, Any]],
+        worker
+    ) -> None:
+        """Run a job's indicators through the concurrent runner and record the outcome"""
+        total = len(indicators)
+        
+        async def _report(counts: Dict[str, int]) -> None:
+            await self._update_job_progress(job_id, counts, total)
+        
+        counts = await self.job_runner.run(indicators, worker, on_progress=_report)
+        
+        # Bookkeeping must be durable before the job reads as COMPLETED
+        status = 'COMPLETED'
+        if not await self.status_buffer.flush():
+            logger.error(f"Job {job_id}: ETL log/status writes failed, marking the job FAILED")
+            status = 'FAILED'
+        
+        logger.info(
+            f"Job {job_id} finished: {counts['successful']} successful, {counts['failed']} failed, "
+            f"{counts['blocked']} blocked, {counts['skipped']} skipped"
+        )
+        
+        await self._update_job_status(
+            job_id=job_id,
+            status=status,
+            successful=counts['successful'],
+            failed=counts['failed'],
+            blocked=counts['blocked']
+        )
+    
+    async def _get_indicator_snapshot(self, indicator_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """IndicatorMetadata rows for all of a job's indicators in one query, keyed by id"""
+        if not indicator_ids:
+            return {}
+        
+        rows = await self.db.fetch_all(
+            'SELECT * FROM "IndicatorMetadata" WHERE id = ANY(%s)',
+            (list(indicator_ids),)
+        )
+        return {row['id']: row for row in rows}
+    
+    @staticmethod
+    def _split_series_ids(series_ids: Optional[str]) -> List[str]:
+        return [sid.strip() for sid in (series_ids or '').split('|') if sid.strip()]
+    
+    def _latest_upstream_update(
+        self,
+        series_ids: Optional[str],
+        last_updated: Dict[str, Optional[datetime]]
+    ) -> Optional[datetime]:
+        """Newest upstream update across an indicator's series, or None if any of them is unknown"""
+        timestamps = [last_updated.get(sid) for sid in self._split_series_ids(series_ids)]
+        if not timestamps or any(ts is None for ts in timestamps):
+            return None
+        return max(timestamps)
+    
+    async def _get_upstream_updated_at(self, fetcher, series_ids: Optional[str]) -> Optional[datetime]:
+        """Current upstream update time for one indicator (None when the source does not expose one)"""
         try:
-            conn = psycopg2.connect(self.db_url)
+            last_updated = await fetcher.get_last_updated(self._split_series_ids(series_ids))
+        except Exception as e:
+            logger.warning(f"Could not read upstream update time for {series_ids}: {e}")
+            return None
+        return self._latest_upstream_update(series_ids, last_updated)
+    
+    async def _check_upstream(self, indicators: List[Dict[str, Any]]) -> Dict[int, bool]:
+        """
+        Pre-flight for bulk jobs: id -> whether the indicator's upstream series
+        were updated since its last successful load
+        
+        Only indicators in OK status with a stored upstreamUpdatedAt are
+        checked; indicators the source cannot report on (no update times,
+        failed lookups) are left out of the result.
+        """
+        by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for indicator in indicators:
+            if indicator.get('etlStatus') == 'OK' and indicator.get('upstreamUpdatedAt') and indicator.get('source'):
+                by_source.setdefault(indicator['source'], []).append(indicator)
+        
+        changed: Dict[int, bool] = {}
+        for source, group in by_source.items():
+            fetcher = self.data_fetcher_factory.get_fetcher(source)
+            if not fetcher:
+                continue
             
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                query = """
-                    SELECT 
-                        date, value, "zScore", normalized,
-                        "pctChange1m", "pctChange3m", "pctChange12m",
-                        "ma30d", "ma90d", "ma365d",
-                        "volatility30d", "volatility90d",
-                        trend, "isOutlier"
-                    FROM "IndicatorTimeSeries"
-                    WHERE "indicatorMetadataId" = %s
-                """
-                
-                params = [indicator_id]
-                
-                if start_date:
-                    query += " AND date >= %s"
-                    params.append(start_date)
-                
-                if end_date:
-                    query += " AND date <= %s"
-                    params.append(end_date)
-                
-                query += " ORDER BY date DESC LIMIT %s"
-                params.append(limit)
-                
-                cur.execute(query, params)
-                results = cur.fetchall()
-                
-                data = []
-                for row in results:
-                    item = dict(row)
-                    item['date'] = item['date'].isoformat()
-                    data.append(item)
-                
-                return data
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+            series_ids = sorted({sid for ind in group for sid in self._split_series_ids(ind.get('seriesIDs'))})
+            try:
+                last_updated = await fetcher.get_last_updated(series_ids)
+            except Exception as e:
+                logger.warning(f"Upstream pre-flight failed for source {source}: {e}")
+                continue
+            
+            for indicator in group:
+                upstream = self._latest_upstream_update(indicator.get('seriesIDs'), last_updated)
+                if upstream is not None:
+                    changed[indicator['id']] = upstream > indicator['upstreamUpdatedAt']
+        
+        return changed
+    
+    async def _get_upstream_unchanged_ids(self, indicators: List[Dict[str, Any]]) -> set:
+        """Ids of indicators the pre-flight confirms unchanged upstream; anything unconfirmed is kept"""
+        unchanged = {indicator_id for indicator_id, changed in (await self._check_upstream(indicators)).items() if not changed}
+        
+        if unchanged:
+            logger.info(f"Upstream pre-flight: {len(unchanged)} of {len(indicators)} indicators unchanged, skipping")
+        
+        return unchanged
+    
+    async def _get_incremental_start_date(
+        self,
+        indicator: Dict[str, Any],
+        force_refresh: bool = False
+    ) -> Optional[date]:
+        """Start date for a delta fetch, or None when the full history is needed"""
+        if force_refresh:
+            return None
+        
+        # Calculations (ratios, YoY changes, ...) are computed over the whole series
+        if indicator.get('calculation'):
+            return None
+        
+        row = await self.db.fetch_one(
+            'SELECT MAX(date) AS last_date FROM "IndicatorTimeSeries" WHERE "indicatorMetadataId" = %s',
+            (indicator['id'],)
+        )
+        last_date = row['last_date'] if row else None
+        
+        if not last_date:
+            return None
+        
+        if isinstance(last_date, datetime):
+            last_date = last_date.date()
+        
+        return last_date - timedelta(days=settings.ETL_REVISION_LOOKBACK_DAYS)
+    
+    async def _count_time_series(self, indicator_id: int) -> int:
+        """Number of stored observations for an indicator"""
+        row = await self.db.fetch_one(
+            'SELECT COUNT(*) AS total FROM "IndicatorTimeSeries" WHERE "indicatorMetadataId" = %s',
+            (indicator_id,)
+        )
+        return row['total'] if row else 0
     
     async def _get_indicators_for_job(
         self,
@@ -607,59 +753,61 @@ class ETLService:
         source: Optional[str],
         force_refresh: bool
     ) -> List[Dict[str, Any]]:
-        """Get indicators for ETL job"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                query = """
-                    SELECT im.* FROM "IndicatorMetadata" im
-                    LEFT JOIN "ChartCategory" cc ON cc.id = im."categoryId"
-                    WHERE im."isActive" = true
-                """
-                params = []
-                
-                if indicator_ids:
-                    placeholders = ','.join(['%s'] * len(indicator_ids))
-                    query += f" AND im.id IN ({placeholders})"
-                    params.extend(indicator_ids)
-                
-                if category:
-                    query += " AND cc.name = %s"
-                    params.append(category)
-                
-                if source:
-                    query += " AND im.source = %s"
-                    params.append(source)
-                
-                if not force_refresh:
-                    # Only include indicators that need update
-                    query += """ AND (
-                        im."etlStatus" IN ('UNKNOWN', 'ERROR') 
-                        OR im."lastEtlRunAt" IS NULL
-                        OR im."lastEtlRunAt" < NOW() - INTERVAL '7 days'
-                    )"""
-                
-                cur.execute(query, params)
-                return [dict(row) for row in cur.fetchall()]
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        """
+        Get indicators for ETL job
+        
+        Without force_refresh an indicator is selected when it is due (never
+        loaded, failed, or last run over 7 days ago) and the upstream
+        pre-flight does not confirm it unchanged, or when the pre-flight
+        confirms an upstream update. Failed lookups fall back to the schedule.
+        """
+        query = """
+            SELECT im.*, (
+                im."etlStatus" IN ('UNKNOWN', 'ERROR')
+                OR im."lastEtlRunAt" IS NULL
+                OR im."lastEtlRunAt" < NOW() - INTERVAL '7 days'
+            ) AS due
+            FROM "IndicatorMetadata" im
+            LEFT JOIN "ChartCategory" cc ON cc.id = im."categoryId"
+            WHERE im."isActive" = true
+        """
+        params = []
+        
+        if indicator_ids:
+            placeholders = ','.join(['%s'] * len(indicator_ids))
+            query += f" AND im.id IN ({placeholders})"
+            params.extend(indicator_ids)
+        
+        if category:
+            query += " AND cc.name = %s"
+            params.append(category)
+        
+        if source:
+            query += " AND im.source = %s"
+            params.append(source)
+        
+        indicators = await self.db.fetch_all(query, params)
+        
+        if not force_refresh:
+            upstream_changed = await self._check_upstream(indicators)
+            indicators = [
+                ind for ind in indicators
+                if upstream_changed.get(ind['id'], ind['due'])
+            ]
+            logger.info(
+                f"Selected {len(indicators)} indicators: "
+                f"{sum(1 for ind in indicators if upstream_changed.get(ind['id']))} updated upstream, "
+                f"{sum(1 for changed in upstream_changed.values() if not changed)} confirmed unchanged"
+            )
+        
+        for ind in indicators:
+            ind.pop('due', None)
+        
+        return indicators
     
     async def _get_indicator_metadata(self, indicator_id: int) -> Optional[Dict[str, Any]]:
         """Get indicator metadata"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute('SELECT * FROM "IndicatorMetadata" WHERE id = %s', (indicator_id,))
-                result = cur.fetchone()
-                return dict(result) if result else None
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        return await self.db.fetch_one('SELECT * FROM "IndicatorMetadata" WHERE id = %s', (indicator_id,))
     
     def _validate_indicator_api_config(self, indicator: Dict[str, Any]) -> Optional[str]:
         """
@@ -693,80 +841,35 @@ class ETLService:
         
         return None
     
-    async def _create_etl_log(self, indicator_id: int) -> int:
-        """Create ETL log entry"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                job_id = f"LOG_{uuid.uuid4().hex[:12]}"
-                
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS "IndicatorETLLog" (
-                        id SERIAL PRIMARY KEY,
-                        "indicatorId" INTEGER NOT NULL,
-                        "jobId" VARCHAR(50) NOT NULL,
-                        status VARCHAR(20) NOT NULL,
-                        "errorCode" VARCHAR(50),
-                        "errorMessage" TEXT,
-                        "errorCategory" VARCHAR(50),
-                        "recordsProcessed" INTEGER DEFAULT 0,
-                        "recordsInserted" INTEGER DEFAULT 0,
-                        "recordsUpdated" INTEGER DEFAULT 0,
-                        "startedAt" TIMESTAMP,
-                        "completedAt" TIMESTAMP,
-                        "createdAt" TIMESTAMP DEFAULT NOW(),
-                        metadata JSONB
-                    )
-                """)
-                
-                cur.execute("""
-                    INSERT INTO "IndicatorETLLog" ("indicatorId", "jobId", status, "startedAt")
-                    VALUES (%s, %s, %s, %s)
-                    RETURNING id
-                """, (indicator_id, job_id, 'PROCESSING', datetime.now()))
-                
-                etl_log_id = cur.fetchone()[0]
-                conn.commit()
-                
-                return etl_log_id
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+    async def _create_etl_log(self, indicator_id: int) -> str:
+        """Create ETL log entry (buffered); returns the key to complete it with"""
+        return self.status_buffer.start_log(indicator_id)
     
     async def _complete_etl_log(
         self,
-        etl_log_id: int,
+        etl_log_id: str,
         status: str,
         records_processed: int = 0,
         records_inserted: int = 0,
         error_code: Optional[str] = None,
         error_message: Optional[str] = None,
-        error_category: Optional[str] = None
+        error_category: Optional[str] = None,
+        records_updated: int = 0,
+        metadata: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Complete ETL log"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE "IndicatorETLLog"
-                    SET status = %s,
-                        "recordsProcessed" = %s,
-                        "recordsInserted" = %s,
-                        "errorCode" = %s,
-                        "errorMessage" = %s,
-                        "errorCategory" = %s,
-                        "completedAt" = %s
-                    WHERE id = %s
-                """, (status, records_processed, records_inserted, error_code, error_message, error_category, datetime.now(), etl_log_id))
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        """Complete ETL log (buffered)"""
+        self.status_buffer.complete_log(
+            etl_log_id,
+            metadata=metadata,
+            status=status,
+            recordsProcessed=records_processed,
+            recordsInserted=records_inserted,
+            recordsUpdated=records_updated,
+            errorCode=error_code,
+            errorMessage=error_message,
+            errorCategory=error_category,
+            completedAt=datetime.now()
+        )
     
     async def _update_indicator_etl_status(
         self,
@@ -775,166 +878,93 @@ class ETLService:
         records_count: Optional[int] = None,
         last_successful_at: Optional[datetime] = None,
         error_code: Optional[str] = None,
-        etl_notes: Optional[str] = None
+        etl_notes: Optional[str] = None,
+        upstream_updated_at: Optional[datetime] = None
     ) -> None:
-        """Update indicator ETL status"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                updates = ['"etlStatus" = %s', '"lastEtlRunAt" = %s']
-                params = [status, datetime.now()]
-                
-                if records_count is not None:
-                    updates.append('"recordsCount" = %s')
-                    params.append(records_count)
-                
-                if last_successful_at:
-                    updates.append('"lastSuccessfulAt" = %s')
-                    params.append(last_successful_at)
-                
-                if error_code:
-                    updates.append('"etlStatusCode" = %s')
-                    params.append(error_code)
-                
-                if etl_notes:
-                    updates.append('"etlNotes" = %s')
-                    params.append(etl_notes)
-                
-                params.append(indicator_id)
-                
-                cur.execute(f"""
-                    UPDATE "IndicatorMetadata"
-                    SET {', '.join(updates)}
-                    WHERE id = %s
-                """, params)
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        """Update indicator ETL status (buffered)"""
+        columns = {'etlStatus': status, 'lastEtlRunAt': datetime.now()}
+        
+        if records_count is not None:
+            columns['recordsCount'] = records_count
+        
+        if last_successful_at:
+            columns['lastSuccessfulAt'] = last_successful_at
+        
+        if error_code:
+            columns['etlStatusCode'] = error_code
+        
+        if etl_notes:
+            columns['etlNotes'] = etl_notes
+        
+        if upstream_updated_at:
+            columns['upstreamUpdatedAt'] = upstream_updated_at
+        
+        self.status_buffer.update_status(indicator_id, columns)
     
     async def _save_time_series_data(
         self,
         indicator_id: int,
-        data: List[Dict[str, Any]],
-        original_data: Optional[List[Dict[str, Any]]] = None,
+        data: Series,
+        original_data: Optional[Series] = None,
         has_calculation: bool = False,
         force_refresh: bool = False
-    ) -> int:
+    ) -> Dict[str, int]:
         """
         Save time-series data to database with dual value support
         
+        Rows whose stored values are identical are skipped, so the result
+        counts inserted, updated and unchanged observations separately.
+        In the same transaction the derived features are recomputed from
+        the earliest written date onwards (from the start with
+        force_refresh), see core.feature_refresh.
+        
         Args:
             indicator_id: ID of the indicator
-            data: Enriched data (with AI features) - this is the main value
+            data: Series to store - this is the main value
             original_data: Original raw data from API (only if has_calculation=True)
             has_calculation: Whether this indicator has a calculation formula
-            force_refresh: Whether to force refresh existing data
+            force_refresh: Whether to force refresh existing data (recomputes all features)
         """
-        if not data:
-            return 0
+        if data is None or len(data) == 0:
+            return {'inserted': 0, 'updated': 0, 'unchanged': 0}
         
-        original_lookup = {}
-        if original_data and has_calculation:
-            for item in original_data:
-                original_lookup[item['date']] = item.get('value')
+        deduplicated_data = data.deduplicated()
         
-        try:
-            conn = psycopg2.connect(self.db_url)
+        if len(deduplicated_data) < len(data):
+            logger.warning(f"Removed {len(data) - len(deduplicated_data)} duplicate dates for indicator {indicator_id}")
+        
+        original_values = None
+        if original_data is not None and has_calculation:
+            original_values = original_data.deduplicated().lookup(deduplicated_data.dates)
+        
+        values = series_rows(indicator_id, deduplicated_data, original_values, has_calculation)
+        
+        def _write(cur):
+            if len(values) >= settings.ETL_COPY_THRESHOLD:
+                counts = copy_time_series_values(cur, values)
+            else:
+                counts = upsert_time_series_values(cur, values)
             
-            with conn.cursor() as cur:
-                seen_dates = {}
-                for item in data:
-                    item_date = item['date']
-                    seen_dates[item_date] = item  # Will overwrite duplicates
-                
-                deduplicated_data = list(seen_dates.values())
-                
-                if len(deduplicated_data) < len(data):
-                    logger.warning(f"Removed {len(data) - len(deduplicated_data)} duplicate dates for indicator {indicator_id}")
-                
-                values = []
-                for item in deduplicated_data:
-                    item_date = item['date']
-                    main_value = item.get('value')
-                    
-                    if has_calculation:
-                        original_val = original_lookup.get(item_date)
-                        calculated_val = main_value
-                    else:
-                        original_val = None
-                        calculated_val = None
-                    
-                    values.append((
-                        indicator_id,
-                        item_date,
-                        main_value,
-                        original_val,
-                        calculated_val,
-                        has_calculation,
-                        item.get('z_score'),
-                        item.get('normalized'),
-                        item.get('pct_change_1m'),
-                        item.get('pct_change_3m'),
-                        item.get('pct_change_12m'),
-                        item.get('ma_30d'),
-                        item.get('ma_90d'),
-                        item.get('ma_365d'),
-                        item.get('volatility_30d'),
-                        item.get('volatility_90d'),
-                        item.get('trend'),
-                        item.get('is_outlier', False),
-                        datetime.now(),
-                        datetime.now()
-                    ))
-                
-                execute_values(cur, """
-                    INSERT INTO "IndicatorTimeSeries" (
-                        "indicatorMetadataId", date, value,
-                        "originalValue", "calculatedValue", "hasCalculation",
-                        "zScore", normalized,
-                        "pctChange1m", "pctChange3m", "pctChange12m",
-                        "ma30d", "ma90d", "ma365d",
-                        "volatility30d", "volatility90d",
-                        trend, "isOutlier",
-                        "createdAt", "updatedAt"
-                    ) VALUES %s
-                    ON CONFLICT ("indicatorMetadataId", date)
-                    DO UPDATE SET
-                        value = EXCLUDED.value,
-                        "originalValue" = EXCLUDED."originalValue",
-                        "calculatedValue" = EXCLUDED."calculatedValue",
-                        "hasCalculation" = EXCLUDED."hasCalculation",
-                        "zScore" = EXCLUDED."zScore",
-                        normalized = EXCLUDED.normalized,
-                        "pctChange1m" = EXCLUDED."pctChange1m",
-                        "pctChange3m" = EXCLUDED."pctChange3m",
-                        "pctChange12m" = EXCLUDED."pctChange12m",
-                        "ma30d" = EXCLUDED."ma30d",
-                        "ma90d" = EXCLUDED."ma90d",
-                        "ma365d" = EXCLUDED."ma365d",
-                        "volatility30d" = EXCLUDED."volatility30d",
-                        "volatility90d" = EXCLUDED."volatility90d",
-                        trend = EXCLUDED.trend,
-                        "isOutlier" = EXCLUDED."isOutlier",
-                        "updatedAt" = EXCLUDED."updatedAt"
-                """, values)
-                
-                conn.commit()
-                return len(values)
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+            counts['features_refreshed'] = 0
+            if settings.ETL_FEATURES_ENABLED and (force_refresh or counts['first_changed'] is not None):
+                since = None if force_refresh else counts['first_changed']
+                counts['features_refreshed'] = refresh_features(cur, indicator_id, since)
+            
+            return counts
+        
+        counts = await self.db.run(_write, cursor_factory=psycopg2.extensions.cursor)
+        
+        if counts['inserted'] or counts['updated'] or counts['features_refreshed']:
+            await query_cache.invalidate(f"timeseries:{indicator_id}")
+        
+        return counts
     
     async def _apply_calculation(
         self,
-        raw_data: List[Dict[str, Any]],
+        raw_series: List[Series],
         calculation: str,
         series_ids: str
-    ) -> List[Dict[str, Any]]:
+    ) -> Series:
         """Apply calculation logic"""
         import pandas as pd
         from core.calculation_engine import CalculationEngine
@@ -942,14 +972,14 @@ class ETLService:
         
         if '|' in series_ids:
             series_list = [s.strip() for s in series_ids.split('|')]
+            fetched = {series.series_id: series for series in raw_series}
             series_data = {}
             
             for series_id in series_list:
-                series_records = [record for record in raw_data if record.get('series_id') == series_id]
-                if series_records:
-                    df = pd.DataFrame(series_records)
-                    series_data[series_id] = df
-                    logger.info(f"Prepared {len(series_records)} records for series {series_id}")
+                series = fetched.get(series_id)
+                if series is not None and len(series) > 0:
+                    series_data[series_id] = series.to_frame()
+                    logger.info(f"Prepared {len(series)} records for series {series_id}")
                 else:
                     logger.warning(f"No data found for series {series_id}")
             
@@ -957,16 +987,15 @@ class ETLService:
                 raise ValueError("No data available for any of the specified series")
                 
         else:
-            df = pd.DataFrame(raw_data)
-            series_data = {series_ids.strip(): df}
+            series_data = {series_ids.strip(): Series.concat(raw_series).to_frame()}
         
         result = calculation_engine.process_calculation(calculation, series_data, "indicator")
         
         if result.success and result.data is not None:
             if isinstance(result.data, pd.DataFrame):
-                return result.data.to_dict('records')
+                return Series.from_frame(result.data)
             else:
-                return result.data
+                return Series.from_records(result.data)
         else:
             raise ValueError(f"Calculation failed: {result.error_message}")
     
@@ -1006,17 +1035,7 @@ class ETLService:
     
     async def _get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job by ID"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute('SELECT * FROM "ETLJob" WHERE "jobId" = %s', (job_id,))
-                result = cur.fetchone()
-                return dict(result) if result else None
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        return await self.db.fetch_one('SELECT * FROM "ETLJob" WHERE "jobId" = %s', (job_id,))
     
     async def _update_job_status(
         self,
@@ -1027,25 +1046,42 @@ class ETLService:
         blocked: int = 0
     ) -> None:
         """Update job status"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE "ETLJob"
-                    SET status = %s,
-                        successful = %s,
-                        failed = %s,
-                        blocked = %s,
-                        "completedAt" = %s
-                    WHERE "jobId" = %s
-                """, (status, successful, failed, blocked, datetime.now(), job_id))
-                
-                conn.commit()
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        await self.db.execute("""
+            UPDATE "ETLJob"
+            SET status = %s,
+                successful = %s,
+                failed = %s,
+                blocked = %s,
+                "completedAt" = %s
+            WHERE "jobId" = %s
+        """, (status, successful, failed, blocked, datetime.now(), job_id))
+    
+    async def _update_job_progress(
+        self,
+        job_id: str,
+        counts: Dict[str, int],
+        total: int
+    ) -> None:
+        """Write live progress counters to a running job"""
+        await self.db.execute("""
+            UPDATE "ETLJob"
+            SET successful = %s,
+                failed = %s,
+                blocked = %s,
+                metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object('progress', %s::jsonb)
+            WHERE "jobId" = %s AND status = 'PROCESSING'
+        """, (
+            counts['successful'],
+            counts['failed'],
+            counts['blocked'],
+            psycopg2.extras.Json({
+                'processed': counts['processed'],
+                'skipped': counts['skipped'],
+                'total': total,
+                'updated_at': datetime.now().isoformat()
+            }),
+            job_id
+        ))
     
     async def get_job_result(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job result"""
@@ -1077,35 +1113,22 @@ class ETLService:
         limit: int = 50
     ) -> List[Dict[str, Any]]:
         """List recent jobs"""
-        try:
-            conn = psycopg2.connect(self.db_url)
-            
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                query = 'SELECT * FROM "ETLJob"'
-                params = []
-                
-                if status:
-                    query += ' WHERE status = %s'
-                    params.append(status)
-                
-                query += ' ORDER BY "createdAt" DESC LIMIT %s'
-                params.append(limit)
-                
-                cur.execute(query, params)
-                results = cur.fetchall()
-                
-                jobs = []
-                for row in results:
-                    job = dict(row)
-                    job['startedAt'] = job['startedAt'].isoformat()
-                    if job.get('completedAt'):
-                        job['completedAt'] = job['completedAt'].isoformat()
-                    if job.get('createdAt'):
-                        job['createdAt'] = job['createdAt'].isoformat()
-                    jobs.append(job)
-                
-                return jobs
-                
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        query = 'SELECT * FROM "ETLJob"'
+        params = []
+        
+        if status:
+            query += ' WHERE status = %s'
+            params.append(status)
+        
+        query += ' ORDER BY "createdAt" DESC LIMIT %s'
+        params.append(limit)
+        
+        jobs = await self.db.fetch_all(query, params)
+        for job in jobs:
+            job['startedAt'] = job['startedAt'].isoformat()
+            if job.get('completedAt'):
+                job['completedAt'] = job['completedAt'].isoformat()
+            if job.get('createdAt'):
+                job['createdAt'] = job['createdAt'].isoformat()
+        
+        return jobs
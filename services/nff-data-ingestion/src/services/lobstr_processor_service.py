@@ -7,6 +7,7 @@ from typing import Dict, Any, List
 from datetime import datetime
 from utils.logger import get_logger
 from core.monitoring import monitor, ErrorCategory
+from core.async_db_pool import get_async_pool
 
 logger = get_logger(__name__)
 
@@ -16,24 +17,10 @@ class LobstrProcessorService:
         import os
         from config import settings
         self.db_url = settings.DATABASE_URL
-        self._pool = None
         logger.info(f"[DEBUG] Using database URL: {self.db_url}")
     
     async def _get_connection_pool(self):
-        if self._pool is None:
-            import asyncpg
-            self._pool = await asyncpg.create_pool(
-                self.db_url,
-                min_size=2,
-                max_size=10,
-                command_timeout=60
-            )
-        return self._pool
-    
-    async def _close_connection_pool(self):
-        if self._pool:
-            await self._pool.close()
-            self._pool = None
+        return await get_async_pool()
         
     async def process_lobstr_csv(
         self, 
@@ -93,8 +80,6 @@ class LobstrProcessorService:
             total_time = (datetime.utcnow() - start_time).total_seconds()
             logger.error(f"[DEBUG] Failed to process Lobstr CSV after {total_time:.2f}s: {str(e)}")
             raise Exception(f"Failed to process Lobstr CSV: {str(e)}")
-        finally:
-            await self._close_connection_pool()
     
     async def _download_csv(self, download_url: str) -> str:
 
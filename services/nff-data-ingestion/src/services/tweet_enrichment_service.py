@@ -9,11 +9,11 @@ import os
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-import asyncpg
 from openai import AsyncOpenAI
 from openai import RateLimitError, APIError
 from utils.logger import get_logger
 from config import settings
+from core.async_db_pool import get_async_pool
 
 logger = get_logger(__name__)
 
@@ -22,22 +22,9 @@ class TweetEnrichmentService:
     def __init__(self):
         self.db_url = settings.DATABASE_URL
         self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self._pool = None
 
     async def _get_connection_pool(self):
-        if self._pool is None:
-            self._pool = await asyncpg.create_pool(
-                self.db_url,
-                min_size=2,
-                max_size=10,
-                command_timeout=60
-            )
-        return self._pool
-
-    async def _close_connection_pool(self):
-        if self._pool:
-            await self._pool.close()
-            self._pool = None
+        return await get_async_pool()
 
     async def enrich_tweets_batch(self, run_id: str, target_anchor_utc: Optional[datetime] = None, market_context_override: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         start_time = datetime.utcnow()
@@ -149,8 +136,6 @@ class TweetEnrichmentService:
         except Exception as e:
             logger.error(f"Tweet enrichment failed: {str(e)}")
             raise
-        finally:
-            await self._close_connection_pool()
 
     async def _fetch_raw_tweets(self, pool, run_id: str) -> List[Dict[str, Any]]:
         async with pool.acquire() as conn:
@@ -1,10 +1,79 @@
-import redis
+"""
+Cache Utilities
+Async Redis clients on shared connection pools, with pipelined bulk helpers
+"""
+
+from typing import Dict, List, Optional
+import redis.asyncio as redis
 from config import settings
 
-redis_client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Text values for the cache router
+redis_client = redis.Redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    max_connections=settings.REDIS_MAX_CONNECTIONS
+)
+
+# Raw bytes for compressed payloads (see core.query_cache)
+redis_binary_client = redis.Redis.from_url(
+    settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    socket_timeout=settings.QUERY_CACHE_SOCKET_TIMEOUT_SECONDS,
+    socket_connect_timeout=settings.QUERY_CACHE_SOCKET_TIMEOUT_SECONDS
+)
+
+async def cache_set(key: str, value: str, ttl: int = 3600):
+    await redis_client.set(key, value, ex=ttl)
+
+async def cache_get(key: str) -> Optional[str]:
+    return await redis_client.get(key)
+
+async def cache_delete(*keys: str) -> int:
+    """Remove keys; UNLINK frees the memory off Redis' main thread"""
+    if not keys:
+        return 0
+    return await redis_client.unlink(*keys)
+
+async def cache_mget(keys: List[str]) -> Dict[str, Optional[str]]:
+    if not keys:
+        return {}
+    return dict(zip(keys, await redis_client.mget(keys)))
+
+async def cache_mset(items: Dict[str, str], ttl: int = 3600) -> None:
+    """Set many keys with a TTL in one round trip"""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key, value in items.items():
+            pipe.set(key, value, ex=ttl)
+        await pipe.execute()
+
+async def cache_invalidate_pattern(pattern: str, batch_size: int = 500) -> int:
+    """
+    UNLINK every key matching a glob pattern
+
+    Keys are found with incremental SCAN (never KEYS, which blocks Redis)
+    and unlinked in pipelined batches of `batch_size`.
+    """
+    deleted = 0
+    batch: List[str] = []
+
+    async def _flush() -> int:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for start in range(0, len(batch), 100):
+                pipe.unlink(*batch[start:start + 100])
+            return sum(await pipe.execute())
+
+    async for key in redis_client.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            deleted += await _flush()
+            batch.clear()
+
+    if batch:
+        deleted += await _flush()
 
-def cache_set(key: str, value: str, ttl: int = 3600):
-    redis_client.set(key, value, ex=ttl)
+    return deleted
 
-def cache_get(key: str):
-    return redis_client.get(key)
\ No newline at end of file
+async def close_cache() -> None:
+    """Release pooled connections; called at application shutdown"""
+    await redis_client.aclose()
+    await redis_binary_client.aclose()
@@ -0,0 +1,253 @@
+"""
+Shared pytest fixtures
+Puts src/ on the import path (as PYTHONPATH=/app/src does in the image) and
+provides "IndicatorTimeSeries" cursors: an in-memory fake, and a rolled-back
+PostgreSQL cursor when DATABASE_URL is reachable
+"""
+
+import csv
+import os
+import re
+import sys
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import psycopg2
+import pytest
+
+# Scale of each numeric(p, s) column of "IndicatorTimeSeries" (Prisma schema)
+_NUMERIC_SCALES = {
+    "value": 6, "originalValue": 6, "calculatedValue": 6,
+    "zScore": 4, "normalized": 6,
+    "pctChange1m": 4, "pctChange3m": 4, "pctChange12m": 4,
+    "ma30d": 6, "ma90d": 6, "ma365d": 6,
+    "volatility30d": 6, "volatility90d": 6,
+    "lag1": 6, "lag3": 6, "lag6": 6, "lag12": 6,
+}
+
+def _store(column, value):
+    """A value as the column would hold it (numeric rounded to its scale)"""
+    if value is None or column not in _NUMERIC_SCALES:
+        return value
+    return round(float(value), _NUMERIC_SCALES[column])
+
+def _parse_csv(column, text):
+    """A COPY csv field as typed by the column"""
+    if text == '':
+        return None
+    if column == "indicatorMetadataId":
+        return int(text)
+    if column == "date":
+        return date.fromisoformat(text)
+    if column in ("createdAt", "updatedAt"):
+        return datetime.fromisoformat(text)
+    if column in ("hasCalculation", "isOutlier"):
+        return text == 'True'
+    if column == "trend":
+        return text
+    return float(text)
+
+class FakeTimeSeriesCursor:
+    """
+    In-memory tuple cursor over "IndicatorTimeSeries" and "IndicatorFeatureState"
+
+    Understands the statements of core.time_series_writer and
+    core.feature_refresh (their `execute_values` is patched in by the
+    fixture) plus plain
+    `SELECT <columns> FROM "IndicatorTimeSeries" WHERE "indicatorMetadataId" = %s ORDER BY date`
+    reads for assertions. Anything else fails loudly.
+    """
+
+    def __init__(self):
+        from core import feature_refresh, time_series_writer
+        self.columns = time_series_writer.TIME_SERIES_COLUMNS
+        self.compare_columns = time_series_writer._COMPARE_COLUMNS
+        self.update_columns = time_series_writer._UPDATE_COLUMNS
+        self.window_columns = [column for column, _ in feature_refresh._WINDOW_COLUMNS]
+        # (indicator id, date) -> {column: value}
+        self.rows = {}
+        # indicator id -> "IndicatorFeatureState" values in _STATE_COLUMNS order
+        self.states = {}
+        self.stage = None
+        self._result = []
+
+    def _series(self, indicator_id, before=None, after=None, since=None):
+        """(date, value) of an indicator's rows with a value, by date"""
+        rows = sorted(
+            (row["date"], row["value"]) for key, row in self.rows.items()
+            if key[0] == indicator_id and row["value"] is not None
+        )
+        if before is not None:
+            rows = [row for row in rows if row[0] < before]
+        if after is not None:
+            rows = [row for row in rows if row[0] > after]
+        if since is not None:
+            rows = [row for row in rows if row[0] >= since]
+        return rows
+
+    def _prior_stats(self, indicator_id, before):
+        values = [value for _, value in self._series(indicator_id, before=before)]
+        if not values:
+            return (0, None, 0.0, None, None)
+        mean = sum(values) / len(values)
+        return (len(values), mean, sum((v - mean) ** 2 for v in values), min(values), max(values))
+
+    def _update_windows(self, values):
+        changed = []
+        for value_tuple in values:
+            current = self.rows[(value_tuple[0], value_tuple[1])]
+            incoming = {column: _store(column, v) for column, v in zip(self.window_columns, value_tuple[2:])}
+            if any(current.get(column) != incoming[column] for column in self.window_columns):
+                current.update(incoming)
+                changed.append((value_tuple[1],))
+        return changed
+
+    def _update_statistics(self, params):
+        changed = []
+        for key, row in self.rows.items():
+            if key[0] != params["indicator_id"] or row["value"] is None:
+                continue
+            z = (row["value"] - params["mean"]) / params["std"] if params["std"] > 0 else 0.0
+            n = (row["value"] - params["min"]) / params["span"] if params["span"] > 0 else 0.5
+            incoming = {
+                "zScore": _store("zScore", z) if abs(z) <= 9999 else None,
+                "normalized": _store("normalized", n),
+                "isOutlier": abs(z) > 3,
+            }
+            if any(row.get(column) != value for column, value in incoming.items()):
+                row.update(incoming)
+                changed.append((row["date"],))
+        return changed
+
+    def _upsert(self, values):
+        written = []
+        for value_tuple in values:
+            row = {column: _store(column, v) for column, v in zip(self.columns, value_tuple)}
+            key = (row["indicatorMetadataId"], row["date"])
+            current = self.rows.get(key)
+            if current is None:
+                self.rows[key] = row
+                written.append((True, row["date"]))
+            elif any(current[column] != row[column] for column in self.compare_columns):
+                current.update({column: row[column] for column in self.update_columns})
+                written.append((False, row["date"]))
+        return written
+
+    def _select(self, query, params):
+        match = re.match(
+            r'\s*SELECT (.+?) FROM "IndicatorTimeSeries"\s+WHERE "indicatorMetadataId" = %s\s+ORDER BY date\s*$',
+            query, re.S
+        )
+        if match is None:
+            raise NotImplementedError(f"FakeTimeSeriesCursor cannot run: {query}")
+        columns = [re.sub(r'::\w+$', '', part.strip()).strip('"') for part in match.group(1).split(',')]
+        rows = sorted((row for key, row in self.rows.items() if key[0] == params[0]), key=lambda row: row["date"])
+        return [tuple(row.get(column) for column in columns) for row in rows]
+
+    def execute_values(self, query, values, fetch=False):
+        if 'INSERT INTO "IndicatorTimeSeries"' in query:
+            return self._upsert(values)
+        if 'UPDATE "IndicatorTimeSeries" AS t' in query:
+            return self._update_windows(values)
+        raise NotImplementedError(f"FakeTimeSeriesCursor cannot run: {query}")
+
+    def execute(self, query, params=None):
+        if 'FROM "IndicatorFeatureState"' in query:
+            state = self.states.get(params[0])
+            self._result = [state] if state is not None else []
+        elif 'INSERT INTO "IndicatorFeatureState"' in query:
+            self.states[params[0]] = tuple(params[1:])
+        elif "count(value)" in query:
+            self._result = [self._prior_stats(*params)]
+        elif "ORDER BY date DESC" in query:
+            indicator_id, before, limit = params
+            self._result = [(value,) for _, value in self._series(indicator_id, before=before)[::-1][:limit]]
+        elif "WITH scaled AS" in query:
+            self._result = self._update_statistics(params)
+        elif query.startswith("SELECT date, value::float8"):
+            indicator_id = params[0]
+            after = params[1] if "AND date > %s" in query else None
+            since = params[1] if "AND date >= %s" in query else None
+            self._result = self._series(indicator_id, after=after, since=since)
+        elif "CREATE TEMP TABLE" in query:
+            self.stage = []
+            self._result = []
+        elif 'INSERT INTO "IndicatorTimeSeries"' in query and "_indicator_time_series_stage" in query:
+            self._result = self._upsert(self.stage)
+        elif query.startswith("TRUNCATE"):
+            self.stage = []
+            self._result = []
+        else:
+            self._result = self._select(query, params)
+
+    def copy_expert(self, query, buffer):
+        for record in csv.reader(buffer):
+            self.stage.append(tuple(_parse_csv(column, text) for column, text in zip(self.columns, record)))
+
+    def fetchall(self):
+        result, self._result = self._result, []
+        return result
+
+    def fetchone(self):
+        return self._result.pop(0) if self._result else None
+
+def _fake_execute_values(cur, query, values, template=None, page_size=100, fetch=False):
+    return cur.execute_values(query, values, fetch)
+
+@pytest.fixture
+def db_cursor():
+    """
+    Tuple cursor in a transaction that is rolled back after the test
+
+    Skips the test when DATABASE_URL is not reachable or lacks the Prisma schema.
+    """
+    from config import settings
+
+    try:
+        conn = psycopg2.connect(settings.DATABASE_URL, connect_timeout=3)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    cur = conn.cursor()
+    cur.execute("SELECT to_regclass('\"IndicatorTimeSeries\"'), to_regclass('\"IndicatorFeatureState\"')")
+    if None in cur.fetchone():
+        conn.close()
+        pytest.skip("Database has no IndicatorTimeSeries/IndicatorFeatureState tables (run the Prisma migrations)")
+
+    try:
+        yield cur
+    finally:
+        conn.rollback()
+        conn.close()
+
+def _create_indicator(cur) -> int:
+    """Throwaway IndicatorMetadata row (gone with the rollback)"""
+    cur.execute('SELECT id FROM "ChartCategory" ORDER BY id LIMIT 1')
+    row = cur.fetchone()
+    if row is None:
+        cur.execute("""
+            INSERT INTO "ChartCategory" (name, description, icon, "isActive", "createdAt")
+            VALUES ('pytest', 'pytest indicators', 'chart', true, NOW())
+            RETURNING id
+        """)
+        row = cur.fetchone()
+
+    cur.execute("""
+        INSERT INTO "IndicatorMetadata" ("moduleEN", "indicatorEN", "categoryId", source, "updatedAt")
+        VALUES ('pytest', 'pytest indicator', %s, 'FRED', NOW())
+        RETURNING id
+    """, (row[0],))
+    return cur.fetchone()[0]
+
+@pytest.fixture(params=["fake", "postgres"])
+def time_series(request, monkeypatch):
+    """(cursor, indicator id) on the in-memory fake and, when reachable, on PostgreSQL"""
+    if request.param == "postgres":
+        cur = request.getfixturevalue("db_cursor")
+        return cur, _create_indicator(cur)
+
+    from core import feature_refresh, time_series_writer
+    monkeypatch.setattr(time_series_writer, "execute_values", _fake_execute_values)
+    monkeypatch.setattr(feature_refresh, "execute_values", _fake_execute_values)
+    return FakeTimeSeriesCursor(), 1
@@ -0,0 +1,23 @@
+import asyncpg
+import pytest
+
+from core import async_db_pool
+
+@pytest.mark.asyncio
+async def test_pool_is_shared_until_closed():
+    try:
+        pool = await async_db_pool.get_async_pool()
+    except (OSError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    try:
+        assert await async_db_pool.init_async_pool() is pool
+        assert await async_db_pool.get_async_pool() is pool
+        assert await pool.fetchval("SELECT $1::int + 1", 41) == 42
+    finally:
+        await async_db_pool.close_async_pool()
+
+    assert async_db_pool._pool is None
+    # The next caller gets a fresh pool
+    assert await async_db_pool.get_async_pool() is not pool
+    await async_db_pool.close_async_pool()
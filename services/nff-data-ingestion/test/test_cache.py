@@ -0,0 +1,31 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from utils import cache
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(cache, "redis_client", client)
+    return client
+
+@pytest.mark.asyncio
+async def test_bulk_set_get_and_delete(redis_client):
+    await cache.cache_mset({"a": "1", "b": "2"}, ttl=60)
+
+    assert await cache.cache_mget(["a", "b", "missing"]) == {"a": "1", "b": "2", "missing": None}
+    assert 0 < await redis_client.ttl("a") <= 60
+
+    assert await cache.cache_delete("a", "missing") == 1
+    assert await cache.cache_get("a") is None
+    assert await cache.cache_delete() == 0
+    assert await cache.cache_mget([]) == {}
+
+@pytest.mark.asyncio
+async def test_invalidate_pattern_unlinks_matches_in_batches(redis_client):
+    await cache.cache_mset({f"indicator:{i}": "x" for i in range(250)})
+    await cache.cache_set("other:1", "y")
+
+    assert await cache.cache_invalidate_pattern("indicator:*", batch_size=40) == 250
+
+    assert await redis_client.keys("*") == ["other:1"]
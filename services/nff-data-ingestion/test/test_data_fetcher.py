@@ -0,0 +1,185 @@
+import asyncio
+from datetime import date, datetime
+
+import httpx
+import pytest
+
+from config import settings
+from core.data_fetcher import BaseDataFetcher, DataFetcherFactory, FREDDataFetcher, ShillerDataFetcher, ShillerWorkbook
+
+@pytest.mark.asyncio
+async def test_shiller_without_data_url_raises_handled_error(monkeypatch):
+    monkeypatch.delenv("SHILLER_DATA_URL", raising=False)
+    fetcher = ShillerDataFetcher()
+
+    with pytest.raises(ValueError, match="SHILLER_DATA_URL"):
+        await fetcher.fetch("P")
+
+def _fred_fetcher(monkeypatch, handler) -> FREDDataFetcher:
+    monkeypatch.setenv("FRED_API_KEY", "test-key")
+    fetcher = FREDDataFetcher()
+    fetcher.rate_limiter = None
+    fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return fetcher
+
+@pytest.mark.asyncio
+async def test_fred_get_last_updated_looks_up_in_bounded_batches(monkeypatch):
+    monkeypatch.setattr(settings, "ETL_PREFLIGHT_BATCH_SIZE", 2)
+    requested = []
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        series_id = request.url.params["series_id"]
+        requested.append(series_id)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if series_id == "MISSING":
+            return httpx.Response(404, json={"error_message": "Bad series"})
+        return httpx.Response(200, json={"seriess": [{"id": series_id, "last_updated": "2024-05-01 07:48:02-05"}]})
+
+    fetcher = _fred_fetcher(monkeypatch, handler)
+    series_ids = ["GDP", "CPIAUCSL", "MISSING", "UNRATE", "FEDFUNDS"]
+
+    result = await fetcher.get_last_updated(series_ids)
+
+    assert sorted(requested) == sorted(series_ids)
+    assert peak == 2
+    assert result == {
+        "GDP": datetime(2024, 5, 1, 12, 48, 2),
+        "CPIAUCSL": datetime(2024, 5, 1, 12, 48, 2),
+        "MISSING": None,
+        "UNRATE": datetime(2024, 5, 1, 12, 48, 2),
+        "FEDFUNDS": datetime(2024, 5, 1, 12, 48, 2),
+    }
+
+    # Successful lookups are memoized for the fetch that follows
+    requested.clear()
+    await fetcher.get_last_updated(["GDP", "UNRATE"])
+    assert requested == []
+    await fetcher.close()
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-05-01 07:48:02-05", datetime(2024, 5, 1, 12, 48, 2)),
+    ("2024-05-01 07:48:02+0530", datetime(2024, 5, 1, 2, 18, 2)),
+    ("yesterday", None),
+    (None, None),
+])
+def test_fred_parse_last_updated(value, expected):
+    assert FREDDataFetcher.parse_last_updated(value) == expected
+
+def test_fred_parse_observations_drops_missing_and_invalid():
+    observations = [
+        {"date": "2024-01-01", "value": "1.5"},
+        {"date": "2024-02-01", "value": "."},
+        {"date": "not a date", "value": "2"},
+        {"date": "2024-03-01", "value": "-0.25"},
+    ]
+
+    series = FREDDataFetcher.parse_observations(observations, "GDP")
+
+    assert series.series_id == "GDP"
+    assert series.dates.tolist() == [date(2024, 1, 1), date(2024, 3, 1)]
+    assert series.values.tolist() == [1.5, -0.25]
+
+def test_fred_parse_observations_empty():
+    series = FREDDataFetcher.parse_observations([], "GDP")
+
+    assert len(series) == 0
+    assert series.series_id == "GDP"
+
+_SHILLER_CSV = "Date,P,E\n2024-01-01,4700.5,180.1\n2024-02-01,4900.25,\n2024-03-01,5100,185.3\n"
+
+@pytest.fixture
+def shiller(monkeypatch, tmp_path):
+    path = tmp_path / "shiller.csv"
+    path.write_text(_SHILLER_CSV)
+    monkeypatch.setenv("SHILLER_DATA_URL", str(path))
+
+    parses = []
+    parse = ShillerWorkbook.parse.__func__
+
+    def _counting_parse(cls, source, is_xlsx):
+        parses.append(source)
+        return parse(cls, source, is_xlsx)
+
+    monkeypatch.setattr(ShillerWorkbook, "parse", classmethod(_counting_parse))
+    return ShillerDataFetcher(), parses
+
+@pytest.mark.asyncio
+async def test_shiller_columns_come_from_one_parse(shiller):
+    fetcher, parses = shiller
+
+    price, earnings = await fetcher.fetch("P|E")
+    (recent,) = await fetcher.fetch("P", start_date=date(2024, 2, 1))
+
+    assert len(parses) == 1
+    assert price.values.tolist() == [4700.5, 4900.25, 5100.0]
+    assert earnings.dates.tolist() == [date(2024, 1, 1), date(2024, 3, 1)]
+    assert recent.dates.tolist() == [date(2024, 2, 1), date(2024, 3, 1)]
+
+    with pytest.raises(ValueError, match="not found"):
+        await fetcher.fetch("CAPE")
+
+@pytest.mark.asyncio
+async def test_shiller_unchanged_file_is_not_parsed_again(shiller, monkeypatch):
+    fetcher, parses = shiller
+    monkeypatch.setattr(settings, "SHILLER_WORKBOOK_TTL_SECONDS", 0)
+
+    await fetcher.fetch("P")
+    await fetcher.fetch("P")
+    assert len(parses) == 1
+
+    with open(fetcher.data_url, "a") as f:
+        f.write("2024-04-01,5200,190\n")
+    (price,) = await fetcher.fetch("P")
+
+    assert len(parses) == 2
+    assert price.values.tolist()[-1] == 5200.0
+
+class _StubFetcher(BaseDataFetcher):
+    def __init__(self):
+        self.closed = False
+
+    async def fetch(self, series_id, start_date=None, end_date=None, force_refresh=False):
+        return []
+
+    async def close(self):
+        self.closed = True
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(DataFetcherFactory, "_builders", {})
+    monkeypatch.setattr(DataFetcherFactory, "_instances", {})
+    return DataFetcherFactory
+
+@pytest.mark.asyncio
+async def test_factory_builds_one_fetcher_per_source(registry):
+    builds = []
+
+    def _build():
+        builds.append(1)
+        return _StubFetcher()
+
+    registry.register("fred", _build)
+
+    fetcher = registry.get_fetcher("FRED")
+    assert registry.get_fetcher("FRED (calc)") is fetcher
+    assert len(builds) == 1
+    assert registry.get_fetcher("Unknown source") is None
+
+    await registry.close_all()
+    assert fetcher.closed
+    # Closed fetchers are rebuilt on next use
+    assert registry.get_fetcher("FRED") is not fetcher
+
+def test_factory_returns_none_when_the_builder_fails(registry):
+    def _build():
+        raise ValueError("FRED_API_KEY is required for FREDDataFetcher.")
+
+    registry.register("fred", _build)
+
+    assert registry.get_fetcher("FRED") is None
@@ -0,0 +1,32 @@
+from config import settings
+from core.db_pool import db_pool
+
+class FakeConnection:
+    def cursor(self, cursor_factory=None):
+        return self
+
+    def execute(self, query, params=None):
+        pass
+
+class FakePool:
+    def getconn(self):
+        return FakeConnection()
+
+    def putconn(self, conn):
+        pass
+
+def test_stats_count_checked_out_connections(monkeypatch):
+    monkeypatch.setattr(db_pool, "_pool", FakePool())
+
+    first = db_pool.get_connection()
+    second = db_pool.get_connection()
+    assert db_pool.stats()["in_use"] == 2
+
+    db_pool.return_connection(first)
+    stats = db_pool.stats()
+    assert stats["in_use"] == 1
+    assert stats["available"] == settings.DB_POOL_MAX_SIZE - 1
+    assert (stats["min_size"], stats["max_size"]) == (settings.DB_POOL_MIN_SIZE, settings.DB_POOL_MAX_SIZE)
+
+    db_pool.return_connection(second)
+    assert db_pool.stats()["in_use"] == 0
@@ -0,0 +1,54 @@
+import pytest
+
+from core.etl_status_buffer import ETLStatusBuffer
+from services.etl_service import ETLService
+
+class FakeDatabase:
+    """Records AsyncDatabase.execute statements; fetch_one finds nothing"""
+
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, query, params=None):
+        self.executed.append((query, params))
+        return 1
+
+    async def fetch_one(self, query, params=None):
+        return None
+
+    async def run(self, fn, *args, cursor_factory=None):
+        raise AssertionError("nothing should be written for an unknown indicator")
+
+class FailingBuffer:
+    async def flush(self):
+        return False
+
+def _job_statuses(db: FakeDatabase):
+    return [params[0] for query, params in db.executed if 'SET status' in query]
+
+@pytest.fixture
+def service():
+    service = ETLService()
+    service.db = FakeDatabase()
+    service.status_buffer = ETLStatusBuffer(service.db, flush_size=1000, flush_interval=3600)
+    return service
+
+@pytest.mark.asyncio
+async def test_unknown_indicator_queues_no_bookkeeping(service):
+    result = await service.fetch_indicator_data(404)
+
+    assert result["status"] == "ERROR"
+    assert result["error_code"] == "API_NOT_FOUND"
+    assert service.status_buffer._logs == {}
+    assert service.status_buffer._statuses == {}
+
+@pytest.mark.asyncio
+async def test_job_is_failed_when_its_bookkeeping_cannot_be_flushed(service):
+    async def worker(item):
+        return {'status': 'OK'}
+
+    await service._run_job_indicators("ETL_ok", [{'id': 1}], worker)
+    service.status_buffer = FailingBuffer()
+    await service._run_job_indicators("ETL_lost", [{'id': 1}], worker)
+
+    assert _job_statuses(service.db) == ['COMPLETED', 'FAILED']
@@ -0,0 +1,201 @@
+import asyncio
+
+import psycopg2
+import pytest
+
+from core import etl_status_buffer as buffer_module
+from core.etl_status_buffer import ETLStatusBuffer
+
+class FakeDatabase:
+    """
+    Records AsyncDatabase.run calls instead of writing
+
+    The next `failures` calls raise `error`; any call touching an indicator in
+    `poison` raises an IntegrityError, as a row violating the foreign key would.
+    """
+
+    def __init__(self, failures: int = 0, error: Exception = None, poison=()):
+        self.failures = failures
+        self.error = error or RuntimeError("connection lost")
+        self.poison = set(poison)
+        self.calls = []
+        self.next_id = 1
+
+    async def run(self, fn, inserts, updates, statuses, cursor_factory=None):
+        self.calls.append((inserts, updates, statuses))
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        touched = {row['indicatorId'] for row in inserts} | {row['indicatorId'] for _, row in updates} | set(statuses)
+        if touched & self.poison:
+            raise psycopg2.IntegrityError("violates foreign key constraint")
+        ids = {}
+        for row in inserts:
+            ids[row['jobId']] = self.next_id
+            self.next_id += 1
+        return ids
+
+@pytest.fixture
+def invalidated(monkeypatch):
+    tags = []
+
+    async def _invalidate(*args):
+        tags.extend(args)
+
+    monkeypatch.setattr(buffer_module.query_cache, "invalidate", _invalidate)
+    return tags
+
+def _buffer(db: FakeDatabase, **kwargs) -> ETLStatusBuffer:
+    # Large thresholds so only explicit flushes write
+    options = {'flush_size': 1000, 'flush_interval': 3600, **kwargs}
+    return ETLStatusBuffer(db, **options)
+
+async def _stop(buffer: ETLStatusBuffer) -> None:
+    if buffer._timer:
+        buffer._timer.cancel()
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_log_and_status_writes(invalidated):
+    db = FakeDatabase()
+    buffer = _buffer(db)
+
+    key = buffer.start_log(7)
+    buffer.update_status(7, {'etlStatus': 'PROCESSING'})
+    buffer.complete_log(key, status='OK', recordsProcessed=3, metadata={'note': 'x'})
+    buffer.update_status(7, {'etlStatus': 'OK', 'recordsCount': 3})
+    assert await buffer.flush()
+
+    assert len(db.calls) == 1
+    inserts, updates, statuses = db.calls[0]
+    assert [(row['jobId'], row['status'], row['recordsProcessed'], row['metadata']) for row in inserts] == [(key, 'OK', 3, {'note': 'x'})]
+    assert updates == []
+    assert statuses == {7: {'etlStatus': 'OK', 'recordsCount': 3}}
+    assert set(invalidated) == {"indicators", "indicator:7"}
+
+    # Finished logs are dropped, so nothing is left to write
+    assert await buffer.flush()
+    assert len(db.calls) == 1
+    await _stop(buffer)
+
+@pytest.mark.asyncio
+async def test_running_log_is_updated_by_id(invalidated):
+    db = FakeDatabase()
+    buffer = _buffer(db)
+
+    key = buffer.start_log(3)
+    await buffer.flush()
+    buffer.complete_log(key, status='ERROR', errorCode='API_TIMEOUT')
+    await buffer.flush()
+
+    assert len(db.calls) == 2
+    inserts, updates, _ = db.calls[1]
+    assert inserts == []
+    assert [(log_id, row['status'], row['errorCode']) for log_id, row in updates] == [(1, 'ERROR', 'API_TIMEOUT')]
+    await _stop(buffer)
+
+@pytest.mark.asyncio
+async def test_size_trigger_flushes_without_waiting(invalidated):
+    db = FakeDatabase()
+    buffer = _buffer(db, flush_size=3)
+
+    buffer.update_status(1, {'etlStatus': 'OK'})
+    buffer.update_status(2, {'etlStatus': 'OK'})
+    await asyncio.sleep(0)
+    assert db.calls == []
+
+    buffer.update_status(3, {'etlStatus': 'OK'})
+    await asyncio.sleep(0)
+
+    assert len(db.calls) == 1
+    assert set(db.calls[0][2]) == {1, 2, 3}
+    await _stop(buffer)
+
+@pytest.mark.asyncio
+async def test_timer_trigger_flushes_after_interval(invalidated):
+    db = FakeDatabase()
+    buffer = _buffer(db, flush_interval=0.01)
+
+    buffer.update_status(4, {'etlStatus': 'OK'})
+    assert db.calls == []
+
+    await asyncio.sleep(0.05)
+
+    assert len(db.calls) == 1
+    assert db.calls[0][2] == {4: {'etlStatus': 'OK'}}
+    await _stop(buffer)
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_writes_for_retry(invalidated):
+    db = FakeDatabase(failures=1)
+    buffer = _buffer(db)
+
+    key = buffer.start_log(5)
+    buffer.complete_log(key, status='OK')
+    buffer.update_status(5, {'etlStatus': 'OK', 'etlNotes': 'first'})
+    assert not await buffer.flush()
+
+    assert len(db.calls) == 1
+    assert invalidated == []
+    # The failed flush scheduled a retry
+    assert buffer._timer is not None and not buffer._timer.done()
+
+    # Writes queued after the failure win over the retried ones
+    buffer.update_status(5, {'etlNotes': 'second'})
+    assert await buffer.flush()
+
+    assert len(db.calls) == 2
+    inserts, updates, statuses = db.calls[1]
+    assert [row['jobId'] for row in inserts] == [key]
+    assert updates == []
+    assert statuses == {5: {'etlStatus': 'OK', 'etlNotes': 'second'}}
+    assert set(invalidated) == {"indicators", "indicator:5"}
+    await _stop(buffer)
+
+@pytest.mark.asyncio
+async def test_poison_rows_are_dropped_and_the_rest_written(invalidated):
+    db = FakeDatabase(poison={999})
+    buffer = _buffer(db)
+
+    good = buffer.start_log(1)
+    buffer.complete_log(good, status='OK')
+    bad = buffer.start_log(999)
+    buffer.update_status(1, {'etlStatus': 'OK'})
+    buffer.update_status(999, {'etlStatus': 'OK'})
+    assert not await buffer.flush()
+
+    # One failed batch, then one call per row
+    assert len(db.calls) == 5
+    assert set(invalidated) == {"indicators", "indicator:1"}
+    assert good not in buffer._logs and bad not in buffer._logs
+    assert buffer._statuses == {}
+
+    # Nothing is left to retry
+    db.calls.clear()
+    assert await buffer.flush()
+    assert db.calls == []
+    await _stop(buffer)
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded(invalidated):
+    db = FakeDatabase(failures=10, error=psycopg2.OperationalError("server closed the connection"))
+    buffer = _buffer(db, max_attempts=2)
+
+    key = buffer.start_log(6)
+    buffer.update_status(6, {'etlStatus': 'OK'})
+    assert not await buffer.flush()
+    assert key in buffer._logs and 6 in buffer._statuses
+
+    assert not await buffer.flush()
+    assert key not in buffer._logs and buffer._statuses == {}
+    assert len(db.calls) == 2
+
+    assert await buffer.flush()
+    assert len(db.calls) == 2
+    await _stop(buffer)
+
+@pytest.mark.asyncio
+async def test_update_status_rejects_unknown_columns():
+    buffer = _buffer(FakeDatabase())
+
+    with pytest.raises(ValueError):
+        buffer.update_status(1, {'isActive': False})
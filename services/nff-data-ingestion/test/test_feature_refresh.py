@@ -0,0 +1,81 @@
+import numpy as np
+from core.ai_features import AIFeaturesCalculator
+from core.feature_refresh import refresh_features
+from core.series import Series
+from core.time_series_writer import series_rows, upsert_time_series_values
+
+# Stored feature column -> calculate_feature_columns key
+_FEATURES = {
+    "zScore": "z_score",
+    "normalized": "normalized",
+    "pctChange1m": "pct_change_1m",
+    "pctChange12m": "pct_change_12m",
+    "ma30d": "ma_30d",
+    "ma365d": "ma_365d",
+    "volatility90d": "volatility_90d",
+}
+
+def _series(length: int, seed: int = 7) -> Series:
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64('2020-01-01'), np.datetime64('2020-01-01') + length)
+    return Series(dates, 100 + np.cumsum(rng.normal(0, 1, length)))
+
+def _stored(cur, indicator_id: int):
+    columns = ", ".join(f'"{column}"::float8' for column in _FEATURES)
+    cur.execute(f"""
+        SELECT {columns}, trend, "isOutlier" FROM "IndicatorTimeSeries"
+        WHERE "indicatorMetadataId" = %s
+        ORDER BY date
+    """, (indicator_id,))
+    return cur.fetchall()
+
+def _assert_matches_batch(rows, series: Series):
+    # Stored values are rounded to 6 decimals, so compare against the same input
+    batch = AIFeaturesCalculator().calculate_feature_columns(
+        [{'date': d, 'value': round(v, 6)} for d, v in zip(series.dates.tolist(), series.values.tolist())]
+    )
+    assert len(rows) == len(series)
+
+    for i, key in enumerate(_FEATURES.values()):
+        stored = np.array([np.nan if row[i] is None else float(row[i]) for row in rows])
+        expected = np.array([np.nan if v is None else v for v in batch[key]], dtype=np.float64)
+        # Stored values are rounded to the numeric(p, s) column scale
+        np.testing.assert_allclose(stored, expected, atol=1e-4, equal_nan=True, err_msg=key)
+
+    assert [row[-2] for row in rows] == list(batch['trend'])
+    assert [row[-1] for row in rows] == list(batch['is_outlier'])
+
+def test_refresh_features_matches_calculate_features(time_series):
+    cur, indicator_id = time_series
+    series = _series(800)
+    upsert_time_series_values(cur, series_rows(indicator_id, series))
+
+    assert refresh_features(cur, indicator_id) == len(series)
+    _assert_matches_batch(_stored(cur, indicator_id), series)
+
+    # Nothing moved, so nothing is rewritten
+    assert refresh_features(cur, indicator_id) == 0
+
+def test_incremental_refresh_matches_calculate_features(time_series):
+    cur, indicator_id = time_series
+    series = _series(800)
+    head = Series(series.dates[:700], series.values[:700])
+    upsert_time_series_values(cur, series_rows(indicator_id, head))
+    refresh_features(cur, indicator_id)
+
+    # Appended rows go through the persisted FeatureState; the whole-series
+    # statistics of the older rows move with the totals
+    counts = upsert_time_series_values(cur, series_rows(indicator_id, series))
+    assert counts["inserted"] == 100
+    assert refresh_features(cur, indicator_id, counts["first_changed"]) >= 100
+
+    _assert_matches_batch(_stored(cur, indicator_id), series)
+
+    # A revision of an older date rebuilds from that date on
+    revised = Series(series.dates.copy(), series.values.copy())
+    revised.values[650] += 25
+    counts = upsert_time_series_values(cur, series_rows(indicator_id, revised))
+    assert counts["updated"] == 1
+    refresh_features(cur, indicator_id, counts["first_changed"])
+
+    _assert_matches_batch(_stored(cur, indicator_id), revised)
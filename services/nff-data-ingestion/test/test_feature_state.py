@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.ai_features import AIFeaturesCalculator
+from core.feature_refresh import _WINDOW_FEATURES, FeatureState, _sanitize
+
+def _values(length: int, seed: int = 11) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 50 + np.cumsum(rng.normal(0, 2, length))
+
+def _batch(values: np.ndarray):
+    dates = np.arange(np.datetime64('2021-01-01'), np.datetime64('2021-01-01') + len(values))
+    return AIFeaturesCalculator().calculate_feature_columns(
+        [{'date': d, 'value': v} for d, v in zip(dates.tolist(), values.tolist())]
+    )
+
+def _as_float(column) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in column], dtype=np.float64)
+
+def test_push_in_batches_matches_whole_series_statistics():
+    values = _values(1000)
+    state = FeatureState()
+    for chunk in np.array_split(values, [1, 2, 300, 301, 777]):
+        state.push(None, chunk)
+
+    assert state.count == len(values)
+    assert state.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert state.std == pytest.approx(values.std(ddof=1), rel=1e-12)
+    assert (state.min_value, state.max_value) == (values.min(), values.max())
+    assert list(state.recent) == values[-AIFeaturesCalculator.LOOKBACK_ROWS:].tolist()
+
+@pytest.mark.parametrize("appended", [1, 25, 400])
+def test_append_path_matches_calculate_feature_columns(appended):
+    values = _values(900)
+    head, tail = values[:-appended], values[-appended:]
+    calculator = AIFeaturesCalculator()
+
+    state = FeatureState()
+    state.push(None, head)
+
+    # What refresh_features does for appended rows: window features from the
+    # ring buffer plus the new values, statistics from the running totals
+    window = calculator.calculate_window_features(
+        pd.Series(np.concatenate([np.array(state.recent), tail]))
+    ).iloc[len(state.recent):]
+    state.push(None, tail)
+    z_score = (values - state.mean) / state.std
+    normalized = (values - state.min_value) / (state.max_value - state.min_value)
+
+    batch = _batch(values)
+
+    for column, source in _WINDOW_FEATURES.items():
+        np.testing.assert_allclose(
+            _as_float(_sanitize(window[source].to_numpy(dtype=np.float64))),
+            _as_float(batch[source][-appended:]),
+            rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=column
+        )
+    assert window["trend"].tolist() == list(batch["trend"][-appended:])
+
+    np.testing.assert_allclose(z_score, _as_float(batch["z_score"]), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(normalized, _as_float(batch["normalized"]), rtol=1e-9, atol=1e-9)
+    assert (np.abs(z_score) > 3).tolist() == list(batch["is_outlier"])
+
+def test_std_is_zero_below_two_observations():
+    state = FeatureState()
+    assert state.std == 0.0
+
+    state.push(None, np.array([4.0]))
+    assert state.std == 0.0
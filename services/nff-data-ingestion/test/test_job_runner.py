@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from core.job_runner import ETLJobRunner
+
+@pytest.mark.asyncio
+async def test_run_tallies_statuses_within_the_concurrency_bound():
+    in_flight = 0
+    peak = 0
+    outcomes = {1: {'status': 'OK'}, 2: {'status': 'BLOCKED'}, 3: None, 4: {'status': 'ERROR'}, 5: 'raise', 6: {'status': 'OK'}}
+
+    async def worker(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        outcome = outcomes[item['id']]
+        if outcome == 'raise':
+            raise RuntimeError("fetch failed")
+        return outcome
+
+    counts = await ETLJobRunner(max_concurrency=2).run([{'id': i} for i in outcomes], worker)
+
+    assert counts == {'successful': 2, 'failed': 2, 'blocked': 1, 'skipped': 1, 'processed': 6}
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_run_reports_progress_and_final_counts():
+    reports = []
+
+    async def worker(item):
+        await asyncio.sleep(0.02)
+        return {'status': 'OK'}
+
+    async def on_progress(counts):
+        reports.append(counts)
+
+    runner = ETLJobRunner(max_concurrency=1, progress_interval=0.01)
+    counts = await runner.run([{'id': i} for i in range(3)], worker, on_progress=on_progress)
+
+    assert reports[-1] == counts
+    assert len(reports) >= 2
+    assert [report['processed'] for report in reports] == sorted(report['processed'] for report in reports)
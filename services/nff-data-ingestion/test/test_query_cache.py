@@ -0,0 +1,112 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from core.query_cache import LocalCache, QueryCache
+
+class Loader:
+    """Counts calls and returns the current value"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+@pytest.fixture
+def cache():
+    return QueryCache(FakeAsyncRedis(), LocalCache(100, 60))
+
+@pytest.mark.asyncio
+async def test_hit_after_miss(cache):
+    loader = Loader({"id": 1})
+
+    assert await cache.get_or_load("indicators", [1], loader, ttl=60, tags=["indicator:1"]) == {"id": 1}
+    assert await cache.get_or_load("indicators", [1], loader, ttl=60, tags=["indicator:1"]) == {"id": 1}
+
+    assert loader.calls == 1
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_only_tagged_entries(cache):
+    first, second = Loader([1]), Loader([2])
+    await cache.get_or_load("time_series", [1], first, ttl=60, tags=["timeseries:1"])
+    await cache.get_or_load("time_series", [2], second, ttl=60, tags=["timeseries:2"])
+
+    first.value = [1, 1]
+    await cache.invalidate("timeseries:1")
+
+    assert await cache.get_or_load("time_series", [1], first, ttl=60, tags=["timeseries:1"]) == [1, 1]
+    assert await cache.get_or_load("time_series", [2], second, ttl=60, tags=["timeseries:2"]) == [2]
+    assert (first.calls, second.calls) == (2, 1)
+
+@pytest.mark.asyncio
+async def test_load_racing_an_invalidation_is_not_stored(cache):
+    async def loader():
+        # A writer commits and invalidates while this load is running
+        await cache.invalidate("indicator:5")
+        return {"etlStatus": "PROCESSING"}
+
+    await cache.get_or_load("indicators", [5], loader, ttl=60, tags=["indicator:5"])
+
+    fresh = Loader({"etlStatus": "OK"})
+    assert await cache.get_or_load("indicators", [5], fresh, ttl=60, tags=["indicator:5"]) == {"etlStatus": "OK"}
+    assert fresh.calls == 1
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_the_loader(cache):
+    await cache.client.aclose()
+    cache.client = FakeAsyncRedis(connected=False)
+    loader = Loader([3])
+
+    assert await cache.get_or_load("time_series", [3], loader, ttl=60, tags=["timeseries:3"]) == [3]
+    assert await cache.get_or_load("time_series", [3], loader, ttl=60, tags=["timeseries:3"]) == [3]
+    assert loader.calls == 2
+    # Redis is bypassed after the failure
+    assert not cache._available()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("local", [False, True])
+async def test_not_found_is_never_cached(cache, local):
+    cache._subscribed = True
+    loader = Loader(None)
+
+    assert await cache.get_or_load("indicators", [9], loader, ttl=60, tags=["indicator:9"], local=local) is None
+
+    # Another service creates the row; no invalidation announces it
+    loader.value = {"id": 9}
+    assert await cache.get_or_load("indicators", [9], loader, ttl=60, tags=["indicator:9"], local=local) == {"id": 9}
+    assert loader.calls == 2
+
+@pytest.mark.asyncio
+async def test_local_tier_serves_repeats_until_invalidated(cache):
+    cache._subscribed = True
+    loader = Loader({"id": 4})
+
+    await cache.get_or_load("indicators", [4], loader, ttl=60, tags=["indicator:4"], local=True)
+    # Served from the in-process tier even with Redis unavailable
+    cache._unavailable_until = float("inf")
+    assert await cache.get_or_load("indicators", [4], loader, ttl=60, tags=["indicator:4"], local=True) == {"id": 4}
+    assert loader.calls == 1
+
+    await cache.invalidate("indicator:4")
+    await cache.get_or_load("indicators", [4], loader, ttl=60, tags=["indicator:4"], local=True)
+    assert loader.calls == 2
+
+def test_local_cache_evicts_least_recently_used():
+    local = LocalCache(max_entries=2, ttl=60)
+    local.put("a", b"1", ["t"])
+    local.put("b", b"2", ["t"])
+    local.get("a")
+    local.put("c", b"3", ["t"])
+
+    assert (local.get("a"), local.get("b"), local.get("c")) == (b"1", None, b"3")
+
+def test_local_cache_drops_puts_made_across_an_invalidation():
+    local = LocalCache(max_entries=10, ttl=60)
+    generation = local.generation(["indicator:1"])
+    local.invalidate(["indicator:1"])
+
+    local.put("k", b"stale", ["indicator:1"], generation)
+
+    assert local.get("k") is None
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+from config import settings
+from core.rate_limiter import TokenBucket, parse_retry_after
+
+@pytest.mark.parametrize("value, expected", [
+    ("120", 120.0),
+    ("0", 0.0),
+    ("1.5", 1.5),
+    ("-5", 0.0),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+@pytest.mark.parametrize("value", [None, "", "soon", "Tue, 99 Foo 2024"])
+def test_parse_retry_after_invalid(value):
+    assert parse_retry_after(value) is None
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=90)
+
+    seconds = parse_retry_after(format_datetime(retry_at, usegmt=True))
+
+    assert 85 <= seconds <= 90
+
+def test_parse_retry_after_past_http_date():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_throttle_honors_retry_after_beyond_the_backoff_cap(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RATE_LIMIT_MAX_BACKOFF_SECONDS", 60.0)
+    bucket = TokenBucket(4.0)
+
+    assert bucket.throttle(300.0) == 300.0
+    assert bucket.rate == 2.0
+
+def test_throttle_caps_its_own_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RATE_LIMIT_MAX_BACKOFF_SECONDS", 0.5)
+    bucket = TokenBucket(1.0, min_rate=0.1)
+
+    # One token interval at the halved rate would be 2s
+    assert bucket.throttle() == 0.5
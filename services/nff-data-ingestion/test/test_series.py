@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from datetime import date
+from core.series import Series
+
+def test_from_frame_parses_dates_and_values():
+    df = pd.DataFrame({'date': ['2024-01-01', '2024-01-02'], 'value': ['1.5', '2']})
+
+    series = Series.from_frame(df, 'GDP')
+
+    assert series.series_id == 'GDP'
+    assert series.dates.dtype == np.dtype('datetime64[D]')
+    assert series.dates.tolist() == [date(2024, 1, 1), date(2024, 1, 2)]
+    assert series.values.tolist() == [1.5, 2.0]
+
+def test_from_frame_keeps_datetime_columns():
+    df = pd.DataFrame({'date': pd.to_datetime(['2024-03-01 15:30', '2024-03-02 00:00']), 'value': [1.0, 2.0]})
+
+    series = Series.from_frame(df)
+
+    assert series.dates.tolist() == [date(2024, 3, 1), date(2024, 3, 2)]
+
+def test_from_frame_missing_values_become_nan():
+    df = pd.DataFrame({'date': ['2024-01-01', '2024-01-02', '2024-01-03'], 'value': ['.', None, 3]})
+
+    series = Series.from_frame(df)
+
+    assert len(series) == 3
+    assert np.isnan(series.values[:2]).all()
+    assert series.values[2] == 3.0
+
+def test_from_frame_drops_unparseable_dates():
+    df = pd.DataFrame({'date': ['2024-01-01', 'not a date', '2024-01-03'], 'value': [1, 2, 3]})
+
+    series = Series.from_frame(df)
+
+    assert series.dates.tolist() == [date(2024, 1, 1), date(2024, 1, 3)]
+    assert series.values.tolist() == [1.0, 3.0]
+
+def test_from_frame_empty():
+    for df in (None, pd.DataFrame(columns=['date', 'value'])):
+        series = Series.from_frame(df, 'X')
+        assert len(series) == 0
+        assert series.series_id == 'X'
+
+def test_deduplicated_keeps_last_occurrence_sorted():
+    series = Series(['2024-01-02', '2024-01-01', '2024-01-02'], [1.0, 2.0, 3.0])
+
+    deduplicated = series.deduplicated()
+
+    assert deduplicated.dates.tolist() == [date(2024, 1, 1), date(2024, 1, 2)]
+    assert deduplicated.values.tolist() == [2.0, 3.0]
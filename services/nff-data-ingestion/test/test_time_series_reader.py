@@ -0,0 +1,176 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from config import settings
+from core.query_cache import query_cache
+from core.time_series_reader import READ_COLUMNS, align_series, batch_time_series_query
+from services.etl_service import ETLService
+
+_START = date(2024, 1, 1)
+
+class FakeReadDatabase:
+    """AsyncDatabase stand-in serving the SELECTs built by time_series_query from in-memory rows"""
+
+    def __init__(self, indicator_id: int, days: int):
+        self.indicator_id = indicator_id
+        self.rows = [
+            (_START + timedelta(days=i), float(i)) + (None,) * (len(READ_COLUMNS) - 4) + ("up", False)
+            for i in range(days)
+        ]
+
+    def select(self, query: str, params) -> list:
+        params = list(params)
+        indicator_id = params.pop(0)
+        rows = self.rows if indicator_id == self.indicator_id else []
+        if "date >= %s" in query:
+            start = params.pop(0)
+            rows = [row for row in rows if row[0] >= start]
+        if "date <= %s" in query:
+            end = params.pop(0)
+            rows = [row for row in rows if row[0] <= end]
+        if "date > %s" in query:
+            after = params.pop(0)
+            rows = [row for row in rows if row[0] > after]
+        if "date < %s" in query:
+            before = params.pop(0)
+            rows = [row for row in rows if row[0] < before]
+        rows = sorted(rows, reverse="ORDER BY date DESC" in query)
+        if "LIMIT %s" in query:
+            rows = rows[:params.pop(0)]
+        # Postgres formats the date (to_char)
+        return [(row[0].isoformat(),) + row[1:] for row in rows]
+
+    async def run(self, fn, *args, cursor_factory=None):
+        database = self
+
+        class _Cursor:
+            def execute(self, query, params):
+                self.rows = database.select(query, params)
+
+            def fetchall(self):
+                return self.rows
+
+        return fn(_Cursor(), *args)
+
+    async def stream(self, query, params=None, batch_size=1000):
+        rows = self.select(query, params)
+        for offset in range(0, len(rows), batch_size):
+            yield rows[offset:offset + batch_size]
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(query_cache, "enabled", False)
+    service = ETLService()
+    service.db = FakeReadDatabase(indicator_id=3, days=25)
+    return service
+
+async def _all_pages(service: ETLService, limit: int, order: str, **kwargs):
+    dates, counts, cursor = [], [], None
+    while True:
+        page = await service.get_indicator_time_series(3, limit=limit, cursor=cursor, order=order, **kwargs)
+        counts.append(page["count"])
+        dates.extend(row["date"] for row in page["data"])
+        if page["next_cursor"] is None:
+            return dates, counts
+        # The API hands the cursor out and takes it back as YYYY-MM-DD
+        cursor = date.fromisoformat(page["next_cursor"])
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_keyset_pages_return_every_row_once(service, order):
+    dates, counts = await _all_pages(service, limit=10, order=order)
+
+    expected = [(_START + timedelta(days=i)).isoformat() for i in range(25)]
+    assert dates == (expected if order == "asc" else expected[::-1])
+    assert counts == [10, 10, 5]
+
+@pytest.mark.asyncio
+async def test_keyset_pages_respect_the_date_range(service):
+    dates, counts = await _all_pages(service, limit=5, order="desc", start_date=date(2024, 1, 6), end_date=date(2024, 1, 15))
+
+    assert dates == [(date(2024, 1, 15) - timedelta(days=i)).isoformat() for i in range(10)]
+    # A full last page still hands out a cursor; the page after it is empty
+    assert counts == [5, 5, 0]
+
+@pytest.mark.asyncio
+async def test_columnar_page(service):
+    page = await service.get_indicator_time_series(3, limit=2, order="asc", columnar=True)
+
+    assert page["columns"]["date"] == ["2024-01-01", "2024-01-02"]
+    assert page["columns"]["value"] == [0.0, 1.0]
+    assert page["next_cursor"] == "2024-01-02"
+
+async def _ndjson(chunks) -> list:
+    body = b"".join([chunk async for chunk in chunks])
+    assert body.endswith(b"\n")
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+@pytest.mark.asyncio
+async def test_stream_ndjson_rows(service, monkeypatch):
+    monkeypatch.setattr(settings, "TIME_SERIES_STREAM_BATCH_SIZE", 4)
+
+    records = await _ndjson(service.stream_indicator_time_series(3, start_date=date(2024, 1, 3)))
+
+    assert [record["date"] for record in records] == [(_START + timedelta(days=i)).isoformat() for i in range(2, 25)]
+    assert set(records[0]) == set(READ_COLUMNS)
+    assert records[0]["value"] == 2.0
+
+@pytest.mark.asyncio
+async def test_stream_ndjson_columnar_chunks(service, monkeypatch):
+    monkeypatch.setattr(settings, "TIME_SERIES_STREAM_BATCH_SIZE", 10)
+
+    chunks = await _ndjson(service.stream_indicator_time_series(3, order="desc", columnar=True))
+
+    assert [len(chunk["date"]) for chunk in chunks] == [10, 10, 5]
+    assert chunks[0]["date"][0] == "2024-01-25"
+    assert sum((chunk["value"] for chunk in chunks), []) == [float(i) for i in range(24, -1, -1)]
+
+def test_batch_query_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="Invalid fields"):
+        batch_time_series_query([1, 2], fields=["value", "password"])
+    with pytest.raises(ValueError):
+        batch_time_series_query([1], fields=["date"])
+
+def test_align_series_puts_indicators_on_the_union_of_dates():
+    rows = [
+        (1, "2024-01-01", 1.0, 0.1),
+        (1, "2024-01-03", 3.0, 0.3),
+        (2, "2024-01-02", 20.0, 0.2),
+        (2, "2024-01-03", 30.0, None),
+    ]
+
+    aligned = align_series(rows, [1, 2, 7], ["value", "zScore"])
+
+    assert aligned["dates"] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert aligned["series"][1] == {"value": [1.0, None, 3.0], "zScore": [0.1, None, 0.3]}
+    assert aligned["series"][2] == {"value": [None, 20.0, 30.0], "zScore": [None, 0.2, None]}
+    assert aligned["series"][7] == {"value": [None] * 3, "zScore": [None] * 3}
+
+class FakeBatchDatabase:
+    """Streams fixed batch rows, ordered by indicator then date as the batch query returns them"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def stream(self, query, params=None, batch_size=1000):
+        for offset in range(0, len(self.rows), batch_size):
+            yield self.rows[offset:offset + batch_size]
+
+@pytest.mark.asyncio
+async def test_stream_indicators_emits_one_line_per_requested_indicator(monkeypatch):
+    monkeypatch.setattr(settings, "TIME_SERIES_STREAM_BATCH_SIZE", 2)
+    service = ETLService()
+    service.db = FakeBatchDatabase([
+        (2, "2024-01-01", 1.0),
+        (2, "2024-01-02", 2.0),
+        (2, "2024-01-03", 3.0),
+        (5, "2024-01-02", 50.0),
+    ])
+
+    lines = await _ndjson(service.stream_indicators_time_series([9, 5, 1, 2], fields=["value"]))
+
+    assert [(line["indicator_id"], line["count"]) for line in lines] == [(1, 0), (2, 3), (5, 1), (9, 0)]
+    assert lines[1]["columns"] == {"date": ["2024-01-01", "2024-01-02", "2024-01-03"], "value": [1.0, 2.0, 3.0]}
+    assert lines[3]["columns"] == {"date": [], "value": []}
@@ -0,0 +1,72 @@
+from datetime import date
+import numpy as np
+import pytest
+from core.series import Series
+from core.time_series_writer import _count_writes, copy_time_series_values, series_rows, upsert_time_series_values
+
+_STORED = '"date", value::float8, "originalValue"::float8, "calculatedValue"::float8, "hasCalculation"'
+
+def _stored(cur, indicator_id: int):
+    cur.execute(f"""
+        SELECT {_STORED} FROM "IndicatorTimeSeries"
+        WHERE "indicatorMetadataId" = %s
+        ORDER BY date
+    """, (indicator_id,))
+    return cur.fetchall()
+
+def test_copy_loads_the_same_rows_as_execute_values(time_series):
+    cur, indicator_id = time_series
+    dates = np.arange(np.datetime64('2024-01-01'), np.datetime64('2024-01-07'))
+    values = np.array([1.5, np.nan, -2.25, 1e6, np.inf, 0.1234567])
+    originals = np.array([3.0, 4.0, np.nan, 5.0, 6.0, 7.0])
+    rows = series_rows(indicator_id, Series(dates, values), originals, has_calculation=True)
+
+    counts = copy_time_series_values(cur, rows)
+    assert counts == {"inserted": 6, "updated": 0, "unchanged": 0, "first_changed": date(2024, 1, 1)}
+    copied = _stored(cur, indicator_id)
+
+    # The same rows through execute_values find nothing to change
+    assert upsert_time_series_values(cur, rows)["unchanged"] == 6
+
+    assert copied == [
+        (date(2024, 1, 1), 1.5, 3.0, 1.5, True),
+        (date(2024, 1, 2), None, 4.0, None, True),
+        (date(2024, 1, 3), -2.25, None, -2.25, True),
+        (date(2024, 1, 4), 1e6, 5.0, 1e6, True),
+        (date(2024, 1, 5), None, 6.0, None, True),
+        (date(2024, 1, 6), 0.123457, 7.0, 0.123457, True),
+    ]
+
+def test_count_writes_tuple_and_dict_rows():
+    written = [(True, date(2024, 1, 3)), (False, date(2024, 1, 2)), (True, date(2024, 1, 4))]
+
+    assert _count_writes(written, 5) == {
+        "inserted": 2, "updated": 1, "unchanged": 2, "first_changed": date(2024, 1, 2)
+    }
+
+    dict_rows = [{'inserted': inserted, 'date': d} for inserted, d in written]
+    assert _count_writes(dict_rows, 5) == _count_writes(written, 5)
+
+def test_count_writes_nothing_written():
+    assert _count_writes([], 3) == {"inserted": 0, "updated": 0, "unchanged": 3, "first_changed": None}
+
+@pytest.mark.parametrize("write", [upsert_time_series_values, copy_time_series_values])
+def test_writer_skips_unchanged_rows(time_series, write):
+    cur, indicator_id = time_series
+    dates = np.arange(np.datetime64('2024-01-01'), np.datetime64('2024-01-11'))
+    values = np.arange(10, dtype=np.float64)
+
+    first = write(cur, series_rows(indicator_id, Series(dates, values)))
+    assert first == {"inserted": 10, "updated": 0, "unchanged": 0, "first_changed": date(2024, 1, 1)}
+
+    again = write(cur, series_rows(indicator_id, Series(dates, values)))
+    assert again == {"inserted": 0, "updated": 0, "unchanged": 10, "first_changed": None}
+
+    # Two revisions, two new dates
+    revised = np.concatenate([values, [10.0, 11.0]])
+    revised[[4, 7]] += 0.5
+    more_dates = np.arange(np.datetime64('2024-01-01'), np.datetime64('2024-01-13'))
+    mixed = write(cur, series_rows(indicator_id, Series(more_dates, revised)))
+    assert mixed == {"inserted": 2, "updated": 2, "unchanged": 8, "first_changed": date(2024, 1, 5)}
+
+    assert [row[1] for row in _stored(cur, indicator_id)] == revised.tolist()